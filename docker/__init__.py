@@ -1,7 +1,12 @@
 from .api import APIClient
 from .client import DockerClient, from_env
 from .context import Context, ContextAPI
+from .fleet import FleetClient
+from .image_cache import ImageCache
+from .informer import Informer
+from .system_cache import SystemCache
 from .tls import TLSConfig
+from .utils.capture import CaptureSink
 from .version import __version__
 
 __title__ = 'docker'
@@ -16,7 +16,8 @@ class BuildApiMixin:
               decode=False, buildargs=None, gzip=False, shmsize=None,
               labels=None, cache_from=None, target=None, network_mode=None,
               squash=None, extra_hosts=None, platform=None, isolation=None,
-              use_config_proxy=True):
+              use_config_proxy=True, max_context_size=None,
+              context_workers=None):
         """
         Similar to the ``docker build`` command. Either ``path`` or ``fileobj``
         needs to be set. ``path`` can be a local path (to a directory
@@ -105,6 +106,16 @@ class BuildApiMixin:
                 configuration file (``~/.docker/config.json`` by default)
                 contains a proxy configuration, the corresponding environment
                 variables will be set in the container being built.
+            max_context_size (int or str): Fail the build before sending
+                anything if the context of ``path`` is larger than this, in
+                bytes or as a string with a units identification char
+                (``100000b``, ``1000k``, ``128m``, ``1g``). See
+                :py:func:`~docker.utils.build_context.analyze_build_context`.
+            context_workers (int): Stat and read the files of the context of
+                ``path`` ahead of archiving them, on this many threads.
+                Speeds up contexts of many small files on network
+                filesystems or cold caches. The archive is the same.
+                Default: archive the files one at a time.
 
         Returns:
             A generator for the build output.
@@ -112,6 +123,8 @@ class BuildApiMixin:
         Raises:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
+            :py:class:`docker.errors.BuildContextTooLarge`
+                If the context is larger than ``max_context_size``.
             ``TypeError``
                 If neither ``path`` nor ``fileobj`` is specified.
         """
@@ -147,17 +160,15 @@ class BuildApiMixin:
         elif not os.path.isdir(path):
             raise TypeError("You must specify a directory to build in path")
         else:
-            dockerignore = os.path.join(path, '.dockerignore')
-            exclude = None
-            if os.path.exists(dockerignore):
-                with open(dockerignore) as f:
-                    exclude = list(filter(
-                        lambda x: x != '' and x[0] != '#',
-                        [line.strip() for line in f.read().splitlines()]
-                    ))
+            exclude = utils.read_dockerignore(path)
             dockerfile = process_dockerfile(dockerfile, path)
+            if max_context_size is not None:
+                check_context_size(
+                    path, exclude, dockerfile[0], max_context_size
+                )
             context = utils.tar(
-                path, exclude=exclude, dockerfile=dockerfile, gzip=gzip
+                path, exclude=exclude, dockerfile=dockerfile, gzip=gzip,
+                workers=context_workers,
             )
             encoding = 'gzip' if gzip else encoding
 
@@ -352,6 +363,16 @@ class BuildApiMixin:
             log.debug('No auth config found')
 
 
+def check_context_size(path, exclude, dockerfile, max_context_size):
+    max_context_size = utils.parse_bytes(max_context_size)
+    report = utils.analyze_build_context(
+        path, exclude=exclude or [], dockerfile=dockerfile,
+        walk_excluded=False, compression=False,
+    )
+    if report.total_bytes > max_context_size:
+        raise errors.BuildContextTooLarge(report, max_context_size)
+
+
 def process_dockerfile(dockerfile, path):
     if not dockerfile:
         return (None, None)
@@ -9,6 +9,7 @@ import requests.exceptions
 
 from .. import auth
 from ..constants import (
+    DEFAULT_DATA_CHUNK_SIZE,
     DEFAULT_MAX_POOL_SIZE,
     DEFAULT_NUM_POOLS,
     DEFAULT_NUM_POOLS_SSH,
@@ -25,8 +26,9 @@ from ..errors import (
     create_api_error_from_http_exception,
 )
 from ..tls import TLSConfig
-from ..transport import UnixHTTPAdapter
+from ..transport import RequestsEngine, UnixHTTPAdapter
 from ..utils import check_resource, config, update_headers, utils
+from ..utils.archive import save_stream
 from ..utils.json_stream import json_stream
 from ..utils.proxy import ProxyConfig
 from ..utils.socket import consume_socket_output, demux_adaptor, frames_iter
@@ -104,6 +106,20 @@ class APIClient(
             installed and configured on the host.
         max_pool_size (int): The maximum number of connections
             to save in the pool.
+        image_cache (:py:class:`~docker.image_cache.ImageCache`): Reuse
+            image metadata from this cache instead of fetching it again.
+        engine (callable): Creates the engine sending the requests, given
+            the client. Default:
+            :py:class:`~docker.transport.engine.RequestsEngine`. Use
+            :py:class:`~docker.transport.engine.Urllib3Engine` to reduce
+            the overhead of each request.
+        admission (AdmissionController): Limit the number of concurrent
+            requests sent to the daemon, adapting to its latency and
+            errors. See
+            :py:class:`~docker.transport.admission.AdmissionController`.
+        coalescer (RequestCoalescer): Share identical ``GET`` requests sent
+            at the same time. See
+            :py:class:`~docker.transport.coalescing.RequestCoalescer`.
     """
 
     __attrs__ = requests.Session.__attrs__ + ['_auth_configs',
@@ -116,7 +132,8 @@ class APIClient(
                  timeout=DEFAULT_TIMEOUT_SECONDS, tls=False,
                  user_agent=DEFAULT_USER_AGENT, num_pools=None,
                  credstore_env=None, use_ssh_client=False,
-                 max_pool_size=DEFAULT_MAX_POOL_SIZE):
+                 max_pool_size=DEFAULT_MAX_POOL_SIZE, image_cache=None,
+                 engine=None, admission=None, coalescer=None):
         super().__init__()
 
         if tls and not base_url:
@@ -127,6 +144,9 @@ class APIClient(
         self.base_url = base_url
         self.timeout = timeout
         self.headers['User-Agent'] = user_agent
+        self._image_cache = image_cache
+        self._admission = admission
+        self._coalescer = coalescer
 
         self._general_configs = config.load_general_config()
 
@@ -199,6 +219,8 @@ class APIClient(
                 self.mount('https://', self._custom_adapter)
             self.base_url = base_url
 
+        self._engine = (engine or RequestsEngine)(self)
+
         # version detection needs to be after unix adapter mounting
         if version is None or (isinstance(
                                 version,
@@ -237,21 +259,41 @@ class APIClient(
         kwargs.setdefault('timeout', self.timeout)
         return kwargs
 
+    def _request(self, method, url, **kwargs):
+        kwargs = self._set_request_timeout(kwargs)
+        if self._admission is None:
+            return self._engine.request(method, url, **kwargs)
+        with self._admission.admit(
+                method, url, kwargs.get('stream', False)) as ticket:
+            ticket.response = self._engine.request(method, url, **kwargs)
+        return ticket.response
+
     @update_headers
     def _post(self, url, **kwargs):
-        return self.post(url, **self._set_request_timeout(kwargs))
+        return self._request('POST', url, **kwargs)
 
     @update_headers
     def _get(self, url, **kwargs):
-        return self.get(url, **self._set_request_timeout(kwargs))
+        if self._coalescer is None or kwargs.get('stream'):
+            return self._request('GET', url, **kwargs)
+        key = self._coalescer.key(
+            url, kwargs.get('params'), kwargs.get('headers')
+        )
+        return self._coalescer.request(
+            key, partial(self._request, 'GET', url, **kwargs)
+        )
 
     @update_headers
     def _put(self, url, **kwargs):
-        return self.put(url, **self._set_request_timeout(kwargs))
+        return self._request('PUT', url, **kwargs)
 
     @update_headers
     def _delete(self, url, **kwargs):
-        return self.delete(url, **self._set_request_timeout(kwargs))
+        return self._request('DELETE', url, **kwargs)
+
+    def close(self):
+        self._engine.close()
+        super().close()
 
     def _url(self, pathfmt, *args, **kwargs):
         for arg in args:
@@ -373,25 +415,29 @@ class APIClient(
             # encountered an error immediately
             yield self._result(response, json=decode)
 
-    def _multiplexed_buffer_helper(self, response):
+    def _multiplexed_buffer_helper(self, response, demux=False):
         """A generator of multiplexed data blocks read from a buffered
-        response."""
-        buf = self._result(response, binary=True)
+        response. If demux=True, (stdout, stderr) tuples are yielded."""
+        # Slice a view of the body, to avoid copying every block
+        buf = memoryview(self._result(response, binary=True))
         buf_length = len(buf)
         walker = 0
         while True:
             if buf_length - walker < STREAM_HEADER_SIZE_BYTES:
                 break
             header = buf[walker:walker + STREAM_HEADER_SIZE_BYTES]
-            _, length = struct.unpack_from('>BxxxL', header)
+            stream_id, length = struct.unpack_from('>BxxxL', header)
             start = walker + STREAM_HEADER_SIZE_BYTES
             end = start + length
             walker = end
-            yield buf[start:end]
+            if demux:
+                yield demux_adaptor(stream_id, bytes(buf[start:end]))
+            else:
+                yield buf[start:end]
 
-    def _multiplexed_response_stream_helper(self, response):
+    def _multiplexed_response_stream_helper(self, response, demux=False):
         """A generator of multiplexed data blocks coming from a response
-        stream."""
+        stream. If demux=True, (stdout, stderr) tuples are yielded."""
 
         # Disable timeout on the underlying socket to prevent
         # Read timed out(s) for long running processes
@@ -402,13 +448,13 @@ class APIClient(
             header = response.raw.read(STREAM_HEADER_SIZE_BYTES)
             if not header:
                 break
-            _, length = struct.unpack('>BxxxL', header)
+            stream_id, length = struct.unpack('>BxxxL', header)
             if not length:
                 continue
             data = response.raw.read(length)
             if not data:
                 break
-            yield data
+            yield demux_adaptor(stream_id, data) if demux else data
 
     def _stream_raw_result(self, response, chunk_size=1, decode=True):
         ''' Stream result for TTY-enabled container and raw binary data'''
@@ -421,10 +467,24 @@ class APIClient(
 
         yield from response.iter_content(chunk_size, decode)
 
-    def _read_from_socket(self, response, stream, tty=True, demux=False):
+    def _save_raw_result(self, response, dest, chunk_size, fsync):
+        """Save a raw binary response to ``dest`` and close the response."""
+        self._raise_for_status(response)
+
+        socket = self._get_raw_response_socket(response)
+        self._disable_socket_timeout(socket)
+
+        try:
+            return save_stream(response.raw, dest, chunk_size, fsync)
+        finally:
+            response.close()
+
+    def _read_from_socket(self, response, stream, tty=True, demux=False,
+                          sink=None):
         """Consume all data from the socket, close the response and return the
-        data. If stream=True, then a generator is returned instead and the
-        caller is responsible for closing the response.
+        data, or write it to ``sink`` and return the sink. If stream=True, then
+        a generator is returned instead and the caller is responsible for
+        closing the response.
         """
         socket = self._get_raw_response_socket(response)
 
@@ -442,7 +502,7 @@ class APIClient(
         else:
             try:
                 # Wait for all frames, concatenate them, and return the result
-                return consume_socket_output(gen, demux=demux)
+                return consume_socket_output(gen, demux=demux, sink=sink)
             finally:
                 response.close()
 
@@ -479,23 +539,43 @@ class APIClient(
         cont = self.inspect_container(container)
         return cont['Config']['Tty']
 
-    def _get_result(self, container, stream, res):
-        return self._get_result_tty(stream, res, self._check_is_tty(container))
+    def _get_result(self, container, stream, res, sink=None, demux=False):
+        return self._get_result_tty(
+            stream, res, self._check_is_tty(container), sink, demux
+        )
+
+    def _get_result_tty(self, stream, res, is_tty, sink=None, demux=False):
+        if sink is not None:
+            # The response was streamed, so it doesn't have to fit in memory
+            self._raise_for_status(res)
+            if is_tty:
+                chunks = res.iter_content(DEFAULT_DATA_CHUNK_SIZE, False)
+                if demux:
+                    chunks = ((chunk, None) for chunk in chunks)
+            else:
+                chunks = self._multiplexed_response_stream_helper(res, demux)
+            try:
+                return consume_socket_output(chunks, demux=demux, sink=sink)
+            finally:
+                res.close()
 
-    def _get_result_tty(self, stream, res, is_tty):
         # We should also use raw streaming (without keep-alives)
         # if we're dealing with a tty-enabled container.
         if is_tty:
-            return self._stream_raw_result(res) if stream else \
-                self._result(res, binary=True)
+            if stream:
+                output = self._stream_raw_result(res)
+                if demux:
+                    return ((chunk, None) for chunk in output)
+                return output
+            output = self._result(res, binary=True)
+            return (output, None) if demux else output
 
         self._raise_for_status(res)
-        sep = b''
         if stream:
-            return self._multiplexed_response_stream_helper(res)
+            return self._multiplexed_response_stream_helper(res, demux)
         else:
-            return sep.join(
-                list(self._multiplexed_buffer_helper(res))
+            return consume_socket_output(
+                self._multiplexed_buffer_helper(res, demux), demux=demux
             )
 
     def _unmount(self, *args):
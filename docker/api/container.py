@@ -9,6 +9,8 @@ from ..types import (
     HostConfig,
     NetworkingConfig,
 )
+from ..utils.archive import extract_archive, stream_archive
+from ..utils.socket import AsyncDuplexStream, DuplexStream
 
 
 class ContainerApiMixin:
@@ -111,6 +113,54 @@ class ContainerApiMixin:
             )
         )
 
+    @utils.check_resource('container')
+    def attach_stream(self, container, stdin=True, stdout=True, stderr=True,
+                      logs=False, asynchronous=False):
+        """
+        Attach to a container, and return a stream to write its stdin and
+        read its output through the same connection.
+
+        Args:
+            container (str): The container to attach to.
+            stdin (bool): Attach to stdin. Default: True
+            stdout (bool): Attach to stdout. Default: True
+            stderr (bool): Attach to stderr. Default: True
+            logs (bool): Include the container's previous output.
+                Default: False
+            asynchronous (bool): Return an
+                :py:class:`~docker.utils.socket.AsyncDuplexStream` for use
+                with :py:mod:`asyncio`. Default: False
+
+        Returns:
+            (:py:class:`~docker.utils.socket.DuplexStream`): The stream,
+            which must be closed by the caller when done.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> container = client.create_container(
+            ...     'busybox', 'wc -c', stdin_open=True
+            ... )
+            >>> stream = client.attach_stream(container)
+            >>> client.start(container)
+            >>> with open('payload.bin', 'rb') as f:
+            ...     stdout, stderr = stream.communicate(f)
+        """
+        tty = self._check_is_tty(container)
+        sock = self.attach_socket(container, {
+            'stdin': int(stdin),
+            'stdout': int(stdout),
+            'stderr': int(stderr),
+            'logs': int(logs),
+            'stream': 1,
+        })
+        if asynchronous:
+            return AsyncDuplexStream(sock, tty=tty)
+        return DuplexStream(sock, tty=tty)
+
     @utils.check_resource('container')
     def commit(self, container, repository=None, tag=None, message=None,
                author=None, pause=True, changes=None, conf=None):
@@ -218,6 +268,77 @@ class ContainerApiMixin:
                 x['Id'] = x['Id'][:12]
         return res
 
+    @utils.check_resource('container')
+    def copy_to(self, container, src_paths, dest, exclude=None, gzip=False,
+                chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Copy local files or folders into a container.
+
+        The tar archive sent to the server is built on the fly while it is
+        being uploaded, so memory usage does not depend on the size of the
+        files being copied.
+
+        Args:
+            container (str): The container to copy the files into
+            src_paths (str or list): Local files or folders to copy. Each one
+                is created under its base name inside ``dest``.
+            dest (str): Path inside the container where the file(s) will be
+                extracted. Must exist.
+            exclude (list): ``.dockerignore``-style patterns of paths to
+                skip, relative to each folder in ``src_paths``.
+            gzip (bool): Compress the archive with gzip during transmission.
+                Default: False
+            chunk_size (int): The size of each chunk of the request body.
+                Default: 2 MB
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        data = stream_archive(
+            src_paths, exclude=exclude, gzip=gzip, chunk_size=chunk_size
+        )
+        return self.put_archive(container, dest, data)
+
+    @utils.check_resource('container')
+    def copy_from(self, container, path, dest_dir, progress=None,
+                  chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Copy a file or folder from a container to a local folder.
+
+        The archive returned by the server is extracted while it is being
+        received, without being stored in memory or in a temporary file.
+
+        Args:
+            container (str): The container where the file is located
+            path (str): Path to the file or folder to retrieve
+            dest_dir (str): Local folder to extract the file or folder into.
+                It is created if it does not exist.
+            progress (callable): Called as ``progress(name, written, size)``
+                while the content of each file is being written.
+            chunk_size (int): The number of bytes read from the response and
+                written to disk at a time. Default: 2 MB
+
+        Returns:
+            (dict): ``stat`` information on the specified ``path``, as
+            returned by :py:meth:`get_archive`.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+            :py:class:`docker.errors.UnsafeArchivePath`
+                If the archive contains members that would be extracted
+                outside of ``dest_dir``.
+        """
+        bits, stat = self.get_archive(container, path, chunk_size)
+        extract_archive(
+            bits, dest_dir, progress=progress, chunk_size=chunk_size
+        )
+        return stat
+
     def create_container(self, image, command=None, hostname=None, user=None,
                          detach=False, stdin_open=False, tty=False, ports=None,
                          environment=None, volumes=None,
@@ -721,6 +842,36 @@ class ContainerApiMixin:
         )
         return self._stream_raw_result(res, chunk_size, False)
 
+    @utils.check_resource('container')
+    def export_to(self, container, dest, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
+                  fsync=False):
+        """
+        Export the contents of a filesystem as a tar archive, and save it
+        straight to a file. Unlike :py:meth:`export`, the data is read into a
+        single reusable buffer instead of one new object per chunk.
+
+        Args:
+            container (str): The container to export
+            dest (str, int or file): The path of the file to write, an open
+                file descriptor, or a writable file-like object
+            chunk_size (int): The size of the read buffer. Default: 2 MB
+            fsync (bool or int): ``True`` to flush the file to disk once the
+                export is complete, or a number of bytes after which the file
+                is flushed to disk periodically. Default: ``False``
+
+        Returns:
+            (:py:class:`~docker.utils.archive.TransferResult`): The number of
+            bytes written and the time it took.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        res = self._get(
+            self._url("/containers/{0}/export", container), stream=True
+        )
+        return self._save_raw_result(res, dest, chunk_size, fsync)
+
     @utils.check_resource('container')
     def get_archive(self, container, path, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
                     encode_stream=False):
@@ -774,6 +925,48 @@ class ContainerApiMixin:
             utils.decode_json_header(encoded_stat) if encoded_stat else None
         )
 
+    @utils.check_resource('container')
+    def get_archive_to(self, container, path, dest,
+                       chunk_size=DEFAULT_DATA_CHUNK_SIZE, fsync=False):
+        """
+        Retrieve a file or folder from a container in the form of a tar
+        archive, and save the archive straight to a file.
+
+        Args:
+            container (str): The container where the file is located
+            path (str): Path to the file or folder to retrieve
+            dest (str, int or file): The path of the file to write, an open
+                file descriptor, or a writable file-like object
+            chunk_size (int): The size of the read buffer. Default: 2 MB
+            fsync (bool or int): ``True`` to flush the file to disk once the
+                transfer is complete, or a number of bytes after which the
+                file is flushed to disk periodically. Default: ``False``
+
+        Returns:
+            (tuple): First element is a
+            :py:class:`~docker.utils.archive.TransferResult`. Second element
+            is a dict containing ``stat`` information on the specified
+            ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        params = {
+            'path': path
+        }
+        headers = {
+            "Accept-Encoding": "identity"
+        }
+        url = self._url('/containers/{0}/archive', container)
+        res = self._get(url, params=params, stream=True, headers=headers)
+        self._raise_for_status(res)
+        encoded_stat = res.headers.get('x-docker-container-path-stat')
+        return (
+            self._save_raw_result(res, dest, chunk_size, fsync),
+            utils.decode_json_header(encoded_stat) if encoded_stat else None
+        )
+
     @utils.check_resource('container')
     def inspect_container(self, container):
         """
@@ -820,7 +1013,7 @@ class ContainerApiMixin:
     @utils.check_resource('container')
     def logs(self, container, stdout=True, stderr=True, stream=False,
              timestamps=False, tail='all', since=None, follow=None,
-             until=None):
+             until=None, sink=None, demux=False):
         """
         Get logs from a container. Similar to the ``docker logs`` command.
 
@@ -842,6 +1035,14 @@ class ContainerApiMixin:
             until (datetime, int, or float): Show logs that occurred before
                 the given datetime, integer epoch (in seconds), or
                 float (in fractional seconds)
+            sink (:py:class:`~docker.utils.capture.CaptureSink` or tuple):
+                Read the logs progressively into this sink, or into a tuple
+                of two sinks (for stdout and stderr) if ``demux=True``, and
+                return it instead of loading them in memory. Ignored if
+                ``stream`` is ``True``.
+            demux (bool): Return stdout and stderr separately, as tuples of
+                ``(stdout, stderr)`` where one item is ``None`` when
+                streaming. Default ``False``
 
         Returns:
             (generator of bytes or bytes)
@@ -891,9 +1092,14 @@ class ContainerApiMixin:
                     f'not {type(until)}'
                 )
 
+        if stream:
+            sink = None
+
         url = self._url("/containers/{0}/logs", container)
-        res = self._get(url, params=params, stream=stream)
-        output = self._get_result(container, stream, res)
+        res = self._get(
+            url, params=params, stream=stream or sink is not None
+        )
+        output = self._get_result(container, stream, res, sink, demux)
 
         if stream:
             return CancellableStream(output, res)
@@ -1,5 +1,6 @@
 from .. import errors, utils
 from ..types import CancellableStream
+from ..utils.socket import AsyncDuplexStream, DuplexStream
 
 
 class ExecApiMixin:
@@ -116,7 +117,7 @@ class ExecApiMixin:
 
     @utils.check_resource('exec_id')
     def exec_start(self, exec_id, detach=False, tty=False, stream=False,
-                   socket=False, demux=False):
+                   socket=False, demux=False, sink=None):
         """
         Start a previously set up exec instance.
 
@@ -130,14 +131,18 @@ class ExecApiMixin:
             socket (bool): Return the connection socket to allow custom
                 read/write operations. Must be closed by the caller when done.
             demux (bool): Return stdout and stderr separately
+            sink (:py:class:`~docker.utils.capture.CaptureSink` or tuple):
+                Write the output to this sink, or to a tuple of two sinks
+                (for stdout and stderr) if ``demux=True``, instead of loading
+                it in memory. Ignored if ``stream`` or ``socket`` is set.
 
         Returns:
 
             (generator or str or tuple): If ``stream=True``, a generator
             yielding response chunks. If ``socket=True``, a socket object for
-            the connection. A string containing response data otherwise. If
-            ``demux=True``, a tuple with two elements of type byte: stdout and
-            stderr.
+            the connection. If ``sink`` is set, the sink. A string containing
+            response data otherwise. If ``demux=True``, a tuple with two
+            elements of type byte: stdout and stderr.
 
         Raises:
             :py:class:`docker.errors.APIError`
@@ -169,8 +174,44 @@ class ExecApiMixin:
         if socket:
             return self._get_raw_response_socket(res)
 
-        output = self._read_from_socket(res, stream, tty=tty, demux=demux)
+        output = self._read_from_socket(
+            res, stream, tty=tty, demux=demux, sink=sink
+        )
         if stream:
             return CancellableStream(output, res)
         else:
             return output
+
+    @utils.check_resource('exec_id')
+    def exec_stream(self, exec_id, tty=False, asynchronous=False):
+        """
+        Start a previously set up exec instance, and return a stream to write
+        its stdin and read its output through the same connection.
+
+        Args:
+            exec_id (str): ID of the exec instance
+            tty (bool): Allocate a pseudo-TTY. Default: False
+            asynchronous (bool): Return an
+                :py:class:`~docker.utils.socket.AsyncDuplexStream` for use
+                with :py:mod:`asyncio`. Default: False
+
+        Returns:
+            (:py:class:`~docker.utils.socket.DuplexStream`): The stream,
+            which must be closed by the caller when done.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> exec_id = client.exec_create(
+            ...     container, 'gzip', stdin=True
+            ... )['Id']
+            >>> stream = client.exec_stream(exec_id)
+            >>> stdout, stderr = stream.communicate(b'data' * 1000000)
+        """
+        sock = self.exec_start(exec_id, tty=tty, socket=True)
+        if asynchronous:
+            return AsyncDuplexStream(sock, tty=tty)
+        return DuplexStream(sock, tty=tty)
@@ -3,6 +3,7 @@ import os
 
 from .. import auth, errors, utils
 from ..constants import DEFAULT_DATA_CHUNK_SIZE
+from ..image_cache import DIGEST_RE
 
 log = logging.getLogger(__name__)
 
@@ -38,6 +39,68 @@ class ImageApiMixin:
         res = self._get(self._url("/images/{0}/get", image), stream=True)
         return self._stream_raw_result(res, chunk_size, False)
 
+    def get_images(self, images, chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Get a single tarball containing several images. Similar to the
+        ``docker save`` command with several image arguments. Layers shared
+        by the images are only included once in the archive.
+
+        Args:
+            images (list): Names or IDs of the images to get
+            chunk_size (int): The number of bytes returned by each iteration
+                of the generator. If ``None``, data will be streamed as it is
+                received. Default: 2 MB
+
+        Returns:
+            (generator): A stream of raw archive data.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        res = self._get(
+            self._url("/images/get"), params={'names': list(images)},
+            stream=True
+        )
+        return self._stream_raw_result(res, chunk_size, False)
+
+    @utils.check_resource('image')
+    def get_image_to(self, image, dest, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
+                     fsync=False):
+        """
+        Get a tarball of an image, and save it straight to a file. Similar to
+        the ``docker save -o`` command. Unlike :py:meth:`get_image`, the data
+        is read into a single reusable buffer instead of one new object per
+        chunk.
+
+        Args:
+            image (str): Image name to get
+            dest (str, int or file): The path of the file to write, an open
+                file descriptor, or a writable file-like object
+            chunk_size (int): The size of the read buffer. Default: 2 MB
+            fsync (bool or int): ``True`` to flush the file to disk once the
+                transfer is complete, or a number of bytes after which the
+                file is flushed to disk periodically. Default: ``False``
+
+        Returns:
+            (:py:class:`~docker.utils.archive.TransferResult`): The number of
+            bytes written and the time it took.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> result = client.api.get_image_to(
+            ...     "busybox:latest", "/tmp/busybox-latest.tar"
+            ... )
+            >>> result.throughput
+            587734328.6
+        """
+        res = self._get(self._url("/images/{0}/get", image), stream=True)
+        return self._save_raw_result(res, dest, chunk_size, fsync)
+
     @utils.check_resource('image')
     def history(self, image):
         """
@@ -53,8 +116,18 @@ class ImageApiMixin:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        cache = self._image_cache
+        image_id = cache and cache.resolve(image)
+        if image_id:
+            result = cache.get('history', image_id)
+            if result is not None:
+                return result
+            generation = cache.generation
         res = self._get(self._url("/images/{0}/history", image))
-        return self._result(res, True)
+        result = self._result(res, True)
+        if image_id and generation == cache.generation:
+            cache.put('history', image_id, result)
+        return result
 
     def images(self, name=None, quiet=False, all=False, filters=None):
         """
@@ -248,9 +321,22 @@ class ImageApiMixin:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
-        return self._result(
+        cache = self._image_cache
+        if cache is None:
+            return self._result(
+                self._get(self._url("/images/{0}/json", image)), True
+            )
+        image_id = cache.resolve(image)
+        if image_id:
+            result = cache.get('inspect', image_id)
+            if result is not None:
+                return result
+        generation = cache.generation
+        result = self._result(
             self._get(self._url("/images/{0}/json", image)), True
         )
+        cache.add_image(image, result, generation)
+        return result
 
     @utils.minimum_version('1.30')
     @utils.check_resource('image')
@@ -282,11 +368,22 @@ class ImageApiMixin:
             log.debug('Sending supplied auth config')
             headers['X-Registry-Auth'] = auth.encode_header(auth_config)
 
+        cache = self._image_cache
+        # Only a digest identifies the same content on every registry query
+        immutable = cache is not None and DIGEST_RE.search(image)
+        if immutable:
+            result = cache.get('distribution', image)
+            if result is not None:
+                return result
+
         url = self._url("/distribution/{0}/json", image)
 
-        return self._result(
+        result = self._result(
             self._get(url, headers=headers), True
         )
+        if immutable:
+            cache.put('distribution', image, result)
+        return result
 
     def load_image(self, data, quiet=None):
         """
@@ -510,8 +607,32 @@ class ImageApiMixin:
             noprune (bool): Do not delete untagged parents
         """
         params = {'force': force, 'noprune': noprune}
+        cache = self._image_cache
+        image_id = None
+        if cache is not None:
+            image_id = cache.resolve(image)
+            if image_id is None:
+                # Without events, only the daemon knows which image a tag
+                # points to, and removing a tag changes its cached entries
+                try:
+                    image_id = self._result(
+                        self._get(self._url("/images/{0}/json", image)),
+                        True
+                    )['Id']
+                except errors.NotFound:
+                    pass
         res = self._delete(self._url("/images/{0}", image), params=params)
-        return self._result(res, True)
+        result = self._result(res, True)
+        if cache is not None:
+            entries = result if isinstance(result, list) else []
+            deleted = {
+                entry['Deleted'] for entry in entries if entry.get('Deleted')
+            }
+            if image_id not in deleted:
+                cache.invalidate(image_id or image)
+            for deleted_id in deleted:
+                cache.invalidate(deleted_id, deleted=True)
+        return result
 
     def search(self, term, limit=None):
         """
@@ -569,6 +690,8 @@ class ImageApiMixin:
         url = self._url("/images/{0}/tag", image)
         res = self._post(url, params=params)
         self._raise_for_status(res)
+        if self._image_cache is not None:
+            self._image_cache.invalidate(image)
         return res.status_code == 201
 
 
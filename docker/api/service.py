@@ -1,5 +1,5 @@
 from .. import auth, errors, utils
-from ..types import ServiceMode
+from ..types import CancellableStream, ServiceMode
 
 
 def _check_api_features(version, task_template, update_config, endpoint_spec,
@@ -294,7 +294,7 @@ class ServiceApiMixin:
     @utils.check_resource('service')
     def service_logs(self, service, details=False, follow=False, stdout=False,
                      stderr=False, since=0, timestamps=False, tail='all',
-                     is_tty=None):
+                     is_tty=None, demux=False):
         """
             Get log stream for a service.
             Note: This endpoint works only for services with the ``json-file``
@@ -319,6 +319,8 @@ class ServiceApiMixin:
                     enables the TTY option. If omitted, the method will query
                     the Engine for the information, causing an additional
                     roundtrip.
+                demux (bool): Yield ``(stdout, stderr)`` tuples, where one
+                    item is ``None``. Default: ``False``
 
             Returns (generator): Logs for the service.
         """
@@ -338,7 +340,65 @@ class ServiceApiMixin:
             is_tty = self.inspect_service(
                 service
             )['Spec']['TaskTemplate']['ContainerSpec'].get('TTY', False)
-        return self._get_result_tty(True, res, is_tty)
+        return self._get_result_tty(True, res, is_tty, demux=demux)
+
+    @utils.minimum_version('1.29')
+    @utils.check_resource('task')
+    def task_logs(self, task, details=False, follow=False, stdout=False,
+                  stderr=False, since=0, timestamps=False, tail='all',
+                  is_tty=None, demux=False):
+        """
+        Get log stream for a task. Like :py:meth:`service_logs`, but
+        restricted to one task.
+
+        Args:
+            task (str): Task ID
+            details (bool): Show extra details provided to logs.
+                Default: ``False``
+            follow (bool): Keep connection open to read logs as they are
+                sent by the Engine. Default: ``False``
+            stdout (bool): Return logs from ``stdout``. Default: ``False``
+            stderr (bool): Return logs from ``stderr``. Default: ``False``
+            since (int or float): UNIX timestamp for the logs staring point.
+                Default: 0
+            timestamps (bool): Add timestamps to every log line.
+            tail (string or int): Number of log lines to be returned,
+                counting from the current end of the logs. Specify an
+                integer or ``'all'`` to output all log lines.
+                Default: ``all``
+            is_tty (bool): Whether the task's :py:class:`ContainerSpec`
+                enables the TTY option. If omitted, the method will query
+                the Engine for the information, causing an additional
+                roundtrip.
+            demux (bool): Yield ``(stdout, stderr)`` tuples, where one item
+                is ``None``. Default: ``False``
+
+        Returns:
+            (:py:class:`~docker.types.daemon.CancellableStream`): Logs for
+            the task, which can be closed before the end.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        params = {
+            'details': details,
+            'follow': follow,
+            'stdout': stdout,
+            'stderr': stderr,
+            'since': since,
+            'timestamps': timestamps,
+            'tail': tail
+        }
+
+        url = self._url('/tasks/{0}/logs', task)
+        res = self._get(url, params=params, stream=True)
+        if is_tty is None:
+            is_tty = self.inspect_task(
+                task
+            )['Spec']['ContainerSpec'].get('TTY', False)
+        output = self._get_result_tty(True, res, is_tty, demux=demux)
+        return CancellableStream(output, res)
 
     @utils.minimum_version('1.24')
     def tasks(self, filters=None):
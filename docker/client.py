@@ -6,10 +6,12 @@ from .models.images import ImageCollection
 from .models.networks import NetworkCollection
 from .models.nodes import NodeCollection
 from .models.plugins import PluginCollection
+from .models.prune import SystemPrune
 from .models.secrets import SecretCollection
 from .models.services import ServiceCollection
 from .models.swarm import Swarm
 from .models.volumes import VolumeCollection
+from .system_cache import SystemCache
 from .utils import kwargs_from_env
 
 
@@ -40,9 +42,27 @@ class DockerClient:
             installed and configured on the host.
         max_pool_size (int): The maximum number of connections
             to save in the pool.
+        image_cache (:py:class:`~docker.image_cache.ImageCache`): Reuse
+            image metadata from this cache instead of fetching it again.
+        compact_models (bool): Create compact objects, which keep their
+            attributes as JSON bytes and only decode the properties that
+            are read. Reduces memory usage when holding many objects. See
+            :py:meth:`~docker.models.resource.Model.compact`.
+            Default: ``False``
+        engine (callable): Creates the engine sending the requests, given
+            the client. Default:
+            :py:class:`~docker.transport.engine.RequestsEngine`.
+        admission (AdmissionController): Limit the number of concurrent
+            requests sent to the daemon. See
+            :py:class:`~docker.transport.admission.AdmissionController`.
+        coalescer (RequestCoalescer): Share identical ``GET`` requests sent
+            at the same time. See
+            :py:class:`~docker.transport.coalescing.RequestCoalescer`.
     """
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, compact_models=False, **kwargs):
         self.api = APIClient(*args, **kwargs)
+        self.compact_models = compact_models
+        self.system_cache = SystemCache(self)
 
     @classmethod
     def from_env(cls, **kwargs):
@@ -78,6 +98,18 @@ class DockerClient:
             use_ssh_client (bool): If set to `True`, an ssh connection is
                 made via shelling out to the ssh client. Ensure the ssh
                 client is installed and configured on the host.
+            image_cache (:py:class:`~docker.image_cache.ImageCache`): Reuse
+                image metadata from this cache instead of fetching it again.
+            compact_models (bool): Create compact objects, which keep their
+                attributes as JSON bytes. Default: ``False``
+            engine (callable): Creates the engine sending the requests.
+                See :py:class:`~docker.api.client.APIClient`.
+            admission (AdmissionController): Limit the number of concurrent
+                requests sent to the daemon. See
+                :py:class:`~docker.api.client.APIClient`.
+            coalescer (RequestCoalescer): Share identical ``GET`` requests
+                sent at the same time. See
+                :py:class:`~docker.api.client.APIClient`.
 
         Example:
 
@@ -91,11 +123,21 @@ class DockerClient:
         max_pool_size = kwargs.pop('max_pool_size', DEFAULT_MAX_POOL_SIZE)
         version = kwargs.pop('version', None)
         use_ssh_client = kwargs.pop('use_ssh_client', False)
+        image_cache = kwargs.pop('image_cache', None)
+        compact_models = kwargs.pop('compact_models', False)
+        engine = kwargs.pop('engine', None)
+        admission = kwargs.pop('admission', None)
+        coalescer = kwargs.pop('coalescer', None)
         return cls(
             timeout=timeout,
             max_pool_size=max_pool_size,
             version=version,
             use_ssh_client=use_ssh_client,
+            image_cache=image_cache,
+            compact_models=compact_models,
+            engine=engine,
+            admission=admission,
+            coalescer=coalescer,
             **kwargs_from_env(**kwargs)
         )
 
@@ -185,13 +227,55 @@ class DockerClient:
         return self.api.events(*args, **kwargs)
     events.__doc__ = APIClient.events.__doc__
 
-    def df(self):
+    def df(self, cached=False, force_refresh=False, max_staleness=None):
+        """
+        Get data usage information.
+
+        Args:
+            cached (bool): Return the value from :py:attr:`system_cache`,
+                which may be up to ``max_staleness`` seconds old, instead of
+                asking the daemon. Default: ``False``
+            force_refresh (bool): With ``cached``, wait for a fresh value.
+            max_staleness (float): With ``cached``, the age after which the
+                cached value is not returned, in seconds. Default: the
+                cache's ``max_staleness``.
+
+        Returns:
+            (dict): A dictionary representing different resource categories
+            and their respective data usage.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        if cached:
+            return self.system_cache.df(force_refresh, max_staleness)
         return self.api.df()
-    df.__doc__ = APIClient.df.__doc__
 
-    def info(self, *args, **kwargs):
-        return self.api.info(*args, **kwargs)
-    info.__doc__ = APIClient.info.__doc__
+    def info(self, cached=False, force_refresh=False, max_staleness=None):
+        """
+        Display system-wide information. Identical to the ``docker info``
+        command.
+
+        Args:
+            cached (bool): Return the value from :py:attr:`system_cache`,
+                which may be up to ``max_staleness`` seconds old, instead of
+                asking the daemon. Default: ``False``
+            force_refresh (bool): With ``cached``, wait for a fresh value.
+            max_staleness (float): With ``cached``, the age after which the
+                cached value is not returned, in seconds. Default: the
+                cache's ``max_staleness``.
+
+        Returns:
+            (dict): The info as a dict
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        if cached:
+            return self.system_cache.info(force_refresh, max_staleness)
+        return self.api.info()
 
     def login(self, *args, **kwargs):
         return self.api.login(*args, **kwargs)
@@ -201,11 +285,77 @@ class DockerClient:
         return self.api.ping(*args, **kwargs)
     ping.__doc__ = APIClient.ping.__doc__
 
+    def system_prune(self, filters=None, all=False, volumes=False,
+                     build_cache=True, dry_run=False):
+        """
+        Delete stopped containers, unused networks, dangling images and
+        build cache, like ``docker system prune``.
+
+        Containers are pruned first, then networks and volumes at the same
+        time, then images, then the build cache, so that each phase can
+        delete what the previous one stopped using.
+
+        Args:
+            filters (dict): Filters applied to every prune. Available
+                filters:
+
+                - ``until`` (str, int or datetime): Only prune objects
+                  created before this. Unix timestamps, date formatted
+                  timestamps, or Go duration strings (e.g. ``24h``). The
+                  build cache is not pruned with this filter before API
+                  version 1.39.
+                - ``label`` (str or list): Only prune objects with these
+                  labels, given as ``key`` or ``key=value``.
+                - ``label!`` (str or list): Only prune objects without these
+                  labels. The build cache has no labels, so it is not pruned
+                  when filtering on labels.
+            all (bool): Prune every unused image, not only dangling ones,
+                and every kind of build cache. Default: ``False``
+            volumes (bool): Prune unused volumes too. Default: ``False``
+            build_cache (bool): Prune the build cache too. Default: ``True``
+            dry_run (bool): Delete nothing, and estimate what would be
+                deleted from :py:meth:`df` and the list of networks instead.
+                Default: ``False``
+
+        Returns:
+            (dict): The deleted objects under the keys of each prune
+            (``ContainersDeleted``, ``NetworksDeleted``, ``VolumesDeleted``,
+            ``ImagesDeleted`` and ``CachesDeleted``), the total
+            ``SpaceReclaimed`` in bytes, and under ``Phases``, the number of
+            objects deleted, the space reclaimed and the duration of each
+            prune.
+
+        Raises:
+            :py:class:`docker.errors.InvalidArgument`
+                If a filter is not supported.
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> client.system_prune(filters={'until': '24h'}, dry_run=True)
+            {'ContainersDeleted': ['0a3e8a9a...'], 'NetworksDeleted': [],
+             'ImagesDeleted': [], 'CachesDeleted': ['zf2pqk...'],
+             'SpaceReclaimed': 73400320, 'DryRun': True,
+             'Phases': {'containers': {'Deleted': 1,
+                                       'SpaceReclaimed': 1024,
+                                       'Duration': 0.0}, ...},
+             'Duration': 0.21}
+        """
+        prune = SystemPrune(
+            self, filters=filters, all=all, volumes=volumes,
+            build_cache=build_cache,
+        )
+        if dry_run:
+            return prune.estimate()
+        return prune.run()
+
     def version(self, *args, **kwargs):
         return self.api.version(*args, **kwargs)
     version.__doc__ = APIClient.version.__doc__
 
     def close(self):
+        self.system_cache.close()
         return self.api.close()
     close.__doc__ = APIClient.close.__doc__
 
@@ -41,5 +41,7 @@ DEFAULT_MAX_POOL_SIZE = 10
 
 DEFAULT_DATA_CHUNK_SIZE = 1024 * 2048
 
+DEFAULT_BUILD_LOG_LIMIT = 10000
+
 DEFAULT_SWARM_ADDR_POOL = ['10.0.0.0/8']
 DEFAULT_SWARM_SUBNET_SIZE = 24
@@ -166,6 +166,51 @@ class ImageLoadError(DockerException):
     pass
 
 
+class BuildContextTooLarge(DockerException):
+    """
+    Raised when a build context is larger than the ``max_context_size`` of
+    a build.
+    """
+    def __init__(self, report, max_context_size):
+        super().__init__(
+            f'Build context is {report.total_bytes} bytes, more than the '
+            f'maximum of {max_context_size} bytes'
+        )
+        self.report = report
+        self.max_context_size = max_context_size
+
+
+class UnsafeArchivePath(DockerException):
+    """
+    Raised when extracting an archive member would write outside of the
+    destination directory.
+    """
+
+
+class HostTimeout(DockerException):
+    """
+    Raised when a host of a :py:class:`~docker.fleet.FleetClient` does not
+    answer in time.
+    """
+
+
+class AdmissionTimeout(DockerException):
+    """
+    Raised when a request waits too long for its turn in an
+    :py:class:`~docker.transport.admission.AdmissionController`.
+    """
+
+
+class ServiceNotConverged(DockerException):
+    """
+    Raised when a service does not converge in time, or when its rollout
+    is paused or rolled back while waiting for it.
+    """
+    def __init__(self, reason, state):
+        super().__init__(reason)
+        self.state = state
+
+
 def create_unexpected_kwargs_error(name, kwargs):
     quoted_kwargs = [f"'{k}'" for k in sorted(kwargs)]
     text = [f"{name}() "]
@@ -0,0 +1,254 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .client import DockerClient
+from .context import ContextAPI
+from .errors import HostTimeout
+
+
+class HostResult(namedtuple('HostResult', 'host,value,error')):
+    """
+    The outcome of a call on one host of a :py:class:`FleetClient`, with the
+    properties ``host`` (the name of the host), ``value`` (what the call
+    returned) and ``error`` (the exception it raised, or ``None``).
+    """
+    __slots__ = ()
+
+
+class FleetResult:
+    """
+    The outcome of a call on every host of a :py:class:`FleetClient`.
+
+    Attributes:
+        results (dict): The value returned by each host which succeeded.
+        errors (dict): The exception raised by each host which failed.
+    """
+    def __init__(self, results=None, errors=None):
+        self.results = results or {}
+        self.errors = errors or {}
+
+    def __repr__(self):
+        return (
+            f'<{self.__class__.__name__}: {len(self.results)} succeeded, '
+            f'{len(self.errors)} failed>'
+        )
+
+    @property
+    def ok(self):
+        """
+        ``True`` if no host failed.
+        """
+        return not self.errors
+
+    def items(self):
+        """
+        Iterate over ``(host, value)`` pairs of the successful hosts.
+        """
+        return self.results.items()
+
+
+class FleetClient:
+    """
+    A pool of clients for several Docker daemons, which runs calls on all
+    of them concurrently.
+
+    Any method of :py:class:`~docker.client.DockerClient`, of its
+    collections or of its low-level ``api`` can be called on the fleet, and
+    returns a :py:class:`FleetResult`. Use :py:meth:`run` to get the result
+    of each host as soon as it answers instead.
+
+    Args:
+        clients (dict): The clients, by host name.
+        max_workers (int): Maximum number of hosts queried at the same time.
+            Default: 16
+        timeout (float): Default time each host has to answer a call, in
+            seconds. Default: no timeout.
+
+    Example:
+
+        >>> fleet = docker.FleetClient.from_hosts(
+        ...     ['ssh://node1', 'ssh://node2', 'tcp://node3:2375']
+        ... )
+        >>> result = fleet.containers.list(filters={'label': 'app=web'})
+        >>> for host, containers in result.items():
+        ...     print(host, len(containers))
+        >>> result.errors
+        {'tcp://node3:2375': HostTimeout('tcp://node3:2375 did not answer
+        within 10 seconds')}
+    """
+    def __init__(self, clients, max_workers=16, timeout=None):
+        self.clients = dict(clients)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers)
+
+    @classmethod
+    def from_hosts(cls, hosts, max_workers=16, timeout=None, **kwargs):
+        """
+        Create a fleet from a list of daemon URLs.
+
+        Args:
+            hosts (list): The URLs of the daemons, such as
+                ``tcp://127.0.0.1:2375`` or ``ssh://user@host``. They are
+                also used as host names.
+            max_workers (int): Maximum number of hosts queried at the same
+                time. Default: 16
+            timeout (float): Default time each host has to answer a call,
+                in seconds.
+            **kwargs: Passed to each :py:class:`~docker.client.DockerClient`.
+        """
+        clients = {
+            host: DockerClient(base_url=host, **kwargs) for host in hosts
+        }
+        return cls(clients, max_workers, timeout)
+
+    @classmethod
+    def from_contexts(cls, names=None, max_workers=16, timeout=None,
+                      **kwargs):
+        """
+        Create a fleet from Docker contexts, named after the contexts.
+
+        Args:
+            names (list): The names of the contexts. Default: all contexts
+                with a Docker endpoint.
+            max_workers (int): Maximum number of hosts queried at the same
+                time. Default: 16
+            timeout (float): Default time each host has to answer a call,
+                in seconds.
+            **kwargs: Passed to each :py:class:`~docker.client.DockerClient`.
+        """
+        if names is None:
+            contexts = [c for c in ContextAPI.contexts() if c.Host]
+        else:
+            contexts = [ContextAPI.get_context(name) for name in names]
+        clients = {
+            context.Name: DockerClient(
+                base_url=context.Host, tls=context.TLSConfig or False,
+                **kwargs
+            )
+            for context in contexts
+        }
+        return cls(clients, max_workers, timeout)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return _FleetCall(self, (name,))
+
+    def run(self, call, *args, timeout=None, hosts=None, **kwargs):
+        """
+        Run a call on every host concurrently, yielding the result of each
+        host as soon as it is known.
+
+        A host which takes longer than ``timeout`` to answer is reported
+        with a :py:class:`~docker.errors.HostTimeout` error. Its call keeps
+        running in the background until the client's own timeout expires,
+        so it still counts against ``max_workers`` until then.
+
+        Args:
+            call (str or callable): A dotted path on the client, such as
+                ``containers.list`` or ``api.version``, or a function which
+                is given the client as first argument.
+            *args: Passed to the call.
+            timeout (float): Time each host has to answer, in seconds,
+                counted from the start of its call. Default: the fleet's
+                ``timeout``.
+            hosts (list): Only run the call on these hosts.
+            **kwargs: Passed to the call, except ``timeout`` and ``hosts``.
+
+        Yields:
+            (:py:class:`HostResult`): The outcome on each host.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        if isinstance(call, str):
+            call = _resolve(call)
+        if hosts is None:
+            hosts = list(self.clients)
+
+        started = {}
+        lock = threading.Lock()
+
+        def task(host):
+            with lock:
+                started[host] = time.monotonic()
+            return call(self.clients[host], *args, **kwargs)
+
+        pending = {self._executor.submit(task, host): host for host in hosts}
+        while pending:
+            wait_time = None
+            if timeout is not None:
+                now = time.monotonic()
+                with lock:
+                    running = [started[h] for h in pending.values()
+                               if h in started]
+                if running:
+                    wait_time = max(0, min(running) + timeout - now)
+                else:
+                    wait_time = timeout
+            done, _ = wait(pending, wait_time, FIRST_COMPLETED)
+            for future in done:
+                host = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    yield HostResult(host, future.result(), None)
+                else:
+                    yield HostResult(host, None, error)
+            if timeout is None:
+                continue
+            now = time.monotonic()
+            for future, host in list(pending.items()):
+                with lock:
+                    start = started.get(host)
+                if start is not None and now - start >= timeout:
+                    del pending[future]
+                    yield HostResult(host, None, HostTimeout(
+                        f'{host} did not answer within {timeout} seconds'
+                    ))
+
+    def gather(self, call, *args, **kwargs):
+        """
+        Like :py:meth:`run`, but wait for every host and return a
+        :py:class:`FleetResult`.
+        """
+        result = FleetResult()
+        for host, value, error in self.run(call, *args, **kwargs):
+            if error is None:
+                result.results[host] = value
+            else:
+                result.errors[host] = error
+        return result
+
+    def close(self):
+        """
+        Close the clients of every host.
+        """
+        self._executor.shutdown(wait=False)
+        for client in self.clients.values():
+            client.close()
+
+
+class _FleetCall:
+    def __init__(self, fleet, path):
+        self._fleet = fleet
+        self._path = path
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return _FleetCall(self._fleet, self._path + (name,))
+
+    def __call__(self, *args, **kwargs):
+        return self._fleet.gather('.'.join(self._path), *args, **kwargs)
+
+
+def _resolve(path):
+    names = path.split('.')
+
+    def call(client, *args, **kwargs):
+        target = client
+        for name in names:
+            target = getattr(target, name)
+        return target(*args, **kwargs)
+    return call
@@ -0,0 +1,212 @@
+import json
+import re
+import sqlite3
+import threading
+
+from .utils.events import watch_events
+
+IMAGE_ID_RE = re.compile(r'^(sha256:)?[0-9a-f]{64}$')
+DIGEST_RE = re.compile(r'@sha256:[0-9a-f]{64}$')
+
+# Image events which may move a tag to another image
+REF_ACTIONS = ('tag', 'untag', 'delete', 'pull', 'import', 'load')
+
+
+class ImageCache:
+    """
+    A persistent cache of image metadata.
+
+    The results of
+    :py:meth:`~docker.api.image.ImageApiMixin.inspect_image`,
+    :py:meth:`~docker.api.image.ImageApiMixin.history` and
+    :py:meth:`~docker.api.image.ImageApiMixin.inspect_distribution` are
+    stored under the image ID or digest they describe, which identify
+    their content, so they can be reused across runs.
+
+    Tags, on the other hand, can be moved to another image at any time. An
+    image requested by tag is only resolved from the cache while
+    :py:meth:`watch` is listening to the daemon's image events, which
+    invalidate the tag when it changes. Otherwise the daemon is asked
+    every time.
+
+    The ``RepoTags`` and ``RepoDigests`` of a cached image are those it had
+    when it was last fetched or, while watching, when it was last tagged
+    or untagged.
+
+    Args:
+        path (str): Path of the SQLite database. Default: an in-memory
+            database, which only lives as long as this object.
+
+    Example:
+
+        >>> cache = docker.ImageCache('/var/cache/myapp/images.db')
+        >>> client = docker.DockerClient(image_cache=cache)
+        >>> cache.watch(client.api)
+    """
+    def __init__(self, path=':memory:'):
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'kind TEXT, key TEXT, value TEXT, PRIMARY KEY (kind, key))'
+            )
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS digests ('
+                'ref TEXT PRIMARY KEY, id TEXT)'
+            )
+        self._tags = {}
+        self._events = None
+        self.generation = 0
+
+    @property
+    def watching(self):
+        """
+        ``True`` while the image events of a daemon are being watched.
+        """
+        return self._events is not None
+
+    def watch(self, client):
+        """
+        Start watching the image events of a daemon in a background thread,
+        which allows tags to be resolved from the cache.
+
+        Args:
+            client (:py:class:`~docker.api.client.APIClient`): A client
+                connected to the daemon the cached images come from.
+        """
+        self.stop()
+        events = client.events(decode=True, filters={'type': 'image'})
+        with self._lock:
+            self.generation += 1
+            self._tags.clear()
+            self._events = events
+        watch_events(events, self.handle_event, self._stopped_watching,
+                     'Image cache')
+
+    def stop(self):
+        """
+        Stop watching events, if :py:meth:`watch` was called.
+        """
+        with self._lock:
+            events, self._events = self._events, None
+            self._tags.clear()
+        if events is not None:
+            events.close()
+
+    def close(self):
+        """
+        Stop watching events and close the database.
+        """
+        self.stop()
+        with self._lock:
+            self._db.close()
+
+    def resolve(self, image):
+        """
+        Return the ID of an image if it can be known without asking the
+        daemon, otherwise ``None``.
+        """
+        if not image:
+            return None
+        if IMAGE_ID_RE.match(image):
+            return image if image.startswith('sha256:') else f'sha256:{image}'
+        with self._lock:
+            if DIGEST_RE.search(image):
+                row = self._db.execute(
+                    'SELECT id FROM digests WHERE ref = ?', (image,)
+                ).fetchone()
+                return row[0] if row else None
+            if self._events is not None:
+                return self._tags.get(image)
+        return None
+
+    def get(self, kind, key):
+        """
+        Return a cached entry, or ``None`` if there is none.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value FROM entries WHERE kind = ? AND key = ?',
+                (kind, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, kind, key, value):
+        """
+        Store an entry.
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?)',
+                (kind, key, json.dumps(value))
+            )
+
+    def add_image(self, image, attrs, generation):
+        """
+        Store the result of inspecting ``image``, and remember which image
+        it refers to.
+
+        Args:
+            image (str): The name or ID the image was inspected with.
+            attrs (dict): The result of the inspection.
+            generation (int): The value of :py:attr:`generation` before
+                the request was sent. Nothing is stored if an event has
+                been handled since, as the result may already be stale.
+        """
+        image_id = attrs['Id']
+        with self._lock:
+            if generation != self.generation:
+                return
+            self.put('inspect', image_id, attrs)
+            if DIGEST_RE.search(image):
+                with self._db:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO digests VALUES (?, ?)',
+                        (image, image_id)
+                    )
+            elif self._events is not None and not IMAGE_ID_RE.match(image):
+                self._tags[image] = image_id
+
+    def invalidate(self, image, deleted=False):
+        """
+        Forget the tags of an image, or everything about it if it has been
+        ``deleted``. Tags of other images are forgotten too, since one of
+        them may have been moved.
+        """
+        image_id = self.resolve(image)
+        with self._lock, self._db:
+            self.generation += 1
+            self._tags.clear()
+            if not image_id:
+                return
+            # The tags are part of the inspect and history results
+            self._db.execute(
+                "DELETE FROM entries WHERE key = ? AND kind != 'distribution'",
+                (image_id,)
+            )
+            if deleted:
+                self._db.execute(
+                    'DELETE FROM digests WHERE id = ?', (image_id,)
+                )
+
+    def handle_event(self, event):
+        """
+        Update the cache according to an image event from the daemon.
+        """
+        if event.get('Type') != 'image':
+            return
+        action = event.get('Action')
+        if action not in REF_ACTIONS:
+            return
+        image_id = event.get('Actor', {}).get('ID') or event.get('id', '')
+        if not IMAGE_ID_RE.match(image_id):
+            # Pulls, imports and loads are reported by name
+            image_id = ''
+        self.invalidate(image_id, deleted=action == 'delete')
+
+    def _stopped_watching(self, events):
+        with self._lock:
+            if self._events is events:
+                self._events = None
+                self._tags.clear()
@@ -0,0 +1,564 @@
+import logging
+import queue
+import threading
+import time
+
+import requests
+
+from .errors import DockerException
+from .utils.events import watch_events
+
+log = logging.getLogger(__name__)
+
+KINDS = ('container', 'image', 'network', 'volume')
+
+# Events which do not change how a resource is listed
+IGNORED_ACTIONS = {
+    'container': frozenset((
+        'attach', 'detach', 'resize', 'top', 'export', 'copy',
+        'archive-path', 'extract-to-dir', 'exec_create', 'exec_start',
+        'exec_detach', 'exec_die',
+    )),
+    'volume': frozenset(('mount', 'unmount')),
+}
+DELETE_ACTIONS = frozenset(('destroy', 'delete', 'remove'))
+
+_RECONNECT = object()
+_STOP = object()
+
+
+class Store:
+    """
+    A thread-safe, in-memory copy of the resources of one kind, with
+    secondary indexes. Kept up to date by an :py:class:`Informer`.
+
+    The resources are the dictionaries returned by the list endpoints of
+    the daemon. They are shared with every reader and must not be
+    modified.
+    """
+    def __init__(self, key):
+        self._key = key
+        self._lock = threading.RLock()
+        self._items = {}
+        self._versions = {}
+        self._indexers = {}
+        self._indexes = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def get(self, key):
+        """
+        Return the resource with the given key, or ``None``.
+        """
+        with self._lock:
+            return self._items.get(key)
+
+    def list(self):
+        """
+        Return all the resources.
+        """
+        with self._lock:
+            return list(self._items.values())
+
+    def keys(self):
+        """
+        Return the keys of all the resources.
+        """
+        with self._lock:
+            return list(self._items)
+
+    def add_index(self, name, func):
+        """
+        Index the resources by the values ``func`` returns for them.
+
+        Args:
+            name (str): The name of the index.
+            func (callable): Given a resource, returns an iterable of the
+                values it is indexed under.
+        """
+        with self._lock:
+            self._indexers[name] = func
+            index = self._indexes[name] = {}
+            for key, item in self._items.items():
+                for value in func(item):
+                    index.setdefault(value, set()).add(key)
+
+    def by_index(self, name, value):
+        """
+        Return the resources indexed under ``value`` in an index.
+
+        Raises:
+            KeyError: If there is no such index.
+        """
+        with self._lock:
+            keys = self._indexes[name].get(value, ())
+            return [self._items[key] for key in keys]
+
+    def replace(self, items, version):
+        """
+        Replace every resource with the result of a list request.
+
+        Returns:
+            (list): An ``(old, new)`` tuple for each resource which was
+            added, updated or deleted.
+        """
+        items = {self._key(item): item for item in items}
+        with self._lock:
+            changes = [
+                self._delete(key, version)
+                for key in list(self._items) if key not in items
+            ]
+            changes.extend(
+                self._upsert(key, item, version, force=True)
+                for key, item in items.items()
+            )
+        return [change for change in changes if change is not None]
+
+    def upsert(self, item, version):
+        """
+        Add or update a resource, unless it is already known from a later
+        version.
+
+        Returns:
+            (tuple): ``(old, new)``, or ``None`` if nothing changed.
+        """
+        with self._lock:
+            return self._upsert(self._key(item), item, version)
+
+    def delete(self, key, version):
+        """
+        Delete a resource, unless it is already known from a later
+        version.
+
+        Returns:
+            (tuple): ``(old, None)``, or ``None`` if nothing changed.
+        """
+        with self._lock:
+            return self._delete(key, version)
+
+    def _upsert(self, key, item, version, force=False):
+        if not force and version < self._versions.get(key, 0):
+            return None
+        self._versions[key] = version
+        old = self._items.get(key)
+        if old == item:
+            return None
+        self._items[key] = item
+        self._reindex(key, old, item)
+        return old, item
+
+    def _delete(self, key, version):
+        if version < self._versions.get(key, 0):
+            return None
+        self._versions.pop(key, None)
+        old = self._items.pop(key, None)
+        if old is None:
+            return None
+        self._reindex(key, old, None)
+        return old, None
+
+    def _reindex(self, key, old, new):
+        for name, func in self._indexers.items():
+            index = self._indexes[name]
+            if old is not None:
+                for value in func(old):
+                    keys = index.get(value)
+                    if keys is not None:
+                        keys.discard(key)
+                        if not keys:
+                            del index[value]
+            if new is not None:
+                for value in func(new):
+                    index.setdefault(value, set()).add(key)
+
+
+class Informer:
+    """
+    A local mirror of the containers, images, networks and volumes of a
+    daemon, kept up to date from its events instead of listing them over
+    and over.
+
+    Each kind of resource is listed once when the informer starts. Events
+    are then applied in the order of their ``timeNano``: a container,
+    network or volume an event is about is fetched again with a targeted
+    list request, and deleted resources are dropped without any request.
+    Images cannot be listed one at a time, so image events are batched
+    into a single new list of images. Everything is listed again every
+    ``resync_period`` seconds, and whenever the event stream has to be
+    reopened, to repair any drift. When listing or fetching fails, the
+    informer is not synced anymore, and keeps listing everything again
+    until it succeeds.
+
+    Handlers are called from a background thread, with the resources as
+    returned by the list endpoints.
+
+    Args:
+        client (:py:class:`~docker.api.client.APIClient`): The client of
+            the daemon to mirror.
+        kinds (list): The kinds of resources to mirror, among
+            ``container``, ``image``, ``network`` and ``volume``. Default:
+            all of them.
+        resync_period (float): Time between two full lists, in seconds.
+            ``None`` to only list on start and reconnection. Default: 300
+        retry_interval (float): Time to wait before reopening the event
+            stream or listing again after it failed, in seconds, doubled up
+            to 30 seconds while it keeps failing. Default: 1
+
+    Example:
+
+        >>> informer = docker.Informer(client.api, kinds=['container'])
+        >>> informer.add_index(
+        ...     'container', 'project',
+        ...     lambda c: [c['Labels'].get('com.docker.compose.project')]
+        ... )
+        >>> informer.add_handler(
+        ...     'container', on_delete=lambda c: print('gone', c['Id'])
+        ... )
+        >>> informer.start()
+        >>> informer.wait_synced(timeout=30)
+        True
+        >>> informer.by_index('container', 'project', 'web')
+    """
+    def __init__(self, client, kinds=KINDS, resync_period=300,
+                 retry_interval=1):
+        for kind in kinds:
+            if kind not in KINDS:
+                raise DockerException(
+                    f'Invalid resource kind {kind!r}, expected one of '
+                    f'{", ".join(KINDS)}'
+                )
+        self.client = client
+        self.kinds = tuple(kinds)
+        self.resync_period = resync_period
+        self.retry_interval = retry_interval
+        self._stores = {
+            kind: Store(_volume_key if kind == 'volume' else _id_key)
+            for kind in self.kinds
+        }
+        self._lock = threading.Lock()
+        self._handlers = dict.fromkeys(self.kinds, ())
+        self._queue = queue.Queue()
+        self._synced = threading.Event()
+        self._stopping = threading.Event()
+        self._events = None
+        self._thread = None
+        self._version = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def synced(self):
+        """
+        ``True`` while the mirror is up to date: every kind of resource has
+        been listed, and neither listing nor fetching has failed since.
+        """
+        return self._synced.is_set()
+
+    @property
+    def resource_version(self):
+        """
+        The ``timeNano`` of the last event applied to the mirror.
+        """
+        return self._version
+
+    def store(self, kind):
+        """
+        Return the :py:class:`Store` of a kind of resource.
+        """
+        return self._stores[kind]
+
+    def get(self, kind, key):
+        """
+        Return a resource from the mirror, or ``None``.
+
+        Args:
+            kind (str): The kind of resource.
+            key (str): The ID of the resource, or its name for a volume.
+        """
+        return self._stores[kind].get(key)
+
+    def list(self, kind):
+        """
+        Return every resource of a kind from the mirror.
+        """
+        return self._stores[kind].list()
+
+    def add_index(self, kind, name, func):
+        """
+        Index the resources of a kind. See :py:meth:`Store.add_index`.
+        """
+        self._stores[kind].add_index(name, func)
+
+    def by_index(self, kind, name, value):
+        """
+        Return the resources of a kind indexed under ``value``. See
+        :py:meth:`Store.by_index`.
+        """
+        return self._stores[kind].by_index(name, value)
+
+    def add_handler(self, kind, on_add=None, on_update=None, on_delete=None):
+        """
+        Register functions called when a resource is added, updated or
+        deleted. Resources already in the mirror are passed to ``on_add``
+        right away.
+
+        Args:
+            kind (str): The kind of resource.
+            on_add (callable): Called with the new resource.
+            on_update (callable): Called with the old and new resource.
+            on_delete (callable): Called with the deleted resource.
+        """
+        with self._lock:
+            # Replaced rather than modified, since it may be iterated over
+            self._handlers[kind] += ((on_add, on_update, on_delete),)
+        if on_add is not None:
+            for item in self._stores[kind].list():
+                on_add(item)
+
+    def start(self):
+        """
+        Open the event stream and start mirroring in a background thread.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the event stream cannot be opened.
+        """
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        # Events are watched before listing so that none is missed
+        self._connect()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def wait_synced(self, timeout=None):
+        """
+        Wait until the mirror is up to date.
+
+        Returns:
+            (bool): ``True`` if the mirror is synced, ``False`` if the
+            timeout expired.
+        """
+        return self._synced.wait(timeout)
+
+    def resync(self):
+        """
+        List every kind of resource again, as soon as the events received
+        so far have been applied.
+        """
+        self._queue.put(None)
+
+    def stop(self):
+        """
+        Stop mirroring. The mirror keeps its last state.
+        """
+        self._stopping.set()
+        events, self._events = self._events, None
+        if events is not None:
+            events.close()
+        self._queue.put(_STOP)
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _connect(self):
+        since = None
+        if self._version:
+            seconds, nanoseconds = divmod(self._version, 10 ** 9)
+            since = f'{seconds}.{nanoseconds:09d}'
+        events = self.client.events(
+            since=since, decode=True, filters={'type': list(self.kinds)}
+        )
+        self._events = events
+        watch_events(events, self._queue.put, self._stopped_reading,
+                     'Informer')
+
+    def _stopped_reading(self, events):
+        if not self._stopping.is_set():
+            self._queue.put(_RECONNECT)
+
+    def _run(self):
+        try:
+            self._sync()
+            next_resync = self._next_resync()
+            while not self._stopping.is_set():
+                try:
+                    batch = [self._queue.get(timeout=self._wait(next_resync))]
+                except queue.Empty:
+                    batch = [None]
+                # Take every event already received, to apply them in order
+                # and fetch each resource once
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if _STOP in batch:
+                    return
+                relist = None in batch or _RECONNECT in batch
+                try:
+                    self._apply(sorted(
+                        (event for event in batch if isinstance(event, dict)),
+                        key=_event_version
+                    ))
+                except (DockerException,
+                        requests.exceptions.RequestException) as e:
+                    self._synced.clear()
+                    log.warning(f'Could not apply events: {e}')
+                    relist = True
+                if _RECONNECT in batch:
+                    self._reconnect()
+                if relist:
+                    self._sync()
+                    next_resync = self._next_resync()
+        except Exception:
+            self._synced.clear()
+            log.exception('Informer stopped')
+
+    def _sync(self):
+        delay = self.retry_interval
+        while not self._stopping.is_set():
+            try:
+                self._relist(self.kinds)
+            except (DockerException,
+                    requests.exceptions.RequestException) as e:
+                self._synced.clear()
+                log.warning(f'Could not list resources: {e}')
+                self._stopping.wait(delay)
+                delay = min(delay * 2, 30)
+            else:
+                self._synced.set()
+                return
+
+    def _reconnect(self):
+        delay = self.retry_interval
+        while not self._stopping.is_set():
+            try:
+                self._connect()
+                return
+            except Exception as e:
+                log.debug(f'Could not reopen the event stream: {e}')
+                self._stopping.wait(delay)
+                delay = min(delay * 2, 30)
+
+    def _next_resync(self):
+        if self.resync_period is None:
+            return None
+        return time.monotonic() + self.resync_period
+
+    def _wait(self, deadline):
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic(), 0)
+
+    def _apply(self, events):
+        # The last event about a resource decides what to do with it
+        operations = {}
+        relist = set()
+        for event in events:
+            version = _event_version(event)
+            self._version = max(self._version, version)
+            kind = event.get('Type')
+            if kind not in self._stores:
+                continue
+            action = (event.get('Action') or event.get('status') or '')
+            action = action.split(':')[0]
+            if action in IGNORED_ACTIONS.get(kind, ()):
+                continue
+            if kind == 'image':
+                relist.add(kind)
+                continue
+            actor = event.get('Actor', {})
+            key = actor.get('ID') or event.get('id')
+            operation = 'delete' if action in DELETE_ACTIONS else 'fetch'
+            operations.pop((kind, key), None)
+            operations[(kind, key)] = (operation, version)
+            container = actor.get('Attributes', {}).get('container')
+            if kind == 'network' and container and (
+                    'container' in self._stores):
+                # Connecting a container changes its network settings
+                operations.pop(('container', container), None)
+                operations[('container', container)] = ('fetch', version)
+
+        for (kind, key), (operation, version) in operations.items():
+            store = self._stores[kind]
+            item = None
+            if operation == 'fetch':
+                item = self._fetch(kind, key)
+            if item is None:
+                change = store.delete(key, version)
+            else:
+                change = store.upsert(item, version)
+            if change is not None:
+                self._notify(kind, [change])
+        self._relist(relist)
+
+    def _relist(self, kinds):
+        for kind in kinds:
+            version = self._version
+            changes = self._stores[kind].replace(self._list(kind), version)
+            self._notify(kind, changes)
+
+    def _list(self, kind):
+        if kind == 'container':
+            return self.client.containers(all=True)
+        if kind == 'image':
+            return self.client.images()
+        if kind == 'network':
+            return self.client.networks()
+        return self.client.volumes().get('Volumes') or []
+
+    def _fetch(self, kind, key):
+        if kind == 'container':
+            items = self.client.containers(all=True, filters={'id': key})
+        elif kind == 'network':
+            items = self.client.networks(ids=[key])
+        else:
+            items = self.client.volumes(filters={'name': key})
+            items = items.get('Volumes') or []
+        key_func = _volume_key if kind == 'volume' else _id_key
+        # Filters match prefixes and substrings
+        for item in items:
+            if key_func(item) == key:
+                return item
+        return None
+
+    def _notify(self, kind, changes):
+        with self._lock:
+            handlers = self._handlers[kind]
+        for old, new in changes:
+            for on_add, on_update, on_delete in handlers:
+                try:
+                    if old is None:
+                        if on_add is not None:
+                            on_add(new)
+                    elif new is None:
+                        if on_delete is not None:
+                            on_delete(old)
+                    elif on_update is not None:
+                        on_update(old, new)
+                except Exception:
+                    log.exception(f'Informer handler for {kind} failed')
+
+
+def _id_key(item):
+    return item['Id']
+
+
+def _volume_key(item):
+    return item['Name']
+
+
+def _event_version(event):
+    return event.get('timeNano') or event.get('time', 0) * 10 ** 9
@@ -0,0 +1,197 @@
+import re
+import time
+from collections import namedtuple
+
+# Types of BuildEvent
+STEP_START = 'step_start'
+STEP_END = 'step_end'
+CACHE_HIT = 'cache_hit'
+PULL = 'pull'
+OUTPUT = 'output'
+AUX = 'aux'
+ERROR = 'error'
+IMAGE = 'image'
+
+STEP_RE = re.compile(r'^Step (\d+)(?:/(\d+))? : (.*)$')
+IMAGE_RE = re.compile(r'(^Successfully built |sha256:)([0-9a-f]+)$')
+CACHE_LINE = ' ---> Using cache'
+
+
+class BuildEvent(namedtuple('BuildEvent', 'type,step,text,data')):
+    """
+    An event of a build, with the properties ``type`` (one of
+    ``step_start``, ``step_end``, ``cache_hit``, ``pull``, ``output``,
+    ``aux``, ``error`` and ``image``), ``step`` (the :py:class:`BuildStep`
+    the event belongs to, if any), ``text`` (the line of output, the error
+    message or the image ID) and ``data`` (the JSON chunk the event comes
+    from).
+    """
+    __slots__ = ()
+
+
+class BuildStep(namedtuple(
+        'BuildStep', 'number,total,instruction,duration,cached')):
+    """
+    A step of a build, with the properties ``number``, ``total`` (the
+    number of steps of the build, if known), ``instruction``, ``duration``
+    (in seconds, ``None`` until the step ends) and ``cached`` (``True`` if
+    the step was taken from the build cache).
+    """
+    __slots__ = ()
+
+
+class BuildEventParser:
+    """
+    Parses the JSON chunks of a build's output into
+    :py:class:`BuildEvent` objects, in a single pass, and records the
+    duration of each step and whether it came from the build cache.
+
+    Pass it to :py:meth:`~docker.models.images.ImageCollection.build`, or
+    feed it the output of :py:meth:`~docker.api.build.BuildApiMixin.build`
+    with ``decode=True``.
+
+    Args:
+        callback (callable): Called with each event as it is parsed.
+
+    Example:
+
+        >>> parser = BuildEventParser()
+        >>> image, logs = client.images.build(path='.', parser=parser)
+        >>> parser.cache_hit_ratio
+        0.75
+        >>> parser.slowest_steps(1)
+        [BuildStep(number=4, total=6, instruction='RUN make',
+                   duration=81.2, cached=False)]
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.steps = []
+        self.image_id = None
+        self.error = None
+        self._buffer = ''
+        self._step = None
+        self._started_at = None
+        self._cached = False
+
+    @property
+    def cache_hit_ratio(self):
+        """
+        The share of the steps so far which came from the build cache, or
+        ``None`` before the first step.
+        """
+        if not self.steps:
+            return None
+        return sum(step.cached for step in self.steps) / len(self.steps)
+
+    def slowest_steps(self, count=5):
+        """
+        Return the ``count`` slowest steps which have ended, slowest first.
+        """
+        return sorted(
+            self.steps, key=lambda step: step.duration, reverse=True
+        )[:count]
+
+    def parse(self, chunks):
+        """
+        Parse JSON chunks, and generate their events.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    def feed(self, chunk):
+        """
+        Parse a JSON chunk.
+
+        Returns:
+            (list): The :py:class:`BuildEvent` objects of the chunk.
+        """
+        events = []
+        if 'error' in chunk:
+            self.error = chunk['error']
+            if self._buffer:
+                self._line(self._buffer, chunk, events)
+                self._buffer = ''
+            self._end_step(chunk, events)
+            events.append(BuildEvent(ERROR, None, chunk['error'], chunk))
+        elif 'stream' in chunk:
+            lines = (self._buffer + chunk['stream']).split('\n')
+            # The output is not split on line boundaries
+            self._buffer = lines.pop()
+            for line in lines:
+                self._line(line, chunk, events)
+        elif 'status' in chunk:
+            events.append(BuildEvent(
+                PULL, self._step, chunk['status'], chunk
+            ))
+        elif 'aux' in chunk:
+            aux = chunk['aux']
+            if isinstance(aux, dict) and 'ID' in aux:
+                self.image_id = aux['ID']
+                events.append(BuildEvent(IMAGE, None, aux['ID'], chunk))
+            else:
+                events.append(BuildEvent(AUX, self._step, None, chunk))
+        self._emit(events)
+        return events
+
+    def close(self):
+        """
+        Parse the end of the output, and end the last step.
+
+        Returns:
+            (list): The remaining :py:class:`BuildEvent` objects.
+        """
+        events = []
+        if self._buffer:
+            self._line(self._buffer, None, events)
+            self._buffer = ''
+        self._end_step(None, events)
+        self._emit(events)
+        return events
+
+    def _line(self, line, chunk, events):
+        match = STEP_RE.match(line)
+        if match:
+            now = time.monotonic()
+            self._end_step(chunk, events, now)
+            self._step = BuildStep(
+                int(match.group(1)),
+                int(match.group(2)) if match.group(2) else None,
+                match.group(3), None, False,
+            )
+            self._started_at = now
+            self._cached = False
+            events.append(BuildEvent(STEP_START, self._step, line, chunk))
+            return
+        if line.startswith(CACHE_LINE) and self._step is not None:
+            self._cached = True
+            events.append(BuildEvent(CACHE_HIT, self._step, line, chunk))
+            return
+        match = IMAGE_RE.search(line)
+        if match:
+            self.image_id = match.group(2)
+            if line.startswith('Successfully built '):
+                # The last step ends with the build
+                self._end_step(chunk, events)
+                events.append(BuildEvent(IMAGE, None, self.image_id, chunk))
+                return
+        if line:
+            events.append(BuildEvent(OUTPUT, self._step, line, chunk))
+
+    def _end_step(self, chunk, events, now=None):
+        if self._step is None:
+            return
+        if now is None:
+            now = time.monotonic()
+        step = self._step._replace(
+            duration=now - self._started_at,
+            cached=self._cached,
+        )
+        self._step = None
+        self.steps.append(step)
+        events.append(BuildEvent(STEP_END, step, None, chunk))
+
+    def _emit(self, events):
+        if self.callback is not None:
+            for event in events:
+                self.callback(event)
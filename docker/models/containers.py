@@ -1,5 +1,8 @@
 import copy
 import ntpath
+import shlex
+import threading
+import uuid
 from collections import namedtuple
 
 from ..api import APIClient
@@ -13,7 +16,10 @@ from ..errors import (
 )
 from ..types import HostConfig, NetworkingConfig
 from ..utils import version_gte
+from ..utils.capture import CaptureSink
+from ..utils.socket import STDERR, STDOUT, DuplexStream
 from .images import Image
+from .logs import LogFollower
 from .resource import Collection, Model
 
 
@@ -24,21 +30,28 @@ class Container(Model):
         query the Docker daemon for the current properties, causing
         :py:attr:`attrs` to be refreshed.
     """
+    __slots__ = ()
 
     @property
     def name(self):
         """
         The name of the container.
         """
-        if self.attrs.get('Name') is not None:
-            return self.attrs['Name'].lstrip('/')
+        return self._field('name', self._name)
+
+    @staticmethod
+    def _name(attrs):
+        if attrs.get('Name') is not None:
+            return attrs['Name'].lstrip('/')
 
     @property
     def image(self):
         """
         The image of the container.
         """
-        image_id = self.attrs.get('ImageID', self.attrs['Image'])
+        image_id = self._field(
+            'image_id', lambda attrs: attrs.get('ImageID', attrs['Image'])
+        )
         if image_id is None:
             return None
         return self.client.images.get(image_id.split(':')[1])
@@ -48,8 +61,12 @@ class Container(Model):
         """
         The labels of a container as dictionary.
         """
+        return self._field('labels', self._labels)
+
+    @staticmethod
+    def _labels(attrs):
         try:
-            result = self.attrs['Config'].get('Labels')
+            result = attrs['Config'].get('Labels')
             return result or {}
         except KeyError as ke:
             raise DockerException(
@@ -62,9 +79,13 @@ class Container(Model):
         """
         The status of the container. For example, ``running``, or ``exited``.
         """
-        if isinstance(self.attrs['State'], dict):
-            return self.attrs['State']['Status']
-        return self.attrs['State']
+        return self._field('status', self._status)
+
+    @staticmethod
+    def _status(attrs):
+        if isinstance(attrs['State'], dict):
+            return attrs['State']['Status']
+        return attrs['State']
 
     @property
     def health(self):
@@ -73,14 +94,21 @@ class Container(Model):
 
         For example, ``healthy`, or ``unhealthy`.
         """
-        return self.attrs.get('State', {}).get('Health', {}).get('Status', 'unknown')
+        return self._field('health', self._health)
+
+    @staticmethod
+    def _health(attrs):
+        return attrs.get('State', {}).get('Health', {}).get('Status', 'unknown')
 
     @property
     def ports(self):
         """
         The ports that the container exposes as a dictionary.
         """
-        return self.attrs.get('NetworkSettings', {}).get('Ports', {})
+        return self._field(
+            'ports',
+            lambda attrs: attrs.get('NetworkSettings', {}).get('Ports', {})
+        )
 
     def attach(self, **kwargs):
         """
@@ -150,6 +178,58 @@ class Container(Model):
                                       **kwargs)
         return self.client.images.get(resp['Id'])
 
+    def copy_from(self, path, dest_dir, **kwargs):
+        """
+        Copy a file or folder from this container to a local folder. The
+        archive is extracted while it is being received.
+
+        Args:
+            path (str): Path to the file or folder to retrieve
+            dest_dir (str): Local folder to extract the file or folder into.
+                It is created if it does not exist.
+            progress (callable): Called as ``progress(name, written, size)``
+                while the content of each file is being written.
+            chunk_size (int): The number of bytes read from the response and
+                written to disk at a time. Default: 2 MB
+
+        Returns:
+            (dict): ``stat`` information on the specified ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+            :py:class:`docker.errors.UnsafeArchivePath`
+                If the archive contains members that would be extracted
+                outside of ``dest_dir``.
+        """
+        return self.client.api.copy_from(self.id, path, dest_dir, **kwargs)
+
+    def copy_to(self, src_paths, dest, **kwargs):
+        """
+        Copy local files or folders into this container. The tar archive is
+        built while it is being uploaded, so memory usage stays bounded.
+
+        Args:
+            src_paths (str or list): Local files or folders to copy. Each one
+                is created under its base name inside ``dest``.
+            dest (str): Path inside the container where the file(s) will be
+                extracted. Must exist.
+            exclude (list): ``.dockerignore``-style patterns of paths to
+                skip, relative to each folder in ``src_paths``.
+            gzip (bool): Compress the archive with gzip during transmission.
+                Default: False
+            chunk_size (int): The size of each chunk of the request body.
+                Default: 2 MB
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return self.client.api.copy_to(self.id, src_paths, dest, **kwargs)
+
     def diff(self):
         """
         Inspect changes on a container's filesystem.
@@ -166,7 +246,8 @@ class Container(Model):
 
     def exec_run(self, cmd, stdout=True, stderr=True, stdin=False, tty=False,
                  privileged=False, user='', detach=False, stream=False,
-                 socket=False, environment=None, workdir=None, demux=False):
+                 socket=False, environment=None, workdir=None, demux=False,
+                 sink=None):
         """
         Run a command inside this container. Similar to
         ``docker exec``.
@@ -189,6 +270,10 @@ class Container(Model):
                 ``{"PASSWORD": "xxx"}``.
             workdir (str): Path to working directory for this exec session
             demux (bool): Return stdout and stderr separately
+            sink (:py:class:`~docker.utils.capture.CaptureSink` or tuple):
+                Write the output to this sink, or to a tuple of two sinks
+                (for stdout and stderr) if ``demux=True``, instead of loading
+                it in memory.
 
         Returns:
             (ExecResult): A tuple of (exit_code, output)
@@ -199,6 +284,7 @@ class Container(Model):
                     If ``stream=True``, a generator yielding response chunks.
                     If ``socket=True``, a socket object for the connection.
                     If ``demux=True``, a tuple of two bytes: stdout and stderr.
+                    If ``sink`` is set, the sink.
                     A bytestring containing response data otherwise.
 
         Raises:
@@ -212,7 +298,7 @@ class Container(Model):
         )
         exec_output = self.client.api.exec_start(
             resp['Id'], detach=detach, tty=tty, stream=stream, socket=socket,
-            demux=demux
+            demux=demux, sink=sink
         )
         if socket or stream:
             return ExecResult(None, exec_output)
@@ -222,6 +308,35 @@ class Container(Model):
             exec_output
         )
 
+    def exec_session(self, shell='/bin/sh', **kwargs):
+        """
+        Start a shell inside this container to run many commands in, with
+        one round trip each. See :py:class:`ExecSession`.
+
+        Args:
+            shell (str): The shell to start. Default: ``/bin/sh``
+            user (str): User to execute commands as. Default: root
+            privileged (bool): Run as privileged.
+            environment (dict or list): A dictionary or a list of strings in
+                the following format ``["PASSWORD=xxx"]`` or
+                ``{"PASSWORD": "xxx"}``.
+            workdir (str): Path to working directory for the commands.
+
+        Returns:
+            (:py:class:`ExecSession`)
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> with container.exec_session() as session:
+            ...     for path in paths:
+            ...         exit_code, output = session.run(['stat', path])
+        """
+        return ExecSession(self, shell, **kwargs)
+
     def export(self, chunk_size=DEFAULT_DATA_CHUNK_SIZE):
         """
         Export the contents of the container's filesystem as a tar archive.
@@ -240,6 +355,29 @@ class Container(Model):
         """
         return self.client.api.export(self.id, chunk_size)
 
+    def export_to(self, dest, **kwargs):
+        """
+        Export the contents of the container's filesystem as a tar archive,
+        and save it straight to a file.
+
+        Args:
+            dest (str, int or file): The path of the file to write, an open
+                file descriptor, or a writable file-like object
+            chunk_size (int): The size of the read buffer. Default: 2 MB
+            fsync (bool or int): ``True`` to flush the file to disk once the
+                export is complete, or a number of bytes after which the file
+                is flushed to disk periodically. Default: ``False``
+
+        Returns:
+            (:py:class:`~docker.utils.archive.TransferResult`): The number of
+            bytes written and the time it took.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return self.client.api.export_to(self.id, dest, **kwargs)
+
     def get_archive(self, path, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
                     encode_stream=False):
         """
@@ -276,6 +414,32 @@ class Container(Model):
         return self.client.api.get_archive(self.id, path,
                                            chunk_size, encode_stream)
 
+    def get_archive_to(self, path, dest, **kwargs):
+        """
+        Retrieve a file or folder from the container in the form of a tar
+        archive, and save the archive straight to a file.
+
+        Args:
+            path (str): Path to the file or folder to retrieve
+            dest (str, int or file): The path of the file to write, an open
+                file descriptor, or a writable file-like object
+            chunk_size (int): The size of the read buffer. Default: 2 MB
+            fsync (bool or int): ``True`` to flush the file to disk once the
+                transfer is complete, or a number of bytes after which the
+                file is flushed to disk periodically. Default: ``False``
+
+        Returns:
+            (tuple): First element is a
+            :py:class:`~docker.utils.archive.TransferResult`. Second element
+            is a dict containing ``stat`` information on the specified
+            ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return self.client.api.get_archive_to(self.id, path, dest, **kwargs)
+
     def kill(self, signal=None):
         """
         Kill or send a signal to the container.
@@ -311,6 +475,12 @@ class Container(Model):
             until (datetime, int, or float): Show logs that occurred before
                 the given datetime, integer epoch (in seconds), or
                 float (in nanoseconds)
+            sink (:py:class:`~docker.utils.capture.CaptureSink` or tuple):
+                Read the logs progressively into this sink, or into a tuple
+                of two sinks if ``demux`` is ``True``, and return it instead
+                of loading them in memory. Ignored if ``stream`` is ``True``.
+            demux (bool): Return stdout and stderr separately, as tuples of
+                ``(stdout, stderr)``. Default ``False``
 
         Returns:
             (generator of bytes or bytes): Logs from the container.
@@ -321,6 +491,27 @@ class Container(Model):
         """
         return self.client.api.logs(self.id, **kwargs)
 
+    def follow_logs(self, **kwargs):
+        """
+        Follow the logs of this container as structured records, resuming
+        from a checkpoint after the connection drops or the process
+        restarts. See :py:class:`~docker.models.logs.LogFollower`.
+
+        Args:
+            store: Where checkpoints are loaded from and saved to.
+            stdout (bool): Follow ``STDOUT``. Default ``True``
+            stderr (bool): Follow ``STDERR``. Default ``True``
+            batch_size (int): Maximum number of records in a batch.
+            flush_interval (float): Maximum time a record waits for its
+                batch to be yielded, in seconds.
+            retry_interval (float): Time to wait before reconnecting, in
+                seconds.
+
+        Returns:
+            (:py:class:`~docker.models.logs.LogFollower`)
+        """
+        return LogFollower(self, **kwargs)
+
     def pause(self):
         """
         Pauses all processes within this container.
@@ -528,8 +719,177 @@ class Container(Model):
         return self.client.api.wait(self.id, **kwargs)
 
 
+class ExecSession:
+    """
+    A shell running inside a container, which commands are sent to over a
+    single exec connection.
+
+    :py:meth:`Container.exec_run` creates, starts and inspects a new exec
+    instance for every command, which takes three requests. A session
+    writes each command to the shell's stdin followed by markers, which
+    delimit its output and carry its exit code, so running a command only
+    takes a round trip on the connection.
+
+    Each command runs in a subshell with stdin closed, so it can neither
+    change the state of the session (working directory, variables) nor
+    read the commands which follow. Use ``isolate=True`` to run a command
+    with :py:meth:`Container.exec_run` instead.
+
+    Create sessions with :py:meth:`Container.exec_session`.
+    """
+    def __init__(self, container, shell='/bin/sh', user='', privileged=False,
+                 environment=None, workdir=None):
+        self.container = container
+        self._exec_kwargs = {
+            'user': user, 'privileged': privileged,
+            'environment': environment, 'workdir': workdir,
+        }
+        api = container.client.api
+        self.exec_id = api.exec_create(
+            container.id, [shell], stdin=True, stdout=True, stderr=True,
+            tty=False, **self._exec_kwargs
+        )['Id']
+        self._stream = DuplexStream(
+            api.exec_start(self.exec_id, socket=True)
+        )
+        self._frames = iter(self._stream)
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def run(self, cmd, demux=False, isolate=False):
+        """
+        Run a command in the session.
+
+        Args:
+            cmd (str or list): The command. A string is interpreted by the
+                shell.
+            demux (bool): Return stdout and stderr separately.
+            isolate (bool): Run the command in its own exec instance with
+                :py:meth:`Container.exec_run`, using the session's user,
+                environment and working directory.
+
+        Returns:
+            (ExecResult): A tuple of (exit_code, output), where output is
+                a bytestring, or a tuple of two bytestrings (stdout and
+                stderr) if ``demux=True``.
+
+        Raises:
+            :py:class:`docker.errors.DockerException`
+                If the shell exited.
+        """
+        if isolate:
+            return self.container.exec_run(
+                cmd, demux=demux, **self._exec_kwargs
+            )
+        if not isinstance(cmd, str):
+            cmd = ' '.join(shlex.quote(arg) for arg in cmd)
+        marker = uuid.uuid4().hex
+        script = (
+            f'( eval {shlex.quote(cmd)} ) </dev/null\n'
+            f"printf '\\n%s:%d\\n' {marker} $?\n"
+            f"printf '\\n%s\\n' {marker} >&2\n"
+        )
+        with self._lock:
+            if self.closed:
+                raise DockerException('The exec session is closed')
+            self._stream.write(script.encode('utf-8'))
+            frames, ends, exit_code = self._read_until(marker.encode('ascii'))
+
+        # Copy the frames, in order, up to the markers
+        remaining = {STDOUT: ends[STDOUT], STDERR: ends[STDERR]}
+        output = {STDOUT: [], STDERR: []}
+        ordered = []
+        for stream, data in frames:
+            data = data[:remaining[stream]]
+            remaining[stream] -= len(data)
+            if data:
+                output[stream].append(data)
+                ordered.append(data)
+        if demux:
+            return ExecResult(exit_code, (
+                b''.join(output[STDOUT]), b''.join(output[STDERR])
+            ))
+        return ExecResult(exit_code, b''.join(ordered))
+
+    def _read_until(self, marker):
+        markers = {
+            STDOUT: b'\n' + marker + b':',
+            STDERR: b'\n' + marker + b'\n',
+        }
+        frames = []
+        buffers = {STDOUT: bytearray(), STDERR: bytearray()}
+        # Where to resume searching each buffer, so that every byte is
+        # only scanned once
+        offsets = {STDOUT: 0, STDERR: 0}
+        found = {}
+        ends = {}
+        exit_code = None
+        for stream, data in self._frames:
+            frames.append((stream, data))
+            if stream in ends:
+                continue
+            buffer = buffers[stream]
+            buffer += data
+            if stream not in found:
+                end = buffer.find(markers[stream], offsets[stream])
+                if end < 0:
+                    offsets[stream] = max(
+                        0, len(buffer) - len(markers[stream]) + 1
+                    )
+                    continue
+                found[stream] = end
+                offsets[stream] = end + len(markers[stream])
+            if stream == STDOUT:
+                # The exit code follows the marker, up to the end of line
+                eol = buffer.find(b'\n', offsets[STDOUT])
+                if eol < 0:
+                    offsets[STDOUT] = len(buffer)
+                    continue
+                start = found[STDOUT] + len(markers[STDOUT])
+                exit_code = int(buffer[start:eol])
+            ends[stream] = found[stream]
+            if len(ends) == 2:
+                return frames, ends, exit_code
+        self.close()
+        raise DockerException('The shell of the exec session exited')
+
+    def close(self):
+        """
+        Exit the shell and close the connection.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._stream.write(b'exit\n')
+            self._stream.close_write()
+        except OSError:
+            pass
+        self._stream.close()
+
+
 class ContainerCollection(Collection):
     model = Container
+    columns = {
+        'id': lambda r: r['Id'],
+        'name': lambda r: (r.get('Names') or [''])[0].lstrip('/'),
+        'image': lambda r: r.get('Image'),
+        'status': lambda r: r.get('State'),
+        'labels': lambda r: r.get('Labels') or {},
+        'ports': lambda r: [
+            f"{p['PrivatePort']}/{p['Type']}" for p in r.get('Ports') or []
+        ],
+        'published_ports': lambda r: [
+            p['PublicPort'] for p in r.get('Ports') or [] if 'PublicPort' in p
+        ],
+        'created': lambda r: r.get('Created'),
+    }
 
     def run(self, image, command=None, stdout=True, stderr=False,
             remove=False, **kwargs):
@@ -754,6 +1114,12 @@ class ContainerCollection(Collection):
             security_opt (:py:class:`list`): A list of string values to
                 customize labels for MLS systems, such as SELinux.
             shm_size (str or int): Size of /dev/shm (e.g. ``1G``).
+            sink (:py:class:`~docker.utils.capture.CaptureSink`): Read the
+                logs into this sink, and return it, instead of loading them
+                in memory. Ignored if ``stream`` or ``detach`` is true. If
+                the container fails, only the end of its ``STDERR`` is kept
+                for the :py:class:`~docker.errors.ContainerError`, up to the
+                sink's ``max_memory``.
             stdin_open (bool): Keep ``STDIN`` open even if not attached.
             stdout (bool): Return logs from ``STDOUT`` when ``detach=False``.
                 Default: ``True``.
@@ -851,6 +1217,7 @@ class ContainerCollection(Collection):
             image = image.id
         stream = kwargs.pop('stream', False)
         detach = kwargs.pop('detach', False)
+        sink = kwargs.pop('sink', None)
         platform = kwargs.get('platform', None)
 
         if detach and remove:
@@ -897,7 +1264,14 @@ class ContainerCollection(Collection):
         if exit_status != 0:
             out = None
             if not kwargs.get('auto_remove'):
-                out = container.logs(stdout=False, stderr=True)
+                if sink is not None and not stream:
+                    out = container.logs(
+                        stdout=False, stderr=True, sink=CaptureSink(
+                            sink.max_memory, mode='tail'
+                        )
+                    ).getvalue()
+                else:
+                    out = container.logs(stdout=False, stderr=True)
 
         if remove:
             container.remove()
@@ -908,6 +1282,8 @@ class ContainerCollection(Collection):
 
         if stream or out is None:
             return out
+        if sink is not None:
+            return sink.consume(out)
         return b''.join(out)
 
     def create(self, image, command=None, **kwargs):
@@ -955,7 +1331,7 @@ class ContainerCollection(Collection):
         return self.prepare_model(resp)
 
     def list(self, all=False, before=None, filters=None, limit=-1, since=None,
-             sparse=False, ignore_removed=False):
+             sparse=False, ignore_removed=False, columnar=False):
         """
         List containers. Similar to the ``docker ps`` command.
 
@@ -998,6 +1374,12 @@ class ContainerCollection(Collection):
                 when attempting to inspect containers from the original list.
                 Set to ``True`` if race conditions are likely. Has no effect
                 if ``sparse=True``. Default: ``False``
+            columnar (bool): Return a
+                :py:class:`~docker.models.resource.ResultSet` with the
+                columns ``id``, ``name``, ``image``, ``status``, ``labels``,
+                ``ports``, ``published_ports`` and ``created``. Containers
+                are not inspected, as with ``sparse=True``.
+                Default: ``False``
 
         Returns:
             (list of :py:class:`Container`)
@@ -1009,6 +1391,8 @@ class ContainerCollection(Collection):
         resp = self.client.api.containers(all=all, before=before,
                                           filters=filters, limit=limit,
                                           since=since)
+        if columnar:
+            return self.prepare_result_set(resp)
         if sparse:
             return [self.prepare_model(r) for r in resp]
         else:
@@ -0,0 +1,577 @@
+import asyncio
+import functools
+import threading
+import time
+from collections import namedtuple
+
+import requests
+
+from ..errors import DockerException, ServiceNotConverged
+from ..utils.events import watch_events
+
+# Event types which may tell that the tasks of a service have changed
+EVENT_TYPES = ['service', 'node', 'container']
+SERVICE_LABEL = 'com.docker.swarm.service.id'
+TASK_LABEL = 'com.docker.swarm.task.id'
+# Attributes of a service event which only tells its update state changed
+UPDATE_STATE_ATTRIBUTES = frozenset((
+    'name', 'updatestate.old', 'updatestate.new',
+))
+
+# Container actions which change the state of their task
+TASK_CONTAINER_ACTIONS = frozenset(('create', 'start', 'die'))
+# Task states which do not change anymore
+FINAL_TASK_STATES = frozenset((
+    'complete', 'shutdown', 'failed', 'rejected', 'orphaned', 'remove',
+))
+
+# Update states after which a rollout will not reach the new version
+FAILED_UPDATE_STATES = frozenset((
+    'paused', 'rollback_started', 'rollback_paused', 'rollback_completed',
+))
+
+
+class TaskState(namedtuple(
+        'TaskState', 'id,slot,node,desired_state,state,current,message')):
+    """
+    The state of a task, with the properties ``id``, ``slot``, ``node``,
+    ``desired_state``, ``state``, ``current`` (``False`` if the task runs
+    the previous spec of the service) and ``message`` (the error of the
+    task, or its status message).
+    """
+    __slots__ = ()
+
+    @property
+    def running(self):
+        """
+        ``True`` if the task runs the current spec and is meant to.
+        """
+        return (
+            self.current and self.state == 'running' and
+            self.desired_state == 'running'
+        )
+
+
+class RolloutEvent(namedtuple(
+        'RolloutEvent', 'service,task,old,new,running,desired')):
+    """
+    A step of a rollout, with the properties ``service`` (the ID of the
+    service), ``task`` (the :py:class:`TaskState` which changed, or
+    ``None`` if the update state of the service changed), ``old`` and
+    ``new`` (the previous and new state, ``None`` when a task appears or
+    goes away), ``running`` and ``desired`` (the number of replicas
+    running and expected afterwards).
+    """
+    __slots__ = ()
+
+
+class ServiceState:
+    """
+    The tasks of a service, as last seen by a :py:class:`ServiceTracker`.
+
+    Attributes:
+        id (str): The ID of the service.
+        version (int): The version of the service's spec.
+        update_state (str): The state of the last update of the service,
+            or ``None`` if it has never been updated.
+        replicas (int): The number of replicas the service should run.
+        tasks (dict): The :py:class:`TaskState` of each task, by ID.
+    """
+    def __init__(self, service_id):
+        self.id = service_id
+        self.version = None
+        self.update_state = None
+        self.replicas = None
+        self.tasks = {}
+
+    def __repr__(self):
+        return (
+            f'<{self.__class__.__name__}: {self.id} at version '
+            f'{self.version}, {self.running}/{self.replicas} running>'
+        )
+
+    @property
+    def running(self):
+        """
+        The number of tasks running the current spec of the service.
+        """
+        return sum(task.running for task in self.tasks.values())
+
+    @property
+    def leftover(self):
+        """
+        The number of tasks which still run but are being replaced or
+        shut down.
+        """
+        return sum(
+            task.state == 'running' and not task.running
+            for task in self.tasks.values()
+        )
+
+    def converged(self, replicas=None, version=None):
+        """
+        ``True`` if ``replicas`` tasks run the current spec of the service,
+        no other task is left running, and the spec is at least at
+        ``version``.
+
+        Args:
+            replicas (int): Default: the number of replicas of the service.
+            version (int): Default: any version.
+        """
+        if version is not None and (
+                self.version is None or self.version < version):
+            return False
+        if replicas is None:
+            replicas = self.replicas
+        return self.running == replicas and not self.leftover
+
+    def update(self, attrs, tasks):
+        """
+        Replace the table with the result of inspecting the service and
+        listing its tasks.
+
+        Returns:
+            (list): The :py:class:`RolloutEvent` of each change.
+        """
+        spec = attrs['Spec']
+        template = spec.get('TaskTemplate')
+        previous = attrs.get('PreviousSpec', {}).get('TaskTemplate')
+        self.version = attrs.get('Version', {}).get('Index')
+        mode = spec.get('Mode', {})
+        if 'Replicated' in mode:
+            self.replicas = mode['Replicated'].get('Replicas', 1)
+
+        table = {}
+        for task in tasks:
+            task_spec = task.get('Spec')
+            status = task.get('Status', {})
+            table[task['ID']] = TaskState(
+                task['ID'], task.get('Slot'), task.get('NodeID'),
+                task.get('DesiredState'), status.get('State'),
+                # Tasks are only told apart from the ones they replace
+                # when the service still knows its previous spec
+                previous is None or task_spec != previous or
+                task_spec == template,
+                status.get('Err') or status.get('Message'),
+            )
+        if 'Replicated' not in mode:
+            self.replicas = sum(
+                task.current and task.desired_state == 'running'
+                for task in table.values()
+            )
+
+        old_tasks, self.tasks = self.tasks, table
+        running, desired = self.running, self.replicas
+        events = []
+        update_state = attrs.get('UpdateStatus', {}).get('State')
+        if update_state != self.update_state:
+            events.append(RolloutEvent(
+                self.id, None, self.update_state, update_state, running,
+                desired
+            ))
+            self.update_state = update_state
+        for task_id, task in table.items():
+            old = old_tasks.get(task_id)
+            if old is None or old.state != task.state:
+                events.append(RolloutEvent(
+                    self.id, task, old and old.state, task.state, running,
+                    desired
+                ))
+        for task_id, old in old_tasks.items():
+            if task_id not in table:
+                events.append(RolloutEvent(
+                    self.id, old, old.state, None, running, desired
+                ))
+        return events
+
+    def _set_task_state(self, task_id, state):
+        old = self.tasks[task_id]
+        if old.state == state:
+            return None
+        task = old._replace(state=state)
+        # Replaced rather than modified, since it may be iterated over
+        self.tasks = {**self.tasks, task_id: task}
+        return RolloutEvent(
+            self.id, task, old.state, state, self.running, self.replicas
+        )
+
+    def _set_update_state(self, update_state):
+        old, self.update_state = self.update_state, update_state
+        if old == update_state:
+            return None
+        return RolloutEvent(
+            self.id, None, old, update_state, self.running, self.replicas
+        )
+
+
+class ServiceTracker:
+    """
+    Tells when swarm services have converged, without polling the
+    managers in a tight loop.
+
+    The tasks of a service are listed once, then kept up to date from the
+    events of the daemon: the containers of the service on the node the
+    client is connected to starting and dying, and the update state of
+    the service changing, are applied to the known tasks. The tasks are
+    only listed again when an event cannot be applied that way, such as
+    a change of the service's spec, a new task or a node event, and when
+    the event stream breaks. The daemon does not report task changes on
+    other nodes, so the tasks of a service running on other nodes are
+    also listed every ``max_interval`` seconds. If the events cannot be
+    watched, the tasks are polled with an exponential backoff from
+    ``min_interval`` to ``max_interval``.
+
+    Args:
+        client (:py:class:`~docker.client.DockerClient`): A client
+            connected to a manager of the swarm.
+        min_interval (float): Shortest time between two listings of the
+            tasks of a service, in seconds. Default: 0.5
+        max_interval (float): Longest time between two listings of the
+            tasks of a service, in seconds. Default: 10
+
+    Example:
+
+        >>> tracker = ServiceTracker(client)
+        >>> tracker.watch()
+        >>> service.update(image='nginx:1.25')
+        >>> tracker.wait(service, timeout=300, progress=print)
+        <ServiceState: 9mnpnzenvg8p8tdbtq4wvbkcz at version 23, 3/3 running>
+        >>> tracker.close()
+    """
+    def __init__(self, client, min_interval=0.5, max_interval=10):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._states = {}
+        self._wakeups = {}
+        self._events = None
+        self._node_id = None
+        # Services to list again, and the ones being listed
+        self._stale = set()
+        self._listing = set()
+        # Changes applied from events, until a wait takes them
+        self._changes = {}
+
+    def __enter__(self):
+        self.watch()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def watching(self):
+        """
+        ``True`` while the events of the daemon are being watched.
+        """
+        return self._events is not None
+
+    def watch(self):
+        """
+        Start watching the events of the daemon in a background thread. If
+        the events cannot be watched, the tracker falls back to polling.
+        """
+        self.close()
+        try:
+            events = self.client.api.events(
+                decode=True, filters={'type': EVENT_TYPES}
+            )
+            # Events only tell about the containers of this node
+            node_id = self.client.api.info()['Swarm']['NodeID']
+        except (DockerException, requests.exceptions.RequestException):
+            return
+        with self._lock:
+            self._events = events
+            self._node_id = node_id
+            # Changes may have been missed while not watching
+            self._stale.update(self._states)
+        watch_events(events, self.handle_event, self._stopped_watching,
+                     'Service tracker')
+
+    def close(self):
+        """
+        Stop watching events, if :py:meth:`watch` was called.
+        """
+        with self._lock:
+            events, self._events = self._events, None
+        if events is not None:
+            events.close()
+        self._wake_all()
+
+    def state(self, service):
+        """
+        Return the last known :py:class:`ServiceState` of a service, or
+        ``None`` if it has not been listed yet.
+
+        Args:
+            service (str or :py:class:`~docker.models.services.Service`):
+                The service, or its ID.
+        """
+        with self._lock:
+            return self._states.get(_service_id(service))
+
+    def refresh(self, service):
+        """
+        Inspect a service and list its tasks now.
+
+        Args:
+            service (str or :py:class:`~docker.models.services.Service`):
+                The service, or its ID.
+
+        Returns:
+            (list): The :py:class:`RolloutEvent` of each change since the
+            service was last listed.
+        """
+        return self._refresh(_service_id(service))[1]
+
+    def wait(self, service, replicas=None, version=None, timeout=None,
+             progress=None):
+        """
+        Wait until ``replicas`` tasks of a service run its current spec and
+        no other task is left running.
+
+        Args:
+            service (str or :py:class:`~docker.models.services.Service`):
+                The service, or its ID.
+            replicas (int): Default: the number of replicas of the service,
+                or the number of nodes it is scheduled on for a global
+                service.
+            version (int): Also wait until the spec of the service is at
+                least at this version. Default: any version.
+            timeout (float): Time to wait, in seconds. Default: no timeout.
+            progress (callable): Called with each :py:class:`RolloutEvent`.
+
+        Returns:
+            (:py:class:`ServiceState`): The state of the service.
+
+        Raises:
+            :py:class:`docker.errors.ServiceNotConverged`
+                If the timeout expires, or if the update of the service is
+                paused or rolled back while waiting.
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return self._wait(service, replicas, version, timeout, progress)
+
+    def _wait(self, service, replicas, version, timeout, progress,
+              cancelled=None):
+        service_id = _service_id(service)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = self.min_interval
+        wakeup = self._wakeup(service_id)
+        listed_at = None
+        while True:
+            wakeup.clear()
+            if cancelled is not None and cancelled.is_set():
+                return None
+            if listed_at is None or self._must_list(service_id, listed_at):
+                listed_at = time.monotonic()
+                state, events = self._refresh(service_id)
+            else:
+                state, events = self._applied_changes(service_id)
+            if state.id != service_id:
+                # The service was given by name
+                service_id = state.id
+                wakeup = self._wakeup(service_id)
+            for event in events:
+                if progress is not None:
+                    progress(event)
+                if (event.task is None and event.old is not None and
+                        event.new in FAILED_UPDATE_STATES):
+                    raise ServiceNotConverged(
+                        f'Update of service {state.id} is {event.new}', state
+                    )
+            if state.converged(replicas, version):
+                return state
+
+            if self.watching:
+                delay = None
+                if self._remote_tasks(state):
+                    delay = max(
+                        listed_at + self.max_interval - time.monotonic(), 0
+                    )
+            elif events:
+                delay = interval = self.min_interval
+            else:
+                interval = min(interval * 2, self.max_interval)
+                delay = interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ServiceNotConverged(
+                        f'Service {state.id} did not converge within '
+                        f'{timeout} seconds: {state.running}/'
+                        f'{replicas or state.replicas} running, '
+                        f'{state.leftover} left to stop', state
+                    )
+                delay = remaining if delay is None else min(delay, remaining)
+            wakeup.wait(delay)
+            # Events usually come in bursts
+            time.sleep(self.min_interval if wakeup.is_set() else 0)
+
+    async def wait_async(self, service, replicas=None, version=None,
+                         timeout=None, progress=None):
+        """
+        Like :py:meth:`wait`, but awaitable. The waiting is done in the
+        default executor of the event loop, and stops when the coroutine is
+        cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        future = loop.run_in_executor(None, functools.partial(
+            self._wait, service, replicas, version, timeout, progress,
+            cancelled
+        ))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            cancelled.set()
+            # Wake the executor thread up so that it sees the cancellation
+            self._wake_all()
+            raise
+
+    def handle_event(self, event):
+        """
+        Apply an event of the daemon to the services it concerns, and wake
+        up their waits.
+        """
+        kind = event.get('Type')
+        actor = event.get('Actor') or {}
+        attributes = actor.get('Attributes') or {}
+        if kind == 'node':
+            with self._lock:
+                self._stale.update(self._states)
+            self._wake_all()
+            return
+        if kind == 'service':
+            service_id = actor.get('ID')
+        elif kind == 'container':
+            service_id = attributes.get(SERVICE_LABEL)
+        else:
+            return
+        with self._lock:
+            state = self._states.get(service_id)
+            if state is None:
+                return
+            change = None
+            if service_id in self._listing:
+                # The listing may or may not include the change
+                self._stale.add(service_id)
+            elif kind == 'service':
+                if (event.get('Action') == 'update' and
+                        'updatestate.new' in attributes and
+                        set(attributes) <= UPDATE_STATE_ATTRIBUTES):
+                    change = state._set_update_state(
+                        attributes['updatestate.new']
+                    )
+                else:
+                    self._stale.add(service_id)
+            else:
+                change, applied = _apply_container_event(
+                    state, event.get('Action'), attributes
+                )
+                if not applied:
+                    self._stale.add(service_id)
+            if change is not None and service_id in self._wakeups:
+                self._changes.setdefault(service_id, []).append(change)
+        self._wake(service_id)
+
+    def _refresh(self, service_id):
+        with self._lock:
+            self._listing.add(service_id)
+            self._stale.discard(service_id)
+        try:
+            attrs = self.client.api.inspect_service(service_id)
+            tasks = self.client.api.tasks(filters={'service': attrs['ID']})
+        finally:
+            with self._lock:
+                self._listing.discard(service_id)
+        service_id = attrs['ID']
+        with self._lock:
+            state = self._states.get(service_id)
+            if state is None:
+                state = self._states[service_id] = ServiceState(service_id)
+            # The listing covers the changes applied so far
+            self._changes.pop(service_id, None)
+            return state, state.update(attrs, tasks)
+
+    def _applied_changes(self, service_id):
+        with self._lock:
+            return (
+                self._states[service_id],
+                self._changes.pop(service_id, []),
+            )
+
+    def _must_list(self, service_id, listed_at):
+        if not self.watching:
+            return True
+        with self._lock:
+            if service_id in self._stale:
+                return True
+            state = self._states[service_id]
+        return (
+            self._remote_tasks(state) and
+            time.monotonic() - listed_at >= self.max_interval
+        )
+
+    def _remote_tasks(self, state):
+        # Tasks which are not running anymore do not change
+        return any(
+            task.node != self._node_id for task in state.tasks.values()
+            if task.state not in FINAL_TASK_STATES
+        )
+
+    def _wakeup(self, service_id):
+        with self._lock:
+            return self._wakeups.setdefault(service_id, threading.Event())
+
+    def _wake(self, service_id):
+        with self._lock:
+            wakeup = self._wakeups.get(service_id)
+        if wakeup is not None:
+            wakeup.set()
+
+    def _wake_all(self):
+        with self._lock:
+            wakeups = list(self._wakeups.values())
+        for wakeup in wakeups:
+            wakeup.set()
+
+    def _stopped_watching(self, events):
+        with self._lock:
+            if self._events is events:
+                self._events = None
+            # Events may have been missed
+            self._stale.update(self._states)
+        # Waits go back to polling
+        self._wake_all()
+
+
+def _apply_container_event(state, action, attributes):
+    """
+    Apply the event of a task's container to the state of its service.
+
+    Returns:
+        (tuple): The :py:class:`RolloutEvent`, or ``None`` if nothing
+        changed, and ``False`` if the tasks must be listed again instead.
+    """
+    task = state.tasks.get(attributes.get(TASK_LABEL))
+    if task is None:
+        # A new task
+        return None, action not in TASK_CONTAINER_ACTIONS
+    if action == 'start':
+        return state._set_task_state(task.id, 'running'), True
+    if action == 'die':
+        if task.desired_state != 'running':
+            new_state = 'shutdown'
+        elif attributes.get('exitCode') == '0':
+            new_state = 'complete'
+        else:
+            new_state = 'failed'
+        return state._set_task_state(task.id, new_state), True
+    return None, True
+
+
+def _service_id(service):
+    return getattr(service, 'id', service)
@@ -1,19 +1,33 @@
 import itertools
 import re
+import threading
 import warnings
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 from ..api import APIClient
-from ..constants import DEFAULT_DATA_CHUNK_SIZE
-from ..errors import BuildError, ImageLoadError, InvalidArgument
+from ..constants import DEFAULT_BUILD_LOG_LIMIT, DEFAULT_DATA_CHUNK_SIZE
+from ..errors import (
+    BuildError,
+    ImageLoadError,
+    ImageNotFound,
+    InvalidArgument,
+)
 from ..utils import parse_repository_tag
 from ..utils.json_stream import json_stream
+from .build_events import BuildEventParser
 from .resource import Collection, Model
 
+# The first status the server sends about each layer of a pull
+LAYER_STATUSES = frozenset(('Pulling fs layer', 'Waiting', 'Already exists'))
+
 
 class Image(Model):
     """
     An image on the server.
     """
+    __slots__ = ()
+
     def __repr__(self):
         tag_str = "', '".join(self.tags)
         return f"<{self.__class__.__name__}: '{tag_str}'>"
@@ -23,8 +37,11 @@ class Image(Model):
         """
         The labels of an image as dictionary.
         """
-        result = self.attrs['Config'].get('Labels')
-        return result or {}
+        return self._field('labels', self._labels)
+
+    @staticmethod
+    def _labels(attrs):
+        return attrs['Config'].get('Labels') or {}
 
     @property
     def short_id(self):
@@ -41,7 +58,11 @@ class Image(Model):
         """
         The image's tags.
         """
-        tags = self.attrs.get('RepoTags')
+        return self._field('tags', self._tags)
+
+    @staticmethod
+    def _tags(attrs):
+        tags = attrs.get('RepoTags')
         if tags is None:
             tags = []
         return [tag for tag in tags if tag != '<none>:<none>']
@@ -107,6 +128,41 @@ class Image(Model):
             >>>   f.write(chunk)
             >>> f.close()
         """
+        return self.client.api.get_image(self._save_name(named), chunk_size)
+
+    def save_to(self, dest, named=False, **kwargs):
+        """
+        Get a tarball of an image and save it straight to a file. Similar to
+        the ``docker save -o`` command.
+
+        Args:
+            dest (str, int or file): The path of the file to write, an open
+                file descriptor, or a writable file-like object
+            named (str or bool): See :py:meth:`save`.
+            chunk_size (int): The size of the read buffer. Default: 2 MB
+            fsync (bool or int): ``True`` to flush the file to disk once the
+                transfer is complete, or a number of bytes after which the
+                file is flushed to disk periodically. Default: ``False``
+
+        Returns:
+            (:py:class:`~docker.utils.archive.TransferResult`): The number of
+            bytes written and the time it took.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> image = cli.images.get("busybox:latest")
+            >>> image.save_to('/tmp/busybox-latest.tar', named=True)
+            TransferResult(bytes_written=4480512, seconds=0.0127)
+        """
+        return self.client.api.get_image_to(
+            self._save_name(named), dest, **kwargs
+        )
+
+    def _save_name(self, named):
         img = self.id
         if named:
             img = self.tags[0] if self.tags else img
@@ -116,8 +172,7 @@ class Image(Model):
                         f"{named} is not a valid tag for this image"
                     )
                 img = named
-
-        return self.client.api.get_image(img, chunk_size)
+        return img
 
     def tag(self, repository, tag=None, **kwargs):
         """
@@ -216,6 +271,15 @@ class RegistryData(Model):
 
 class ImageCollection(Collection):
     model = Image
+    columns = {
+        'id': lambda r: r['Id'],
+        'tags': lambda r: [
+            t for t in r.get('RepoTags') or [] if t != '<none>:<none>'
+        ],
+        'labels': lambda r: r.get('Labels') or {},
+        'size': lambda r: r.get('Size'),
+        'created': lambda r: r.get('Created'),
+    }
 
     def build(self, **kwargs):
         """
@@ -279,6 +343,16 @@ class ImageCollection(Collection):
                 configuration file (``~/.docker/config.json`` by default)
                 contains a proxy configuration, the corresponding environment
                 variables will be set in the container being built.
+            context_workers (int): Stat and read the files of the context
+                ahead of archiving them, on this many threads.
+            max_context_size (int or str): Fail the build before sending
+                anything if the context of ``path`` is larger than this. See
+                :py:func:`~docker.utils.build_context.analyze_build_context`.
+            parser (:py:class:`~docker.models.build_events.BuildEventParser`):
+                Parse the output of the build with this parser, to follow
+                its events or read its step timings afterwards.
+            log_limit (int): Only keep the last ``log_limit`` chunks of the
+                build logs, or all of them if ``None``. Default: 10000
 
         Returns:
             (tuple): The first item is the :py:class:`Image` object for the
@@ -288,31 +362,31 @@ class ImageCollection(Collection):
         Raises:
             :py:class:`docker.errors.BuildError`
                 If there is an error during the build.
+            :py:class:`docker.errors.BuildContextTooLarge`
+                If the context is larger than ``max_context_size``.
             :py:class:`docker.errors.APIError`
                 If the server returns any other error.
             ``TypeError``
                 If neither ``path`` nor ``fileobj`` is specified.
         """
+        parser = kwargs.pop('parser', None) or BuildEventParser()
+        log_limit = kwargs.pop('log_limit', DEFAULT_BUILD_LOG_LIMIT)
         resp = self.client.api.build(**kwargs)
         if isinstance(resp, str):
             return self.get(resp)
-        last_event = None
-        image_id = None
-        result_stream, internal_stream = itertools.tee(json_stream(resp))
-        for chunk in internal_stream:
-            if 'error' in chunk:
-                raise BuildError(chunk['error'], result_stream)
-            if 'stream' in chunk:
-                match = re.search(
-                    r'(^Successfully built |sha256:)([0-9a-f]+)$',
-                    chunk['stream']
+        log = deque(maxlen=log_limit)
+        chunks = json_stream(resp)
+        for chunk in chunks:
+            log.append(chunk)
+            parser.feed(chunk)
+            if parser.error is not None:
+                raise BuildError(
+                    parser.error, itertools.chain(log, chunks)
                 )
-                if match:
-                    image_id = match.group(2)
-            last_event = chunk
-        if image_id:
-            return (self.get(image_id), result_stream)
-        raise BuildError(last_event or 'Unknown', result_stream)
+        parser.close()
+        if parser.image_id:
+            return (self.get(parser.image_id), iter(log))
+        raise BuildError(log[-1] if log else 'Unknown', iter(log))
 
     def get(self, name):
         """
@@ -356,7 +430,7 @@ class ImageCollection(Collection):
             collection=self,
         )
 
-    def list(self, name=None, all=False, filters=None):
+    def list(self, name=None, all=False, filters=None, columnar=False):
         """
         List images on the server.
 
@@ -369,6 +443,11 @@ class ImageCollection(Collection):
                 - ``dangling`` (bool)
                 - `label` (str|list): format either ``"key"``, ``"key=value"``
                     or a list of such.
+            columnar (bool): Return a
+                :py:class:`~docker.models.resource.ResultSet` with the
+                columns ``id``, ``tags``, ``labels``, ``size`` and
+                ``created``, without inspecting each image.
+                Default: ``False``
 
         Returns:
             (list of :py:class:`Image`): The images.
@@ -378,6 +457,8 @@ class ImageCollection(Collection):
                 If the server returns an error.
         """
         resp = self.client.api.images(name=name, all=all, filters=filters)
+        if columnar:
+            return self.prepare_result_set(resp)
         return [self.get(r["Id"]) for r in resp]
 
     def load(self, data):
@@ -397,6 +478,39 @@ class ImageCollection(Collection):
                 If the server returns an error.
         """
         resp = self.client.api.load_image(data)
+        return self._load_result(resp)
+
+    def load_from_file(self, path, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
+                       progress=None):
+        """
+        Load images from an archive file previously saved using
+        :py:meth:`~docker.models.images.Image.save`,
+        :py:meth:`save_many` (or ``docker save``). Similar to
+        ``docker load -i``.
+
+        The file is uploaded in chunks while it is being read, so memory
+        usage does not depend on the size of the archive.
+
+        Args:
+            path (str): Path of the archive file.
+            chunk_size (int): The size of each chunk of the upload.
+                Default: 2 MB
+            progress (callable): Called with a :py:class:`LoadProgress` for
+                every progress update sent by the server.
+
+        Returns:
+            (list of :py:class:`Image`): The images.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        resp = self.client.api.load_image(
+            _read_chunks(path, chunk_size), quiet=False
+        )
+        return self._load_result(resp, progress)
+
+    def _load_result(self, resp, progress=None):
         images = []
         for chunk in resp:
             if 'stream' in chunk:
@@ -409,6 +523,8 @@ class ImageCollection(Collection):
                     images.append(image_id)
             if 'error' in chunk:
                 raise ImageLoadError(chunk['error'])
+            if progress and 'status' in chunk:
+                progress(LoadProgress.from_chunk(chunk))
 
         return [self.get(i) for i in images]
 
@@ -474,6 +590,89 @@ class ImageCollection(Collection):
             return self.get(f'{repository}{sep}{tag}')
         return self.list(repository)
 
+    def pull_many(self, references, max_workers=4, progress=None, **kwargs):
+        """
+        Pull several images concurrently and return them, in the same order
+        as ``references``.
+
+        Duplicate references are only pulled once, and references pinned
+        to a digest which is already present locally are not pulled at all.
+        See :py:class:`PullScheduler` for more control.
+
+        Args:
+            references (list): The images to pull, as ``repository[:tag]``
+                or ``repository@digest`` strings. A missing tag defaults to
+                ``latest``.
+            max_workers (int): Maximum number of concurrent pulls.
+                Default: 4
+            progress (callable): Called with the :py:class:`PullProgress` of
+                all the pulls every time it changes.
+            auth_config (dict): Override the credentials that are found in the
+                config for these requests.
+            platform (str): Platform in the format ``os[/arch[/variant]]``
+
+        Returns:
+            (list of :py:class:`Image`): The pulled images.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> images = client.images.pull_many(
+            ...     ['busybox', 'alpine:3.18', 'redis:7'], max_workers=8
+            ... )
+        """
+        with PullScheduler(self, max_workers, progress) as scheduler:
+            futures = [
+                scheduler.submit(reference, **kwargs)
+                for reference in references
+            ]
+            return [future.result() for future in futures]
+
+    def save_many(self, images, chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Get a single tarball containing several images. Similar to the
+        ``docker save`` command with several image arguments.
+
+        The images are exported in one request, so the layers they share are
+        only transferred and stored once.
+
+        Args:
+            images (list): The images to save, as :py:class:`Image` objects
+                or image names/IDs. Names are kept in the archive, so tagged
+                images are restored with their tags by :py:meth:`load`. All
+                the tags of :py:class:`Image` objects are kept.
+            chunk_size (int): The generator will return up to that much data
+                per iteration, but may return less. If ``None``, data will be
+                streamed as it is received. Default: 2 MB
+
+        Returns:
+            (generator): A stream of raw archive data.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> data = client.images.save_many(['busybox', 'alpine'])
+            >>> with open('/tmp/images.tar', 'wb') as f:
+            ...     for chunk in data:
+            ...         f.write(chunk)
+        """
+        names = []
+        for image in images:
+            if isinstance(image, Image):
+                # Every tag of the image is kept in the archive
+                names.extend(image.tags or [image.id])
+            else:
+                names.append(image)
+        return self.client.api.get_images(
+            list(dict.fromkeys(names)), chunk_size
+        )
+
     def push(self, repository, tag=None, **kwargs):
         return self.client.api.push(repository, tag=tag, **kwargs)
     push.__doc__ = APIClient.push.__doc__
@@ -495,6 +694,197 @@ class ImageCollection(Collection):
     prune_builds.__doc__ = APIClient.prune_builds.__doc__
 
 
+class LoadProgress(namedtuple('LoadProgress', 'id,status,current,total')):
+    """
+    A progress update sent by the server while loading images, with the
+    properties ``id`` (the layer being loaded, if any), ``status``,
+    ``current`` and ``total`` (both in bytes, ``None`` when unknown).
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_chunk(cls, chunk):
+        detail = chunk.get('progressDetail') or {}
+        return cls(
+            chunk.get('id'), chunk['status'],
+            detail.get('current'), detail.get('total')
+        )
+
+
+class PullScheduler:
+    """
+    Runs image pulls concurrently on a pool of threads.
+
+    Concurrent requests for the same reference share a single pull, and
+    references pinned to a digest which is already present locally are
+    resolved without contacting the registry. The byte progress of every
+    layer being pulled is aggregated in a single :py:class:`PullProgress`.
+
+    Use it as a context manager, or call :py:meth:`shutdown` when done.
+
+    Args:
+        images (:py:class:`ImageCollection`): The collection to pull with,
+            usually ``client.images``.
+        max_workers (int): Maximum number of concurrent pulls. Default: 4
+        progress (callable): Called with :py:attr:`progress` every time it
+            changes. It may be called from several threads.
+
+    Example:
+
+        >>> with PullScheduler(client.images, max_workers=8) as scheduler:
+        ...     web = scheduler.submit('nginx:1.25')
+        ...     db = scheduler.submit('postgres:16')
+        ...     images = [web.result(), db.result()]
+    """
+    def __init__(self, images, max_workers=4, progress=None):
+        self.images = images
+        self.progress = PullProgress()
+        self._callback = progress
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def submit(self, repository, tag=None, **kwargs):
+        """
+        Schedule a pull. If the same reference is already being pulled, no
+        new pull is started.
+
+        Args:
+            repository (str): The repository to pull, optionally with a tag
+                or digest.
+            tag (str): The tag or digest to pull. Overrides the one in
+                ``repository``. Default: ``latest``
+            auth_config (dict): Override the credentials that are found in the
+                config for this request.
+            platform (str): Platform in the format ``os[/arch[/variant]]``
+
+        Returns:
+            (:py:class:`concurrent.futures.Future`): A future resolving to
+                the pulled :py:class:`Image`.
+        """
+        repository, image_tag = parse_repository_tag(repository)
+        tag = tag or image_tag or 'latest'
+        key = (repository, tag, kwargs.get('platform'))
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(
+                self._pull, repository, tag, kwargs
+            )
+            self._in_flight[key] = future
+        future.add_done_callback(lambda f: self._done(key))
+        return future
+
+    def shutdown(self, wait=True):
+        """
+        Stop accepting pulls and, if ``wait`` is ``True``, wait for the
+        pending ones to finish.
+        """
+        self._executor.shutdown(wait=wait)
+
+    def _done(self, key):
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def _pull(self, repository, tag, kwargs):
+        sep = '@' if tag.startswith('sha256:') else ':'
+        name = f'{repository}{sep}{tag}'
+        if sep == '@':
+            # Content behind a digest never changes, so an image which is
+            # already present is exactly the one the registry would send.
+            try:
+                return self.images.get(name)
+            except ImageNotFound:
+                pass
+
+        pull_log = self.images.client.api.pull(
+            repository, tag=tag, stream=True, decode=True, **kwargs
+        )
+        for chunk in pull_log:
+            if self.progress.update(chunk) and self._callback:
+                self._callback(self.progress)
+        return self.images.get(name)
+
+
+class PullProgress:
+    """
+    The aggregated progress of concurrent pulls.
+
+    Layers shared by several images are downloaded once by the server, so
+    they are also counted once here. Other updates with an ``id``, such as
+    the ones about the tag being pulled, are not counted.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._layers = {}
+
+    def update(self, chunk):
+        """
+        Record a progress update sent by the server during a pull.
+
+        Returns:
+            (bool): ``True`` if the chunk was a layer progress update.
+        """
+        layer = chunk.get('id')
+        status = chunk.get('status')
+        if not layer or status is None:
+            return False
+        detail = chunk.get('progressDetail') or {}
+        with self._lock:
+            if layer not in self._layers:
+                if status not in LAYER_STATUSES:
+                    return False
+                self._layers[layer] = (0, 0, status)
+            current, total, _ = self._layers[layer]
+            if status == 'Downloading':
+                current = detail.get('current', current)
+                total = detail.get('total', total)
+            elif status in ('Download complete', 'Already exists',
+                            'Pull complete'):
+                current = total
+            self._layers[layer] = (current, total, status)
+        return True
+
+    @property
+    def layers(self):
+        """
+        A dictionary mapping each layer ID to a ``(current, total, status)``
+        tuple, with the sizes in bytes.
+        """
+        with self._lock:
+            return dict(self._layers)
+
+    @property
+    def current(self):
+        """
+        The number of bytes downloaded so far.
+        """
+        return sum(current for current, _, _ in self.layers.values())
+
+    @property
+    def total(self):
+        """
+        The number of bytes to download, as far as it is known yet.
+        """
+        return sum(total for _, total, _ in self.layers.values())
+
+
+def _read_chunks(path, chunk_size):
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(chunk_size or DEFAULT_DATA_CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+
+
 def normalize_platform(platform, engine_info):
     if platform is None:
         platform = {}
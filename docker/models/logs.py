@@ -0,0 +1,688 @@
+import calendar
+import collections
+import functools
+import hashlib
+import heapq
+import json
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from ..errors import NotFound
+from ..utils import datetime_to_timestamp
+
+# Sent by the reader thread when the logs end
+_END = object()
+
+RFC3339_RE = re.compile(
+    rb'^(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(?:\.(\d{1,9}))?'
+    rb'(Z|[+-]\d\d:\d\d)$'
+)
+
+
+class LogRecord(namedtuple('LogRecord', 'container,timestamp,stream,message')):
+    """
+    A line of a container's logs, with the properties ``container`` (the
+    container ID), ``timestamp`` (nanoseconds since the epoch), ``stream``
+    (``stdout`` or ``stderr``) and ``message`` (the line as bytes, without
+    its newline).
+    """
+    __slots__ = ()
+
+
+class ServiceLogRecord(namedtuple(
+        'ServiceLogRecord',
+        'service,task,node,replica,timestamp,stream,message')):
+    """
+    A line of a service's logs, with the properties ``service``, ``task``
+    and ``node`` (the IDs of the service, of the task which logged it and of
+    the node the task runs on), ``replica`` (the slot of the task, or
+    ``None`` for a global service), ``timestamp`` (nanoseconds since the
+    epoch), ``stream`` (``stdout`` or ``stderr``) and ``message`` (the line
+    as bytes, without its newline).
+    """
+    __slots__ = ()
+
+
+class Checkpoint(namedtuple('Checkpoint', 'container,timestamp,boundary')):
+    """
+    How far the logs of a container have been processed, with the
+    properties ``container`` (the container ID), ``timestamp`` (the
+    timestamp of the last line, in nanoseconds since the epoch) and
+    ``boundary`` (digests of the lines processed with this timestamp,
+    which are skipped if they are read again).
+    """
+    __slots__ = ()
+
+
+class MemoryCheckpointStore:
+    """
+    Keeps checkpoints in memory, for a follower which only needs to resume
+    after losing its connection.
+    """
+    def __init__(self):
+        self._checkpoints = {}
+
+    def load(self, container):
+        """
+        Return the checkpoint of a container, or ``None``.
+        """
+        return self._checkpoints.get(container)
+
+    def save(self, checkpoint):
+        """
+        Store a checkpoint, replacing the previous one of the container.
+        """
+        self._checkpoints[checkpoint.container] = checkpoint
+
+
+class FileCheckpointStore(MemoryCheckpointStore):
+    """
+    Keeps checkpoints in a JSON file, which is replaced atomically every
+    time a checkpoint is saved, so that a follower can resume after the
+    process restarts.
+
+    Args:
+        path (str): Path of the file.
+    """
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        for container, value in data.items():
+            self._checkpoints[container] = Checkpoint(
+                container, value['timestamp'], tuple(value['boundary'])
+            )
+
+    def save(self, checkpoint):
+        with self._lock:
+            super().save(checkpoint)
+            data = {
+                c.container: {'timestamp': c.timestamp,
+                              'boundary': list(c.boundary)}
+                for c in self._checkpoints.values()
+            }
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix='.checkpoint')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+
+class LogFollower:
+    """
+    Follows the logs of a container, yielding them as
+    :py:class:`LogRecord` objects, and resumes where it stopped after the
+    connection drops or the process restarts.
+
+    What has been processed is saved as a :py:class:`Checkpoint` in
+    ``store`` after each batch. When the follower starts, or reconnects, it
+    asks for the logs since the last timestamp, and skips the lines which
+    were already seen at that timestamp.
+
+    Records are read in a background thread and grouped in batches of up
+    to ``batch_size`` records. A batch is also yielded when its first
+    record has waited for ``flush_interval`` seconds.
+
+    Args:
+        container (:py:class:`~docker.models.containers.Container`): The
+            container.
+        store: Where checkpoints are loaded from and saved to, such as a
+            :py:class:`FileCheckpointStore`. Default: a
+            :py:class:`MemoryCheckpointStore`.
+        stdout (bool): Follow ``STDOUT``. Default: ``True``
+        stderr (bool): Follow ``STDERR``. Default: ``True``
+        batch_size (int): Maximum number of records in a batch. Default: 100
+        flush_interval (float): Maximum time a record waits for its batch
+            to be yielded, in seconds. Default: 1
+        retry_interval (float): Time to wait before reconnecting, in
+            seconds. Default: 1
+
+    Example:
+
+        >>> store = FileCheckpointStore('/var/lib/shipper/checkpoints.json')
+        >>> follower = container.follow_logs(store=store, batch_size=500)
+        >>> for batch in follower.batches():
+        ...     ship(batch)
+    """
+    def __init__(self, container, store=None, stdout=True, stderr=True,
+                 batch_size=100, flush_interval=1, retry_interval=1):
+        self.container = container
+        self.store = store if store is not None else MemoryCheckpointStore()
+        self.stdout = stdout
+        self.stderr = stderr
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self._stream = None
+        self._reader = None
+        self._stopped = threading.Event()
+
+        checkpoint = self.store.load(container.id)
+        if checkpoint is None:
+            checkpoint = Checkpoint(container.id, 0, ())
+        self._checkpoint = checkpoint
+        self._resume()
+
+    def _resume(self):
+        # What the reader thread has seen, to resume after reconnecting.
+        # It reads ahead of what is yielded, so it starts over from the
+        # last checkpoint.
+        checkpoint = self._checkpoint
+        self._initial = checkpoint
+        self._last_timestamp = checkpoint.timestamp
+        self._last_lines = []
+        self._skip = collections.Counter(checkpoint.boundary)
+
+    @property
+    def checkpoint(self):
+        """
+        The :py:class:`Checkpoint` of the last batch which was processed.
+        """
+        return self._checkpoint
+
+    def records(self):
+        """
+        Yield the records one by one. A checkpoint is saved after each batch
+        of ``batch_size`` records has been processed.
+        """
+        for batch in self.batches():
+            yield from batch
+
+    def batches(self):
+        """
+        Yield lists of records until the container stops or :py:meth:`stop`
+        is called. A checkpoint is saved once the caller asks for the next
+        batch. Calling it again resumes after the last checkpoint.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        records = queue.Queue(self.batch_size * 4)
+        if self._reader is not None:
+            # The reader of a previous call was stopped
+            self._reader.join()
+        self._stopped.clear()
+        self._resume()
+        self._reader = threading.Thread(
+            target=self._read, args=(records,), daemon=True
+        )
+        self._reader.start()
+        batch = []
+        deadline = None
+        try:
+            while True:
+                # Wake up regularly to notice calls to stop()
+                timeout = 0.5
+                if batch:
+                    timeout = min(timeout, deadline - time.monotonic())
+                try:
+                    item = records.get(timeout=max(0, timeout))
+                except queue.Empty:
+                    if self._stopped.is_set():
+                        return
+                    item = None
+                if isinstance(item, LogRecord):
+                    if not batch:
+                        deadline = time.monotonic() + self.flush_interval
+                    batch.append(item)
+                    if (len(batch) < self.batch_size and
+                            time.monotonic() < deadline):
+                        continue
+                elif item is not None:
+                    # The reader is done, and may have failed
+                    if batch:
+                        yield batch
+                        self._commit(batch)
+                    if item is not _END:
+                        raise item
+                    return
+                if batch and (len(batch) >= self.batch_size or
+                              time.monotonic() >= deadline):
+                    yield batch
+                    self._commit(batch)
+                    batch = []
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        Stop following the logs. Records which were read but not yielded
+        yet are discarded.
+        """
+        self._stopped.set()
+        stream = self._stream
+        if stream is not None:
+            stream.close()
+
+    def _commit(self, batch):
+        timestamp = self._checkpoint.timestamp
+        boundary = list(self._checkpoint.boundary)
+        for record in batch:
+            if record.timestamp != timestamp:
+                timestamp, boundary = record.timestamp, []
+            boundary.append(_digest(record.stream, record.message))
+        self._checkpoint = Checkpoint(
+            self.container.id, timestamp, tuple(boundary)
+        )
+        self.store.save(self._checkpoint)
+
+    def _read(self, records):
+        api = self.container.client.api
+        try:
+            tty = api.inspect_container(self.container.id)['Config']['Tty']
+            while not self._stopped.is_set():
+                since = None
+                if self._last_timestamp:
+                    # A float can't hold nanoseconds, so ask for a little
+                    # more and skip what was already seen
+                    since = (self._last_timestamp - 1000) / 1e9
+                self._stream = api.logs(
+                    self.container.id, stdout=self.stdout, stderr=self.stderr,
+                    stream=True, follow=True, timestamps=True, since=since,
+                    demux=True
+                )
+                try:
+                    self._follow(self._stream, tty, records)
+                except (requests.exceptions.RequestException, OSError):
+                    pass
+                finally:
+                    self._stream.close()
+                if self._stopped.is_set():
+                    break
+                state = api.inspect_container(self.container.id)['State']
+                if not state['Running']:
+                    break
+                # The connection was lost: resume after the last line
+                self._skip = collections.Counter(
+                    _digest(stream, message)
+                    for stream, message in self._last_lines
+                )
+                if self._last_timestamp == self._initial.timestamp:
+                    self._skip.update(self._initial.boundary)
+                self._stopped.wait(self.retry_interval)
+        except NotFound:
+            pass
+        except Exception as e:
+            self._put(records, e)
+            return
+        self._put(records, _END)
+
+    def _follow(self, stream, tty, records):
+        for name, line in _split_lines(stream, tty):
+            if self._stopped.is_set():
+                return
+            record = self._record(name, line)
+            if record is not None:
+                self._put(records, record)
+
+    def _record(self, stream, line):
+        try:
+            timestamp, message = parse_timestamp(line)
+        except ValueError:
+            timestamp, message = self._last_timestamp, line
+        if timestamp < self._last_timestamp:
+            return None
+        if timestamp == self._last_timestamp:
+            if self._skip:
+                digest = _digest(stream, message)
+                if self._skip[digest]:
+                    self._skip[digest] -= 1
+                    return None
+            self._last_lines.append((stream, message))
+        else:
+            self._last_timestamp = timestamp
+            self._last_lines = [(stream, message)]
+            self._skip.clear()
+        return LogRecord(self.container.id, timestamp, stream, message)
+
+    def _put(self, records, item):
+        while not self._stopped.is_set():
+            try:
+                records.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+
+class ServiceLogReader:
+    """
+    Reads the logs of a swarm service as :py:class:`ServiceLogRecord`
+    objects, which tell the task, node and replica each line comes from.
+
+    :py:meth:`read` replays the logs of a time range in timestamp order.
+    The daemon returns the logs of each task in order, so they are fetched
+    task by task, concurrently, and merged. A long range can also be split
+    into slices, which are fetched concurrently as well and yielded one
+    after the other.
+
+    :py:meth:`follow` streams new lines of the whole service as the daemon
+    sends them.
+
+    Args:
+        service (:py:class:`~docker.models.services.Service`): The service.
+        stdout (bool): Read ``STDOUT``. Default: ``True``
+        stderr (bool): Read ``STDERR``. Default: ``True``
+        max_workers (int): Maximum number of logs fetched at the same time.
+            Default: 8
+
+    Example:
+
+        >>> reader = service.log_reader()
+        >>> since = datetime(2024, 1, 2, 3, 0, tzinfo=timezone.utc)
+        >>> for record in reader.read(since, since + timedelta(hours=1),
+        ...                           slice_seconds=300):
+        ...     print(record.replica, record.message)
+    """
+    def __init__(self, service, stdout=True, stderr=True, max_workers=8):
+        self.service = service
+        self.stdout = stdout
+        self.stderr = stderr
+        self.max_workers = max_workers
+        self._tty = service.attrs['Spec']['TaskTemplate'][
+            'ContainerSpec'].get('TTY', False)
+        self._tasks = None
+        self._missing = set()
+
+    def tasks(self):
+        """
+        The tasks of the service, by ID, as listed when they were first
+        needed.
+        """
+        if self._tasks is None:
+            self.refresh_tasks()
+        return self._tasks
+
+    def refresh_tasks(self):
+        """
+        List the tasks of the service again.
+        """
+        self._tasks = {task['ID']: task for task in self.service.tasks()}
+
+    def read(self, since, until=None, slice_seconds=None):
+        """
+        Yield the records logged in a time range, in timestamp order.
+
+        Args:
+            since (datetime, int or float): Start of the range, as a
+                datetime or a UNIX timestamp in seconds.
+            until (datetime, int or float): End of the range, excluded.
+                Default: now
+            slice_seconds (float): Split the range into slices of this
+                duration. Default: a single slice.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        start = _to_nanoseconds(since)
+        end = time.time_ns() if until is None else _to_nanoseconds(until)
+        step = end - start
+        if slice_seconds:
+            step = max(1, int(slice_seconds * 1000000000))
+        windows = iter([
+            (t, min(t + step, end)) for t in range(start, end, step)
+        ])
+        tasks = [
+            task for task in self.tasks().values()
+            if task['Status'].get('ContainerStatus', {}).get('ContainerID')
+        ]
+        if not tasks:
+            return
+
+        executor = ThreadPoolExecutor(self.max_workers)
+        queued = collections.deque()
+        try:
+            while True:
+                # Fetch a few slices ahead, but not the whole range
+                while sum(map(len, queued)) < self.max_workers * 2:
+                    window = next(windows, None)
+                    if window is None:
+                        break
+                    queued.append([
+                        executor.submit(self._fetch, task, *window)
+                        for task in tasks
+                    ])
+                if not queued:
+                    return
+                futures = queued.popleft()
+                yield from heapq.merge(
+                    *(future.result() for future in futures),
+                    key=lambda record: record.timestamp
+                )
+        finally:
+            for futures in queued:
+                for future in futures:
+                    future.cancel()
+            executor.shutdown(wait=False)
+
+    def write(self, dest, since, until=None, slice_seconds=None):
+        """
+        Write the records logged in a time range to a file, in timestamp
+        order, one line each, like ``docker service logs --timestamps``.
+
+        Args:
+            dest (str or file): The path of the file, or a binary file
+                object.
+            since (datetime, int or float): Start of the range.
+            until (datetime, int or float): End of the range. Default: now
+            slice_seconds (float): Split the range into slices of this
+                duration.
+
+        Returns:
+            (int): The number of records written.
+        """
+        if isinstance(dest, (str, os.PathLike)):
+            with open(dest, 'wb') as f:
+                return self.write(f, since, until, slice_seconds)
+        count = 0
+        for record in self.read(since, until, slice_seconds):
+            dest.write(self._format(record))
+            count += 1
+        return count
+
+    def follow(self, since=None, tail='all'):
+        """
+        Yield the records of the whole service as the daemon sends them,
+        until the generator is closed.
+
+        Args:
+            since (datetime, int or float): Only read lines logged since
+                then. Default: all
+            tail (str or int): Number of lines to read from the end of the
+                logs of each task before following them. Default: ``all``
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        if isinstance(since, datetime):
+            since = _to_nanoseconds(since) / 1e9
+        stream = self.service.client.api.service_logs(
+            self.service.id, details=True, follow=True, stdout=self.stdout,
+            stderr=self.stderr, since=since or 0, timestamps=True,
+            tail=tail, is_tty=self._tty, demux=True
+        )
+        for name, line in _split_lines(stream, self._tty):
+            try:
+                timestamp, line = parse_timestamp(line)
+            except ValueError:
+                continue
+            details, _, message = line.partition(b' ')
+            attrs = parse_log_details(details)
+            task = self._task(attrs.get('com.docker.swarm.task.id'))
+            yield ServiceLogRecord(
+                self.service.id, task['ID'],
+                attrs.get('com.docker.swarm.node.id'), task.get('Slot'),
+                timestamp, name, message
+            )
+
+    def _task(self, task_id):
+        tasks = self.tasks()
+        if task_id not in tasks and task_id not in self._missing:
+            # A task started after the tasks were listed
+            self.refresh_tasks()
+            tasks = self._tasks
+            if task_id not in tasks:
+                self._missing.add(task_id)
+        return tasks.get(task_id, {'ID': task_id})
+
+    def _fetch(self, task, start, end):
+        stream = self.service.client.api.task_logs(
+            task['ID'], stdout=self.stdout, stderr=self.stderr,
+            # A float can't hold nanoseconds, so ask for a little more
+            since=max(start - 1000, 0) / 1e9, timestamps=True,
+            is_tty=self._tty, demux=True
+        )
+        records = []
+        try:
+            for name, line in _split_lines(stream, self._tty):
+                try:
+                    timestamp, message = parse_timestamp(line)
+                except ValueError:
+                    continue
+                if timestamp < start:
+                    continue
+                if timestamp >= end:
+                    break
+                records.append(ServiceLogRecord(
+                    self.service.id, task['ID'], task.get('NodeID'),
+                    task.get('Slot'), timestamp, name, message
+                ))
+        finally:
+            stream.close()
+        return records
+
+    def _format(self, record):
+        seconds, nanoseconds = divmod(record.timestamp, 1000000000)
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds))
+        replica = record.replica if record.replica is not None \
+            else record.node
+        prefix = (
+            f'{timestamp}.{nanoseconds:09d}Z {self.service.name}.{replica}.'
+            f'{record.task}@{record.node} | '
+        )
+        return prefix.encode('utf-8') + record.message + b'\n'
+
+
+def parse_log_details(details):
+    """
+    Parse the details the daemon prefixes log lines with when asked for
+    them, such as ``com.docker.swarm.task.id=abc,com.docker.swarm.node.id=
+    def``.
+
+    Args:
+        details (bytes): The details.
+
+    Returns:
+        (dict): The value of each detail.
+    """
+    attrs = {}
+    for item in details.decode('utf-8', 'replace').split(','):
+        key, sep, value = item.partition('=')
+        if sep:
+            key = urllib.parse.unquote_plus(key)
+            attrs[key] = urllib.parse.unquote_plus(value)
+    return attrs
+
+
+def parse_timestamp(line):
+    """
+    Split a log line into the timestamp the daemon prefixed it with, in
+    nanoseconds since the epoch, and the message.
+
+    The daemon writes timestamps in UTC with nine decimals, which are read
+    by slicing the line. Other RFC 3339 timestamps are parsed with a
+    regular expression.
+
+    Args:
+        line (bytes): The line.
+
+    Returns:
+        (tuple): The timestamp and the message.
+
+    Raises:
+        ValueError: If the line doesn't start with a timestamp.
+    """
+    if line[29:31] == b'Z ' and line[19:20] == b'.':
+        nanoseconds = int(line[20:29])
+        return _epoch(line[:19]) * 1000000000 + nanoseconds, line[31:]
+
+    timestamp, _, message = line.partition(b' ')
+    match = RFC3339_RE.match(timestamp)
+    if not match:
+        raise ValueError(f'Invalid log timestamp: {timestamp[:40]!r}')
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    seconds = calendar.timegm((
+        int(year), int(month), int(day), int(hour), int(minute), int(second)
+    ))
+    if zone != b'Z':
+        offset = int(zone[1:3]) * 3600 + int(zone[4:6]) * 60
+        seconds -= offset if zone[:1] == b'+' else -offset
+    nanoseconds = int((fraction or b'0').ljust(9, b'0'))
+    return seconds * 1000000000 + nanoseconds, message
+
+
+def _split_lines(chunks, tty):
+    """
+    Turn demultiplexed chunks of logs into ``(stream, line)`` tuples.
+    """
+    pending = {'stdout': b'', 'stderr': b''}
+    for chunk in chunks:
+        if chunk[0] is not None:
+            name, data = 'stdout', chunk[0]
+        else:
+            name, data = 'stderr', chunk[1]
+        if tty:
+            # The output isn't framed, so split it into lines
+            lines = (pending[name] + data).split(b'\n')
+            pending[name] = lines.pop()
+            for line in lines:
+                yield name, line
+        else:
+            # Each frame is a line, or part of a very long line
+            yield name, data[:-1] if data.endswith(b'\n') else data
+    for name, line in pending.items():
+        if line:
+            yield name, line
+
+
+@functools.lru_cache(maxsize=256)
+def _epoch(prefix):
+    # Lines logged within the same second share the prefix
+    return calendar.timegm((
+        int(prefix[0:4]), int(prefix[5:7]), int(prefix[8:10]),
+        int(prefix[11:13]), int(prefix[14:16]), int(prefix[17:19]),
+    ))
+
+
+def _to_nanoseconds(value):
+    if isinstance(value, datetime):
+        return (datetime_to_timestamp(value) * 1000000000 +
+                value.microsecond * 1000)
+    return int(value * 1000000000)
+
+
+def _digest(stream, message):
+    return hashlib.blake2b(
+        stream.encode('ascii') + b'\0' + message, digest_size=8
+    ).hexdigest()
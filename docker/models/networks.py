@@ -1,4 +1,7 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from ..api import APIClient
+from ..errors import NotFound
 from ..utils import version_gte
 from .containers import Container
 from .resource import Collection, Model
@@ -8,6 +11,8 @@ class Network(Model):
     """
     A Docker network.
     """
+    __slots__ = ()
+
     @property
     def name(self):
         """
@@ -19,12 +24,16 @@ class Network(Model):
     def containers(self):
         """
         The containers that are connected to the network, as a list of
-        :py:class:`~docker.models.containers.Container` objects.
+        :py:class:`~docker.models.containers.Container` objects. They are
+        inspected concurrently.
         """
-        return [
-            self.client.containers.get(cid) for cid in
-            (self.attrs.get('Containers') or {}).keys()
-        ]
+        container_ids = list(self.attrs.get('Containers') or {})
+        if len(container_ids) < 2:
+            return [self.client.containers.get(cid) for cid in container_ids]
+        with ThreadPoolExecutor(min(len(container_ids), 8)) as executor:
+            return list(
+                executor.map(self.client.containers.get, container_ids)
+            )
 
     def connect(self, container, *args, **kwargs):
         """
@@ -96,6 +105,13 @@ class NetworkCollection(Collection):
     Networks on the Docker server.
     """
     model = Network
+    columns = {
+        'id': lambda r: r['Id'],
+        'name': lambda r: r.get('Name'),
+        'driver': lambda r: r.get('Driver'),
+        'scope': lambda r: r.get('Scope'),
+        'labels': lambda r: r.get('Labels') or {},
+    }
 
     def create(self, name, *args, **kwargs):
         """
@@ -197,6 +213,12 @@ class NetworkCollection(Collection):
                 - ``type=["custom"|"builtin"]`` Filters networks by type.
             greedy (bool): Fetch more details for each network individually.
                 You might want this to get the containers attached to them.
+            max_workers (int): Maximum number of networks fetched at the
+                same time with ``greedy``. Default: 8
+            columnar (bool): Return a
+                :py:class:`~docker.models.resource.ResultSet` with the
+                columns ``id``, ``name``, ``driver``, ``scope`` and
+                ``labels``. Ignores ``greedy``. Default: ``False``
 
         Returns:
             (list of :py:class:`Network`) The networks on the server.
@@ -206,13 +228,265 @@ class NetworkCollection(Collection):
                 If the server returns an error.
         """
         greedy = kwargs.pop('greedy', False)
+        columnar = kwargs.pop('columnar', False)
+        max_workers = kwargs.pop('max_workers', 8)
         resp = self.client.api.networks(*args, **kwargs)
+        if columnar:
+            return self.prepare_result_set(resp)
         networks = [self.prepare_model(item) for item in resp]
-        if greedy and version_gte(self.client.api._version, '1.28'):
-            for net in networks:
-                net.reload()
+        if greedy and version_gte(self.client.api._version, '1.28') and (
+                networks):
+            with ThreadPoolExecutor(min(len(networks), max_workers)) as ex:
+                for _ in ex.map(Network.reload, networks):
+                    pass
         return networks
 
+    def topology(self, names=None, ids=None, filters=None, max_workers=8,
+                 sparse=False):
+        """
+        Get the networks and the containers attached to them in bulk, as a
+        graph which can be walked both ways.
+
+        Networks are inspected concurrently, and each container is
+        inspected once as soon as a network it is attached to is known,
+        however many networks it is attached to.
+
+        Args:
+            names (:py:class:`list`): List of names to filter by.
+            ids (:py:class:`list`): List of ids to filter by.
+            filters (dict): Filters to be processed on the network list.
+                See :py:meth:`list`.
+            max_workers (int): Maximum number of requests sent at the same
+                time. Default: 8
+            sparse (bool): Do not inspect containers, get them from a single
+                container list instead. Their attributes are the ones of
+                :py:meth:`~docker.models.containers.ContainerCollection.list`
+                with ``sparse=True``. Default: ``False``
+
+        Returns:
+            (:py:class:`NetworkTopology`)
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> topology = client.networks.topology(max_workers=16)
+            >>> for network in topology.networks_of('web'):
+            ...     print(network.name, topology.endpoint(network, 'web'))
+        """
+        api = self.client.api
+        networks = {}
+        containers = {}
+        # Keep the order of the list, whatever the order of the answers
+        for item in api.networks(names, ids, filters):
+            networks[item['Id']] = None
+        with ThreadPoolExecutor(max_workers) as executor:
+            pending = {
+                executor.submit(api.inspect_network, network_id): 'network'
+                for network_id in networks
+            }
+            if sparse:
+                pending[executor.submit(api.containers, all=True)] = 'list'
+            requested = set()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind = pending.pop(future)
+                    try:
+                        result = future.result()
+                    # Removed since it was listed, or a load balancer
+                    # endpoint which is not a container
+                    except NotFound:
+                        continue
+                    if kind == 'list':
+                        for attrs in result:
+                            containers[attrs['Id']] = attrs
+                        continue
+                    if kind == 'container':
+                        containers[result['Id']] = result
+                        continue
+                    networks[result['Id']] = result
+                    if sparse:
+                        continue
+                    for cid in result.get('Containers') or {}:
+                        if cid not in requested:
+                            requested.add(cid)
+                            pending[executor.submit(
+                                api.inspect_container, cid
+                            )] = 'container'
+        return NetworkTopology(
+            [
+                self.prepare_model(attrs) for attrs in networks.values()
+                if attrs is not None
+            ],
+            [
+                self.client.containers.prepare_model(attrs)
+                for attrs in containers.values()
+            ],
+        )
+
     def prune(self, filters=None):
         return self.client.api.prune_networks(filters=filters)
     prune.__doc__ = APIClient.prune_networks.__doc__
+
+
+class NetworkTopology:
+    """
+    The networks of a daemon and the containers attached to them, indexed
+    both ways. Returned by :py:meth:`NetworkCollection.topology`.
+
+    Networks and containers can be looked up by model, ID or name.
+
+    Attributes:
+        networks (dict): The :py:class:`Network` objects, by ID.
+        containers (dict): The
+            :py:class:`~docker.models.containers.Container` objects attached
+            to at least one of the networks, by ID.
+    """
+    def __init__(self, networks, containers):
+        self.networks = {network.id: network for network in networks}
+        self.containers = {}
+        self._network_names = {}
+        self._container_names = {}
+        self._containers_of = {}
+        self._networks_of = {}
+        for network in networks:
+            self._network_names.setdefault(network.name, network.id)
+            self._containers_of[network.id] = []
+        by_id = {container.id: container for container in containers}
+        for network in networks:
+            for cid in network.attrs.get('Containers') or {}:
+                container = by_id.get(cid)
+                if container is None:
+                    continue
+                self.containers[cid] = container
+                self._containers_of[network.id].append(cid)
+                self._networks_of.setdefault(cid, []).append(network.id)
+        for container in self.containers.values():
+            name = _container_name(container)
+            if name:
+                self._container_names[name] = container.id
+
+    def __repr__(self):
+        return (
+            f'<{self.__class__.__name__}: {len(self.networks)} networks, '
+            f'{len(self.containers)} containers>'
+        )
+
+    def network(self, network):
+        """
+        Return a network of the topology.
+
+        Args:
+            network (str or :py:class:`Network`): The network, or its ID or
+                name.
+
+        Raises:
+            :py:class:`docker.errors.NotFound`
+                If the network is not part of the topology.
+        """
+        return self.networks[self._network_id(network)]
+
+    def container(self, container):
+        """
+        Return a container of the topology.
+
+        Args:
+            container (str or
+                :py:class:`~docker.models.containers.Container`): The
+                container, or its ID or name.
+
+        Raises:
+            :py:class:`docker.errors.NotFound`
+                If the container is not attached to any network of the
+                topology.
+        """
+        return self.containers[self._container_id(container)]
+
+    def containers_of(self, network):
+        """
+        Return the containers attached to a network.
+
+        Args:
+            network (str or :py:class:`Network`): The network, or its ID or
+                name.
+
+        Returns:
+            (list of :py:class:`~docker.models.containers.Container`)
+        """
+        return [
+            self.containers[cid]
+            for cid in self._containers_of[self._network_id(network)]
+        ]
+
+    def networks_of(self, container):
+        """
+        Return the networks a container is attached to.
+
+        Args:
+            container (str or
+                :py:class:`~docker.models.containers.Container`): The
+                container, or its ID or name.
+
+        Returns:
+            (list of :py:class:`Network`)
+        """
+        return [
+            self.networks[nid]
+            for nid in self._networks_of[self._container_id(container)]
+        ]
+
+    def endpoint(self, network, container):
+        """
+        Return the endpoint of a container on a network, as reported by the
+        network, with keys such as ``IPv4Address`` and ``MacAddress``.
+
+        Raises:
+            :py:class:`docker.errors.NotFound`
+                If the container is not attached to the network.
+        """
+        network = self.network(network)
+        container_id = self._container_id(container)
+        endpoints = network.attrs.get('Containers') or {}
+        if container_id not in endpoints:
+            raise NotFound(
+                f'Container {container_id} is not attached to network '
+                f'{network.name}'
+            )
+        return endpoints[container_id]
+
+    def _network_id(self, network):
+        network_id = getattr(network, 'id', network)
+        if network_id in self.networks:
+            return network_id
+        if network_id in self._network_names:
+            return self._network_names[network_id]
+        matches = [nid for nid in self.networks if nid.startswith(network_id)]
+        if len(matches) != 1:
+            raise NotFound(f'No such network: {network_id}')
+        return matches[0]
+
+    def _container_id(self, container):
+        container_id = getattr(container, 'id', container)
+        if container_id in self.containers:
+            return container_id
+        name = container_id.lstrip('/')
+        if name in self._container_names:
+            return self._container_names[name]
+        matches = [
+            cid for cid in self.containers if cid.startswith(container_id)
+        ]
+        if len(matches) != 1:
+            raise NotFound(f'No such container: {container_id}')
+        return matches[0]
+
+
+def _container_name(container):
+    name = container.attrs.get('Name')
+    if name is None:
+        # Containers from a list have several names
+        names = container.attrs.get('Names') or []
+        name = names[0] if names else ''
+    return name.lstrip('/')
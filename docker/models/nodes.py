@@ -3,6 +3,8 @@ from .resource import Collection, Model
 
 class Node(Model):
     """A node in a swarm."""
+    __slots__ = ()
+
     id_attribute = 'ID'
 
     @property
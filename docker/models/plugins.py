@@ -6,6 +6,8 @@ class Plugin(Model):
     """
     A plugin on the server.
     """
+    __slots__ = ()
+
     def __repr__(self):
         return f"<{self.__class__.__name__}: '{self.name}'>"
 
@@ -0,0 +1,345 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from .. import utils
+from ..errors import InvalidArgument
+
+# The order prunes run in: the phases of a list run at the same time.
+# Containers hold networks, volumes and images, images hold build cache.
+PHASES = [
+    ['containers'],
+    ['networks', 'volumes'],
+    ['images'],
+    ['build_cache'],
+]
+# The key of the deleted objects in the result of each prune
+DELETED_KEYS = {
+    'containers': 'ContainersDeleted',
+    'networks': 'NetworksDeleted',
+    'volumes': 'VolumesDeleted',
+    'images': 'ImagesDeleted',
+    'build_cache': 'CachesDeleted',
+}
+PREDEFINED_NETWORKS = frozenset(('bridge', 'host', 'none'))
+PRUNED_CONTAINER_STATES = frozenset(('created', 'exited', 'dead'))
+ANONYMOUS_VOLUME_LABEL = 'com.docker.volume.anonymous'
+# Build cache records which are only pruned with all=True
+INTERNAL_CACHE_TYPES = frozenset(('internal', 'frontend'))
+
+DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ns|us|µs|ms|s|m|h)')
+DURATION_UNITS = {
+    'ns': 1e-9, 'us': 1e-6, 'µs': 1e-6, 'ms': 1e-3, 's': 1, 'm': 60,
+    'h': 3600,
+}
+# Nanoseconds and a trailing Z, which fromisoformat() does not read
+RFC3339_RE = re.compile(r'(\.\d{1,6})\d*|Z$')
+
+
+class SystemPrune:
+    """
+    Prunes the unused containers, networks, volumes, images and build cache
+    of a daemon, like ``docker system prune``. Use
+    :py:meth:`~docker.client.DockerClient.system_prune` rather than this
+    class.
+
+    Args:
+        client (:py:class:`~docker.client.DockerClient`): The client of the
+            daemon.
+        filters (dict): Filters shared by every prune: ``until`` and
+            ``label`` (or ``label!``).
+        all (bool): Prune every unused image, not only dangling ones, and
+            every kind of build cache.
+        volumes (bool): Prune unused volumes too.
+        build_cache (bool): Prune the build cache too. It is skipped when
+            filtering on labels, or on ``until`` with API versions before
+            1.39, which the build cache prune does not support.
+    """
+    def __init__(self, client, filters=None, all=False, volumes=False,
+                 build_cache=True):
+        filters = dict(filters or {})
+        unknown = set(filters) - {'until', 'label', 'label!'}
+        if unknown:
+            raise InvalidArgument(
+                f'Unsupported prune filters: {", ".join(sorted(unknown))}'
+            )
+        if volumes and 'until' in filters:
+            raise InvalidArgument(
+                'The "until" filter is not supported when pruning volumes'
+            )
+        if isinstance(filters.get('until'), datetime):
+            filters['until'] = utils.datetime_to_timestamp(filters['until'])
+        self.client = client
+        self.filters = filters
+        self.all = all
+        self.volumes = volumes
+        # The build cache has no labels to filter on, and is not filtered
+        # at all before API 1.39
+        self.build_cache = build_cache and not (
+            'label' in filters or 'label!' in filters or (
+                filters and utils.version_lt(client.api._version, '1.39')
+            )
+        )
+
+    @property
+    def prunes(self):
+        """
+        The names of the prunes to run, in order.
+        """
+        skipped = set()
+        if not self.volumes:
+            skipped.add('volumes')
+        if not self.build_cache:
+            skipped.add('build_cache')
+        return [
+            name for phase in PHASES for name in phase if name not in skipped
+        ]
+
+    def run(self, max_workers=2):
+        """
+        Prune, one phase after the other.
+
+        Returns:
+            (dict): The report of the prune.
+        """
+        report = _report(self.prunes, dry_run=False)
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers) as executor:
+            for phase in self._phases():
+                results = [
+                    (name, executor.submit(self._timed, name))
+                    for name in phase
+                ]
+                for name, future in results:
+                    result, duration = future.result()
+                    _add(report, name, result, duration)
+        report['Duration'] = time.monotonic() - start
+        return report
+
+    def estimate(self):
+        """
+        Estimate what a prune would delete, from
+        :py:meth:`~docker.client.DockerClient.df` and the list of networks.
+
+        Returns:
+            (dict): The report the prune would return.
+        """
+        report = _report(self.prunes, dry_run=True)
+        start = time.monotonic()
+        with ThreadPoolExecutor(2) as executor:
+            networks = executor.submit(self.client.api.networks)
+            usage = self.client.api.df()
+            networks = networks.result()
+        now = time.time()
+        until = _parse_until(self.filters.get('until'), now)
+
+        def matches(labels, created):
+            if until is not None and created is not None and (
+                    created >= until):
+                return False
+            return _match_labels(self.filters, labels)
+
+        containers = usage.get('Containers') or []
+        pruned = set()
+        phase_start = time.monotonic()
+        size = 0
+        for container in containers:
+            if container.get('State') in PRUNED_CONTAINER_STATES and matches(
+                    container.get('Labels'), container.get('Created')):
+                pruned.add(container['Id'])
+                size += max(container.get('SizeRw') or 0, 0)
+        _add(report, 'containers', {
+            'ContainersDeleted': sorted(pruned), 'SpaceReclaimed': size,
+        }, time.monotonic() - phase_start)
+
+        # What the remaining containers hold on to
+        remaining = [c for c in containers if c['Id'] not in pruned]
+        used_networks = {
+            network.get('NetworkID')
+            for container in remaining
+            for network in (
+                (container.get('NetworkSettings') or {}).get('Networks')
+                or {}
+            ).values()
+        }
+        used_volumes = {
+            mount.get('Name')
+            for container in remaining
+            for mount in container.get('Mounts') or []
+            if mount.get('Type') == 'volume'
+        }
+        used_images = {container.get('ImageID') for container in remaining}
+
+        phase_start = time.monotonic()
+        deleted = [
+            network['Id'] for network in networks
+            if network.get('Name') not in PREDEFINED_NETWORKS
+            and not network.get('Ingress')
+            and network['Id'] not in used_networks
+            and matches(
+                network.get('Labels'), _timestamp(network.get('Created'))
+            )
+        ]
+        _add(report, 'networks', {'NetworksDeleted': deleted},
+             time.monotonic() - phase_start)
+
+        if self.volumes:
+            phase_start = time.monotonic()
+            # Since API 1.42, only anonymous volumes are pruned by default
+            anonymous_only = utils.version_gte(
+                self.client.api._version, '1.42'
+            )
+            deleted, size = [], 0
+            for volume in usage.get('Volumes') or []:
+                labels = volume.get('Labels') or {}
+                usage_data = volume.get('UsageData') or {}
+                if volume['Name'] in used_volumes:
+                    continue
+                if anonymous_only and ANONYMOUS_VOLUME_LABEL not in labels:
+                    continue
+                if matches(labels, None):
+                    deleted.append(volume['Name'])
+                    size += max(usage_data.get('Size') or 0, 0)
+            _add(report, 'volumes', {
+                'VolumesDeleted': deleted, 'SpaceReclaimed': size,
+            }, time.monotonic() - phase_start)
+
+        phase_start = time.monotonic()
+        deleted, size = [], 0
+        for image in usage.get('Images') or []:
+            dangling = not any(
+                tag != '<none>:<none>' for tag in image.get('RepoTags') or []
+            )
+            if image['Id'] in used_images or not (self.all or dangling):
+                continue
+            if matches(image.get('Labels'), image.get('Created')):
+                deleted.append({'Deleted': image['Id']})
+                shared = image.get('SharedSize', -1)
+                size += image.get('Size', 0) - max(shared, 0)
+        _add(report, 'images', {
+            'ImagesDeleted': deleted, 'SpaceReclaimed': size,
+        }, time.monotonic() - phase_start)
+
+        if self.build_cache:
+            phase_start = time.monotonic()
+            deleted, size = [], 0
+            for record in usage.get('BuildCache') or []:
+                if record.get('InUse') or (
+                        not self.all and
+                        record.get('Type') in INTERNAL_CACHE_TYPES):
+                    continue
+                last_used = _timestamp(
+                    record.get('LastUsedAt') or record.get('CreatedAt')
+                )
+                if matches(None, last_used):
+                    deleted.append(record['ID'])
+                    size += record.get('Size', 0)
+            _add(report, 'build_cache', {
+                'CachesDeleted': deleted, 'SpaceReclaimed': size,
+            }, time.monotonic() - phase_start)
+
+        report['Duration'] = time.monotonic() - start
+        return report
+
+    def _phases(self):
+        prunes = set(self.prunes)
+        for phase in PHASES:
+            phase = [name for name in phase if name in prunes]
+            if phase:
+                yield phase
+
+    def _timed(self, name):
+        start = time.monotonic()
+        result = self._prune(name)
+        return result, time.monotonic() - start
+
+    def _prune(self, name):
+        api = self.client.api
+        filters = dict(self.filters)
+        if name == 'containers':
+            return api.prune_containers(filters=filters)
+        if name == 'networks':
+            return api.prune_networks(filters=filters)
+        if name == 'volumes':
+            return api.prune_volumes(filters=filters)
+        if name == 'images':
+            filters['dangling'] = not self.all
+            return api.prune_images(filters=filters)
+        if utils.version_lt(api._version, '1.39'):
+            # Only the default kinds of build cache can be pruned
+            return api.prune_builds()
+        return api.prune_builds(
+            filters=filters or None, all=self.all or None
+        )
+
+
+def _report(prunes, dry_run):
+    report = {DELETED_KEYS[name]: [] for name in prunes}
+    report.update(SpaceReclaimed=0, Phases={}, DryRun=dry_run)
+    return report
+
+
+def _add(report, name, result, duration):
+    key = DELETED_KEYS[name]
+    deleted = (result or {}).get(key) or []
+    space = (result or {}).get('SpaceReclaimed') or 0
+    report[key] = deleted
+    report['SpaceReclaimed'] += space
+    report['Phases'][name] = {
+        'Deleted': len(deleted), 'SpaceReclaimed': space,
+        'Duration': duration,
+    }
+
+
+def _match_labels(filters, labels):
+    labels = labels or {}
+
+    def has(label):
+        key, sep, value = label.partition('=')
+        if key not in labels:
+            return False
+        return not sep or labels[key] == value
+
+    def values(key):
+        value = filters.get(key) or []
+        return [value] if isinstance(value, str) else value
+
+    return (
+        all(has(label) for label in values('label')) and
+        not any(has(label) for label in values('label!'))
+    )
+
+
+def _parse_until(until, now):
+    if until is None:
+        return None
+    if isinstance(until, (int, float)):
+        return until
+    try:
+        return float(until)
+    except ValueError:
+        pass
+    durations = DURATION_RE.findall(until)
+    if durations and ''.join(
+            number + unit for number, unit in durations) == until:
+        return now - sum(
+            float(number) * DURATION_UNITS[unit]
+            for number, unit in durations
+        )
+    return _timestamp(until)
+
+
+def _timestamp(value):
+    if not value:
+        return None
+    value = RFC3339_RE.sub(
+        lambda match: match.group(1) or '+00:00', value
+    )
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
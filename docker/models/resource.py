@@ -1,7 +1,26 @@
+import bisect
+import json
+import sys
+import threading
+from array import array
+from collections import defaultdict
+
+from ..errors import DockerException
+
+# The last compact payload decoded by each thread, as (raw, attrs), so
+# that reading several properties in a row decodes it once
+_decoded = threading.local()
+
+
 class Model:
     """
     A base class for representing a single object on the server.
     """
+    __slots__ = (
+        'client', 'collection', '_attrs', '_raw', '_fields', '__dict__',
+        '__weakref__',
+    )
+
     id_attribute = 'Id'
 
     def __init__(self, attrs=None, client=None, collection=None):
@@ -11,10 +30,25 @@ class Model:
         #: The collection that this model is part of.
         self.collection = collection
 
-        #: The raw representation of this object from the API
         self.attrs = attrs
-        if self.attrs is None:
-            self.attrs = {}
+
+    @classmethod
+    def compact(cls, attrs, client=None, collection=None):
+        """
+        Create a model which keeps its attributes as compact JSON bytes.
+
+        Properties decode the bytes when they are first read and keep
+        only their own value, with strings interned. The last payload
+        decoded is kept for each thread, so reading several properties of
+        a model in a row decodes it once. Reading
+        :py:attr:`attrs` decodes everything and turns the model back into
+        a regular one.
+        """
+        model = cls(client=client, collection=collection)
+        model._attrs = None
+        model._raw = json.dumps(attrs, separators=(',', ':')).encode('utf-8')
+        model._fields = {}
+        return model
 
     def __repr__(self):
         return f"<{self.__class__.__name__}: {self.short_id}>"
@@ -25,12 +59,44 @@ class Model:
     def __hash__(self):
         return hash(f"{self.__class__.__name__}:{self.id}")
 
+    @property
+    def attrs(self):
+        """
+        The raw representation of this object from the API.
+        """
+        if self._attrs is None:
+            attrs = _decode(self._raw)
+            # It is the caller's to modify now
+            _decoded.entry = None
+            self.attrs = attrs
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs):
+        self._attrs = {} if attrs is None else attrs
+        self._raw = None
+        self._fields = None
+
+    def _field(self, name, getter):
+        """
+        Return ``getter(attrs)``, remembering the result if the model is
+        compact.
+        """
+        if self._fields is None:
+            return getter(self._attrs)
+        try:
+            return self._fields[name]
+        except KeyError:
+            value = _intern_all(getter(_decode(self._raw)))
+            self._fields[name] = value
+            return value
+
     @property
     def id(self):
         """
         The ID of the object.
         """
-        return self.attrs.get(self.id_attribute)
+        return self._field('id', lambda attrs: attrs.get(self.id_attribute))
 
     @property
     def short_id(self):
@@ -45,7 +111,12 @@ class Model:
         new data.
         """
         new_model = self.collection.get(self.id)
-        self.attrs = new_model.attrs
+        if new_model._attrs is None:
+            self._attrs = None
+            self._raw = new_model._raw
+            self._fields = {}
+        else:
+            self.attrs = new_model.attrs
 
 
 class Collection:
@@ -57,6 +128,10 @@ class Collection:
     #: The type of object this collection represents, set by subclasses
     model = None
 
+    #: The columns of a :py:class:`ResultSet` listing, as a mapping of
+    #: column names to functions extracting the value from a list entry
+    columns = {}
+
     def __init__(self, client=None):
         #: The client pointing at the server that this collection of objects
         #: is on.
@@ -87,6 +162,383 @@ class Collection:
             attrs.collection = self
             return attrs
         elif isinstance(attrs, dict):
+            if getattr(self.client, 'compact_models', False):
+                return self.model.compact(
+                    attrs, client=self.client, collection=self
+                )
             return self.model(attrs=attrs, client=self.client, collection=self)
         else:
             raise Exception(f"Can't create {self.model.__name__} from {attrs}")
+
+    def prepare_result_set(self, rows):
+        """
+        Create a :py:class:`ResultSet` from a list of attributes.
+        """
+        return ResultSet(_Table(self, rows))
+
+
+class ResultSet:
+    """
+    A columnar listing of objects, returned by the ``list()`` method of
+    collections when ``columnar=True``.
+
+    The fields of the listed objects are held in columns of interned
+    values, which are indexed on first use, so filtering large listings
+    does not loop over every object. Objects are only created when they
+    are accessed.
+
+    Filtering returns a new result set sharing the same columns and
+    indexes.
+
+    Example:
+
+        >>> containers = client.containers.list(all=True, columnar=True)
+        >>> web = containers.filter(
+        ...     status='running', name__startswith='web-',
+        ...     label=['tier=frontend']
+        ... )
+        >>> len(web)
+        42
+        >>> web[0]
+        <Container: 8f2f5cf4a2b0>
+    """
+    def __init__(self, table, positions=None):
+        self._table = table
+        if positions is None:
+            positions = range(len(table.rows))
+        self._positions = positions
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __iter__(self):
+        for position in self._positions:
+            yield self._table.model(position)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResultSet(self._table, self._positions[index])
+        return self._table.model(self._positions[index])
+
+    def __repr__(self):
+        model = self._table.collection.model
+        return f"<{self.__class__.__name__}: {len(self)} {model.__name__}>"
+
+    @property
+    def column_names(self):
+        """
+        The names of the columns.
+        """
+        return list(self._table.columns)
+
+    @property
+    def ids(self):
+        """
+        The IDs of the objects.
+        """
+        return [
+            self._table.rows[i].get(self._table.collection.model.id_attribute)
+            for i in self._positions
+        ]
+
+    def column(self, name):
+        """
+        The values of a column, as a list.
+        """
+        column = self._table.column(name)
+        return [column.value(i) for i in self._positions]
+
+    def filter(self, label=None, **conditions):
+        """
+        Select the objects matching all the given conditions.
+
+        Args:
+            label (str or list): Label selectors, in the format ``"key"``
+                or ``"key=value"``.
+            **conditions: Conditions on columns. ``column=value`` selects
+                objects whose value for ``column`` is ``value``, or one of
+                the values if a list is given. ``column__startswith=prefix``
+                selects values starting with ``prefix``. For columns holding
+                several values per object, such as image tags, any of them
+                may match.
+
+        Returns:
+            (:py:class:`ResultSet`): The matching objects.
+
+        Raises:
+            :py:class:`docker.errors.DockerException`
+                If a column does not exist.
+        """
+        selected = None
+        if label is not None:
+            if isinstance(label, str):
+                label = [label]
+            column = self._table.column('labels')
+            for selector in label:
+                selected = _intersect(selected, column.lookup(selector))
+        for key, value in conditions.items():
+            name, _, operator = key.partition('__')
+            column = self._table.column(name)
+            if operator == 'startswith':
+                rows = column.lookup_prefix(value)
+            elif operator:
+                raise DockerException(f'Unknown operator: {operator}')
+            elif isinstance(value, (list, tuple, set)):
+                rows = set()
+                for item in value:
+                    rows.update(column.lookup(item))
+            else:
+                rows = column.lookup(value)
+            selected = _intersect(selected, rows)
+        if selected is None:
+            return self
+        return ResultSet(
+            self._table, [i for i in self._positions if i in selected]
+        )
+
+    def to_numpy(self, name):
+        """
+        Convert a single-valued column to NumPy. Requires ``numpy``.
+
+        Returns:
+            (tuple): An integer array of codes, ``-1`` meaning no value, and
+                the list of values the codes refer to. For a listing which
+                has not been filtered, the array shares its memory with the
+                column.
+        """
+        np = _import_optional('numpy')
+        column = self._table.column(name)
+        if not isinstance(column, _Column):
+            raise DockerException(f'{name} has several values per object')
+        codes = np.frombuffer(column.codes, dtype=np.int64)
+        if not isinstance(self._positions, range):
+            codes = codes[np.asarray(self._positions, dtype=np.intp)]
+        return codes, column.categories
+
+    def to_pandas(self):
+        """
+        Convert the listing to a :py:class:`pandas.DataFrame`, with a
+        categorical column for each single-valued column. Requires
+        ``pandas``.
+        """
+        pd = _import_optional('pandas')
+        data = {}
+        for name in self._table.columns:
+            column = self._table.column(name)
+            if isinstance(column, _Column):
+                codes, categories = self.to_numpy(name)
+                data[name] = pd.Categorical.from_codes(codes, categories)
+            else:
+                data[name] = self.column(name)
+        return pd.DataFrame(data)
+
+    def to_arrow(self):
+        """
+        Convert the listing to a :py:class:`pyarrow.Table`, with a
+        dictionary-encoded column for each single-valued column. Requires
+        ``pyarrow`` and ``numpy``.
+        """
+        pa = _import_optional('pyarrow')
+        arrays = {}
+        for name in self._table.columns:
+            column = self._table.column(name)
+            if isinstance(column, _Column):
+                codes, categories = self.to_numpy(name)
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(codes, mask=codes < 0), pa.array(categories)
+                )
+            elif isinstance(column, _LabelColumn):
+                arrays[name] = pa.array(
+                    [list(labels.items()) for labels in self.column(name)],
+                    type=pa.map_(pa.string(), pa.string())
+                )
+            else:
+                arrays[name] = pa.array(self.column(name))
+        return pa.table(arrays)
+
+
+class _Table:
+    """
+    The rows of a listing, and their columns, built on first use.
+    """
+    def __init__(self, collection, rows):
+        self.collection = collection
+        self.rows = rows
+        self.columns = collection.columns
+        self._columns = {}
+
+    def model(self, position):
+        return self.collection.prepare_model(self.rows[position])
+
+    def column(self, name):
+        column = self._columns.get(name)
+        if column is None:
+            try:
+                getter = self.columns[name]
+            except KeyError:
+                raise DockerException(f'Unknown column: {name}') from None
+            values = [getter(row) for row in self.rows]
+            kinds = {type(v) for v in values if v is not None}
+            if dict in kinds:
+                column = _LabelColumn(values)
+            elif list in kinds:
+                column = _MultiColumn(values)
+            else:
+                column = _Column(values)
+            self._columns[name] = column
+        return column
+
+
+class _Column:
+    """
+    A dictionary-encoded column, holding one value per row.
+    """
+    def __init__(self, values):
+        self.categories = []
+        self.codes = array('q')
+        codes = {}
+        for value in values:
+            if value is None:
+                self.codes.append(-1)
+                continue
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.categories)
+                self.categories.append(_intern(value))
+            self.codes.append(code)
+        self._codes = codes
+        self._index = None
+        self._sorted = None
+
+    def value(self, position):
+        code = self.codes[position]
+        return None if code < 0 else self.categories[code]
+
+    def _rows(self):
+        if self._index is None:
+            index = defaultdict(set)
+            for position, code in enumerate(self.codes):
+                index[code].add(position)
+            self._index = index
+        return self._index
+
+    def lookup(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            return set()
+        return self._rows()[code]
+
+    def lookup_prefix(self, prefix):
+        if self._sorted is None:
+            self._sorted = sorted(
+                v for v in self._codes if isinstance(v, str)
+            )
+        start = bisect.bisect_left(self._sorted, prefix)
+        rows = set()
+        for value in self._sorted[start:]:
+            if not value.startswith(prefix):
+                break
+            rows.update(self.lookup(value))
+        return rows
+
+
+class _MultiColumn:
+    """
+    A column holding several values per row, such as image tags.
+    """
+    def __init__(self, values):
+        self.rows = [tuple(_intern(v) for v in row or ()) for row in values]
+        self._index = None
+        self._sorted = None
+
+    def value(self, position):
+        return list(self.rows[position])
+
+    def _entries(self, position):
+        return self.rows[position]
+
+    def _rows(self):
+        if self._index is None:
+            index = defaultdict(set)
+            for position in range(len(self.rows)):
+                for entry in self._entries(position):
+                    index[entry].add(position)
+            self._index = index
+        return self._index
+
+    def lookup(self, value):
+        return self._rows().get(value, set())
+
+    def lookup_prefix(self, prefix):
+        if self._sorted is None:
+            self._sorted = sorted(
+                v for v in self._rows() if isinstance(v, str)
+            )
+        start = bisect.bisect_left(self._sorted, prefix)
+        rows = set()
+        for value in self._sorted[start:]:
+            if not value.startswith(prefix):
+                break
+            rows.update(self.lookup(value))
+        return rows
+
+
+class _LabelColumn(_MultiColumn):
+    """
+    A column of labels. Each row is indexed under ``key`` and ``key=value``
+    for each of its labels, which are the selectors accepted by
+    :py:meth:`ResultSet.filter`.
+    """
+    def __init__(self, values):
+        self.rows = [
+            {_intern(k): _intern(v) for k, v in (labels or {}).items()}
+            for labels in values
+        ]
+        self._index = None
+        self._sorted = None
+
+    def value(self, position):
+        return dict(self.rows[position])
+
+    def _entries(self, position):
+        for key, value in self.rows[position].items():
+            yield key
+            yield f'{key}={value}'
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_all(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {_intern(k): _intern_all(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_all(v) for v in value]
+    return value
+
+
+def _decode(raw):
+    entry = getattr(_decoded, 'entry', None)
+    if entry is not None and entry[0] is raw:
+        return entry[1]
+    attrs = json.loads(raw)
+    _decoded.entry = (raw, attrs)
+    return attrs
+
+
+def _intersect(selected, rows):
+    if selected is None:
+        return set(rows)
+    return selected.intersection(rows)
+
+
+def _import_optional(name):
+    try:
+        return __import__(name)
+    except ImportError as ie:
+        raise DockerException(
+            f'The `{name}` library is required for this conversion.'
+        ) from ie
@@ -4,6 +4,8 @@ from .resource import Collection, Model
 
 class Secret(Model):
     """A secret."""
+    __slots__ = ()
+
     id_attribute = 'ID'
 
     def __repr__(self):
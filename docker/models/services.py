@@ -3,11 +3,15 @@ import copy
 from docker.errors import InvalidArgument, create_unexpected_kwargs_error
 from docker.types import ContainerSpec, Placement, ServiceMode, TaskTemplate
 
+from .convergence import ServiceTracker
+from .logs import ServiceLogReader
 from .resource import Collection, Model
 
 
 class Service(Model):
     """A service."""
+    __slots__ = ()
+
     id_attribute = 'ID'
 
     @property
@@ -113,6 +117,23 @@ class Service(Model):
         )
         return self.client.api.service_logs(self.id, is_tty=is_tty, **kwargs)
 
+    def log_reader(self, **kwargs):
+        """
+        Read the logs of the service with the task, node and replica of each
+        line, and replay time ranges concurrently. See
+        :py:class:`~docker.models.logs.ServiceLogReader`.
+
+        Args:
+            stdout (bool): Read ``stdout``. Default: ``True``
+            stderr (bool): Read ``stderr``. Default: ``True``
+            max_workers (int): Maximum number of logs fetched at the same
+                time. Default: 8
+
+        Returns:
+            (:py:class:`~docker.models.logs.ServiceLogReader`)
+        """
+        return ServiceLogReader(self, **kwargs)
+
     def scale(self, replicas):
         """
         Scale service container.
@@ -142,6 +163,37 @@ class Service(Model):
 
         return self.update(force_update=True, fetch_current_spec=True)
 
+    def wait_converged(self, replicas=None, timeout=None, progress=None):
+        """
+        Wait until the latest spec of the service runs on all its replicas,
+        for instance after :py:meth:`update` or :py:meth:`scale`. See
+        :py:class:`~docker.models.convergence.ServiceTracker` to wait for
+        several services with the same event stream.
+
+        Args:
+            replicas (int): The number of replicas to wait for. Default:
+                the number of replicas of the service, or the number of
+                nodes it is scheduled on for a global service.
+            timeout (float): Time to wait, in seconds. Default: no timeout.
+            progress (callable): Called with each
+                :py:class:`~docker.models.convergence.RolloutEvent`.
+
+        Returns:
+            (:py:class:`~docker.models.convergence.ServiceState`): The
+            state of the service.
+
+        Raises:
+            :py:class:`docker.errors.ServiceNotConverged`
+                If the timeout expires, or if the update of the service is
+                paused or rolled back while waiting.
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        with ServiceTracker(self.client) as tracker:
+            return tracker.wait(
+                self, replicas, timeout=timeout, progress=progress
+            )
+
 
 class ServiceCollection(Collection):
     """Services on the Docker server."""
@@ -4,6 +4,8 @@ from .resource import Collection, Model
 
 class Volume(Model):
     """A volume."""
+    __slots__ = ()
+
     id_attribute = 'Name'
 
     @property
@@ -28,6 +30,12 @@ class Volume(Model):
 class VolumeCollection(Collection):
     """Volumes on the Docker server."""
     model = Volume
+    columns = {
+        'name': lambda r: r['Name'],
+        'driver': lambda r: r.get('Driver'),
+        'scope': lambda r: r.get('Scope'),
+        'labels': lambda r: r.get('Labels') or {},
+    }
 
     def create(self, name=None, **kwargs):
         """
@@ -81,6 +89,10 @@ class VolumeCollection(Collection):
 
         Args:
             filters (dict): Server-side list filtering options.
+            columnar (bool): Return a
+                :py:class:`~docker.models.resource.ResultSet` with the
+                columns ``name``, ``driver``, ``scope`` and ``labels``.
+                Default: ``False``
 
         Returns:
             (list of :py:class:`Volume`): The volumes.
@@ -89,7 +101,10 @@ class VolumeCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        columnar = kwargs.pop('columnar', False)
         resp = self.client.api.volumes(**kwargs)
+        if columnar:
+            return self.prepare_result_set(resp.get('Volumes') or [])
         if not resp.get('Volumes'):
             return []
         return [self.prepare_model(obj) for obj in resp['Volumes']]
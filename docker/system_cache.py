@@ -0,0 +1,256 @@
+import copy
+import threading
+import time
+
+import requests
+
+from .errors import DockerException
+from .utils.events import watch_events
+
+# How container events move a container between the counts of info()
+CONTAINER_COUNTS = {
+    'create': {'Containers': 1, 'ContainersStopped': 1},
+    'start': {'ContainersRunning': 1, 'ContainersStopped': -1},
+    'die': {'ContainersRunning': -1, 'ContainersStopped': 1},
+    'pause': {'ContainersPaused': 1, 'ContainersRunning': -1},
+    'unpause': {'ContainersPaused': -1, 'ContainersRunning': 1},
+    'destroy': {'Containers': -1, 'ContainersStopped': -1},
+}
+# Events which change what df() reports
+DF_EVENTS = {
+    'container': frozenset(('create', 'destroy', 'start', 'die')),
+    'image': frozenset(('pull', 'import', 'load', 'tag', 'untag', 'delete')),
+    'volume': frozenset(('create', 'destroy', 'mount', 'unmount')),
+}
+
+
+class SystemCache:
+    """
+    A stale-while-revalidate cache of
+    :py:meth:`~docker.api.daemon.DaemonApiMixin.df` and
+    :py:meth:`~docker.api.daemon.DaemonApiMixin.info`.
+
+    A value younger than ``ttl`` is returned as is. An older one is
+    returned too, and refreshed in a background thread. Past
+    ``max_staleness``, or with ``force_refresh``, the caller waits for a
+    fresh value. Callers asking for a value which is being fetched share
+    the same request.
+
+    While the cache watches the daemon's events, the container counts of
+    ``info()`` are updated from container events as they come, and events
+    which change the disk usage make the next ``df()`` start a refresh.
+
+    Args:
+        client (:py:class:`~docker.client.DockerClient` or
+            :py:class:`~docker.api.client.APIClient`): The client of the
+            daemon.
+        ttl (float): Age after which a value is refreshed in the
+            background, in seconds. Default: 30
+        max_staleness (float): Age after which a value is not returned
+            anymore, in seconds. Default: 300
+        watch (bool): Watch the daemon's events once a value has been
+            fetched. Default: ``True``
+
+    Example:
+
+        >>> client = docker.from_env()
+        >>> client.df(cached=True)  # waits for the daemon
+        >>> client.df(cached=True)  # returns immediately
+        >>> client.info(cached=True, max_staleness=5)
+    """
+    def __init__(self, client, ttl=30, max_staleness=300, watch=True):
+        self.client = client
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self.watch = watch
+        self._lock = threading.Lock()
+        self._entries = {
+            'df': _Entry('df'), 'info': _Entry('info'),
+        }
+        self._events = None
+        self._connecting = False
+        self._closed = False
+
+    @property
+    def watching(self):
+        """
+        ``True`` while the events of the daemon are being watched.
+        """
+        return self._events is not None
+
+    def df(self, force_refresh=False, max_staleness=None):
+        """
+        Return the data usage of the daemon, like
+        :py:meth:`~docker.api.daemon.DaemonApiMixin.df`.
+
+        Args:
+            force_refresh (bool): Wait for a fresh value.
+            max_staleness (float): Wait for a fresh value if the cached one
+                is older than this, in seconds. Default: the cache's
+                ``max_staleness``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If a fresh value is needed and the server returns an error.
+        """
+        return self._get('df', force_refresh, max_staleness)
+
+    def info(self, force_refresh=False, max_staleness=None):
+        """
+        Return system-wide information, like
+        :py:meth:`~docker.api.daemon.DaemonApiMixin.info`.
+
+        Args:
+            force_refresh (bool): Wait for a fresh value.
+            max_staleness (float): Wait for a fresh value if the cached one
+                is older than this, in seconds. Default: the cache's
+                ``max_staleness``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If a fresh value is needed and the server returns an error.
+        """
+        return self._get('info', force_refresh, max_staleness)
+
+    def invalidate(self):
+        """
+        Forget the cached values.
+        """
+        with self._lock:
+            for entry in self._entries.values():
+                entry.value = None
+
+    def close(self):
+        """
+        Stop watching events.
+        """
+        with self._lock:
+            self._closed = True
+            events, self._events = self._events, None
+        if events is not None:
+            events.close()
+
+    def handle_event(self, event):
+        """
+        Update the cached values according to an event from the daemon.
+        """
+        kind = event.get('Type')
+        action = (event.get('Action') or '').split(':')[0]
+        with self._lock:
+            df, info = self._entries['df'], self._entries['info']
+            if action in DF_EVENTS.get(kind, ()):
+                df.stale = True
+                df.generation += 1
+            if kind == 'image' and action in ('pull', 'load', 'delete'):
+                info.stale = True
+                info.generation += 1
+            if kind != 'container' or action not in CONTAINER_COUNTS:
+                return
+            if info.fetching is not None:
+                # The value being fetched may or may not count the event
+                info.generation += 1
+            if info.value is None:
+                return
+            for key, delta in CONTAINER_COUNTS[action].items():
+                if key in info.value:
+                    info.value[key] = max(info.value[key] + delta, 0)
+
+    def _get(self, name, force_refresh, max_staleness):
+        if max_staleness is None:
+            max_staleness = self.max_staleness
+        entry = self._entries[name]
+        while True:
+            with self._lock:
+                age = entry.age()
+                if not force_refresh and age <= max_staleness:
+                    if ((age > self.ttl or entry.stale)
+                            and entry.fetching is None):
+                        entry.fetching = threading.Event()
+                        threading.Thread(
+                            target=self._refresh, args=(entry,), daemon=True
+                        ).start()
+                    return copy.deepcopy(entry.value)
+                fetched_at = entry.fetched_at
+                fetching = entry.fetching
+                if fetching is None:
+                    fetching = entry.fetching = threading.Event()
+                    leader = True
+                else:
+                    leader = False
+            if leader:
+                self._refresh(entry)
+            else:
+                fetching.wait()
+            with self._lock:
+                if entry.fetched_at == fetched_at and entry.error is not None:
+                    raise entry.error
+                if entry.value is not None:
+                    return copy.deepcopy(entry.value)
+            # Invalidated while fetching
+            force_refresh = True
+
+    def _refresh(self, entry):
+        with self._lock:
+            generation = entry.generation
+        try:
+            value = getattr(self.client, entry.name)()
+            error = None
+        except (DockerException, requests.exceptions.RequestException) as e:
+            value, error = None, e
+        with self._lock:
+            fetching, entry.fetching = entry.fetching, None
+            entry.error = error
+            if error is None:
+                entry.value = value
+                entry.fetched_at = time.monotonic()
+                # Events which came while fetching may not be counted
+                entry.stale = entry.generation != generation
+        fetching.set()
+        if error is None and self.watch:
+            self._watch()
+
+    def _watch(self):
+        with self._lock:
+            if self._events is not None or self._connecting or self._closed:
+                return
+            self._connecting = True
+        try:
+            events = self.client.events(
+                decode=True,
+                filters={'type': ['container', 'image', 'volume']}
+            )
+        except (DockerException, requests.exceptions.RequestException):
+            events = None
+        with self._lock:
+            self._connecting = False
+            self._events = events
+        if events is not None:
+            watch_events(events, self.handle_event, self._stopped_watching,
+                         'System cache')
+
+    def _stopped_watching(self, events):
+        with self._lock:
+            if self._events is events:
+                self._events = None
+            # Events may have been missed
+            for entry in self._entries.values():
+                entry.stale = True
+
+
+class _Entry:
+    __slots__ = ('name', 'value', 'fetched_at', 'fetching', 'error',
+                 'generation', 'stale')
+
+    def __init__(self, name):
+        self.name = name
+        self.value = None
+        self.fetched_at = 0.0
+        self.fetching = None
+        self.error = None
+        self.generation = 0
+        self.stale = False
+
+    def age(self):
+        if self.value is None:
+            return float('inf')
+        return time.monotonic() - self.fetched_at
@@ -1,3 +1,4 @@
+from .engine import RequestsEngine, Urllib3Engine
 from .unixconn import UnixHTTPAdapter
 
 try:
@@ -0,0 +1,299 @@
+import re
+import threading
+import time
+import urllib.parse
+from collections import namedtuple
+from contextlib import contextmanager
+
+import requests
+
+from ..errors import AdmissionTimeout
+
+API_VERSION_RE = re.compile(r'^v\d+\.\d+$')
+REQUEST_CLASSES = ('read', 'write', 'stream', 'wait')
+DEFAULT_MAX_CONCURRENCY = {'read': 10, 'write': 4, 'stream': 10, 'wait': 32}
+# Requests which block until something happens in the daemon, as
+# (resource, action)
+LONG_POLL_ENDPOINTS = {
+    ('containers', 'wait'), ('containers', 'stop'),
+    ('containers', 'restart'), ('containers', 'attach'),
+    ('exec', 'start'),
+}
+
+
+class AdmissionStats(namedtuple('AdmissionStats', (
+        'limit,in_flight,queued,admitted,rejected,failures,wait_time,'
+        'max_wait_time,latency'))):
+    """
+    The state of a class of requests in an :py:class:`AdmissionController`,
+    with the properties:
+
+    - ``limit``: The number of requests currently allowed at the same time.
+    - ``in_flight``: The number of requests being sent.
+    - ``queued``: The number of requests waiting to be sent.
+    - ``admitted``: The number of requests sent so far.
+    - ``rejected``: The number of requests which gave up waiting.
+    - ``failures``: The number of requests which failed with a server error
+      or a timeout.
+    - ``wait_time``: The total time requests have waited, in seconds.
+    - ``max_wait_time``: The longest time a request has waited, in seconds.
+    - ``latency``: A moving average of the latency of the requests, in
+      seconds.
+    """
+    __slots__ = ()
+
+
+class _Limiter:
+    """
+    An AIMD concurrency limit: it grows by one for every ``limit`` requests
+    which succeed quickly, and shrinks by ``backoff`` at most once per
+    round trip when requests fail or slow down. A limiter which is not
+    ``adaptive`` keeps its limit.
+    """
+    def __init__(self, maximum, minimum, initial, backoff, target_latency,
+                 latency_tolerance, adaptive=True):
+        self.adaptive = adaptive
+        self.maximum = maximum
+        self.minimum = minimum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.backoff = backoff
+        self.target_latency = target_latency
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.failures = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.latency = None
+        self._baselines = {}
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout):
+        start = time.monotonic()
+        with self._cond:
+            self.queued += 1
+            try:
+                admitted = self._cond.wait_for(
+                    lambda: self.in_flight < int(self.limit), timeout
+                )
+            finally:
+                self.queued -= 1
+            waited = time.monotonic() - start
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+            if not admitted:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def release(self, latency, failed, endpoint=None):
+        with self._cond:
+            self.in_flight -= 1
+            if failed:
+                self.failures += 1
+                if self.adaptive:
+                    self._decrease(latency)
+            elif endpoint is not None and self.adaptive:
+                self._observe(latency, endpoint)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return AdmissionStats(
+                int(self.limit), self.in_flight, self.queued, self.admitted,
+                self.rejected, self.failures, self.wait_time,
+                self.max_wait_time, self.latency,
+            )
+
+    def _observe(self, latency, endpoint):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = 0.9 * self.latency + 0.1 * latency
+        target = self.target_latency
+        if target is None:
+            # The lowest latency seen on an endpoint, slowly forgotten,
+            # stands for an idle daemon. Endpoints are compared to
+            # themselves since listing images is always slower than
+            # inspecting one.
+            baseline = self._baselines.get(endpoint)
+            if baseline is None or latency < baseline:
+                baseline = latency
+            else:
+                baseline = 0.99 * baseline + 0.01 * latency
+            self._baselines[endpoint] = baseline
+            target = baseline * self.latency_tolerance
+        if latency > target:
+            self._decrease(latency)
+        elif self.in_flight + 1 >= int(self.limit):
+            # Only grow while the limit is actually reached
+            self.limit = min(self.limit + 1 / self.limit, self.maximum)
+
+    def _decrease(self, latency):
+        now = time.monotonic()
+        # Requests sent before the last decrease report the same congestion
+        if now - self._last_decrease < latency:
+            return
+        self._last_decrease = now
+        self.limit = max(self.limit * self.backoff, self.minimum)
+
+
+class AdmissionController:
+    """
+    Limits the number of concurrent requests an
+    :py:class:`~docker.api.client.APIClient` sends to the daemon, and adapts
+    the limit to how the daemon copes.
+
+    Requests are split in four classes, each with its own limit:
+    ``read`` for ``GET`` and ``HEAD`` requests, ``write`` for the others,
+    ``stream`` for the requests whose response is streamed, such as
+    logs, events, pulls and builds, and ``wait`` for the requests which
+    block until something happens in the daemon, such as waiting for or
+    stopping a container, or running an exec instance. Requests over the
+    limit wait in line.
+
+    The limit of a class grows by one every time a full window of requests
+    succeeds, and shrinks by a factor of ``backoff`` when a request fails
+    with a server error or a timeout, or takes more than
+    ``latency_tolerance`` times the lowest latency recently seen on the
+    same endpoint (or ``target_latency``, when given). Streamed requests
+    only hold their slot until the response headers are received, and
+    their latency is not measured. The limit of ``wait`` requests is
+    fixed: how long they take, and whether they time out, says nothing
+    about the daemon.
+
+    Args:
+        max_concurrency (int or dict): The highest limit of each class, or
+            of all of them. Default: 10 for ``read`` and ``stream``, 4 for
+            ``write`` and 32 for ``wait``.
+        min_concurrency (int): The lowest limit of each class. Default: 1
+        initial_concurrency (int): The starting limit of each class.
+            Default: the highest limit.
+        backoff (float): Factor applied to a limit when the daemon is
+            congested. Default: 0.7
+        target_latency (float): Latency above which the daemon is
+            considered congested, in seconds. Default: adapt to the
+            observed latency.
+        latency_tolerance (float): How many times slower than the lowest
+            recent latency of its endpoint a request can be before the
+            daemon is considered congested. Default: 2
+        queue_timeout (float): How long a request waits for its turn, in
+            seconds. Default: no timeout.
+
+    Example:
+
+        >>> admission = AdmissionController({'read': 32, 'write': 8})
+        >>> client = docker.APIClient(admission=admission)
+        >>> admission.stats()['read']
+        AdmissionStats(limit=32, in_flight=0, queued=0, ...)
+    """
+    def __init__(self, max_concurrency=None, min_concurrency=1,
+                 initial_concurrency=None, backoff=0.7, target_latency=None,
+                 latency_tolerance=2, queue_timeout=None):
+        if max_concurrency is None:
+            max_concurrency = DEFAULT_MAX_CONCURRENCY
+        if not isinstance(max_concurrency, dict):
+            max_concurrency = dict.fromkeys(REQUEST_CLASSES, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self._limiters = {}
+        for name in REQUEST_CLASSES:
+            maximum = max_concurrency.get(name, DEFAULT_MAX_CONCURRENCY[name])
+            self._limiters[name] = _Limiter(
+                maximum, min_concurrency,
+                maximum if initial_concurrency is None
+                else initial_concurrency,
+                backoff, target_latency, latency_tolerance,
+                adaptive=name != 'wait',
+            )
+
+    @staticmethod
+    def classify(method, stream=False, url=None):
+        """
+        Return the class of a request: ``read``, ``write``, ``stream`` or
+        ``wait``.
+        """
+        if stream:
+            return 'stream'
+        if url is not None and method == 'POST' and _is_long_poll(url):
+            return 'wait'
+        if method in ('GET', 'HEAD'):
+            return 'read'
+        return 'write'
+
+    @contextmanager
+    def admit(self, method, url, stream=False):
+        """
+        Wait for a request to be allowed, and hold its slot until the
+        block exits. Assign the response to the ``response`` attribute of
+        the yielded object so that server errors are accounted for.
+
+        Raises:
+            :py:class:`docker.errors.AdmissionTimeout`
+                If the request waited longer than ``queue_timeout``.
+        """
+        name = self.classify(method, stream, url)
+        limiter = self._limiters[name]
+        if not limiter.acquire(self.queue_timeout):
+            raise AdmissionTimeout(
+                f'{method} request waited more than {self.queue_timeout} '
+                f'seconds to be sent'
+            )
+        ticket = _Ticket()
+        start = time.monotonic()
+        failed = False
+        try:
+            yield ticket
+            status = getattr(ticket.response, 'status_code', 200)
+            failed = status >= 500 or status == 429
+        except (requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError):
+            failed = True
+            raise
+        finally:
+            limiter.release(
+                time.monotonic() - start, failed,
+                None if stream else _endpoint(method, url),
+            )
+
+    def stats(self):
+        """
+        Return the :py:class:`AdmissionStats` of each class of requests.
+        """
+        return {
+            name: limiter.stats() for name, limiter in self._limiters.items()
+        }
+
+
+class _Ticket:
+    __slots__ = ('response',)
+
+    def __init__(self):
+        self.response = None
+
+
+def _segments(url):
+    segments = urllib.parse.urlsplit(url).path.strip('/').split('/')
+    if segments and API_VERSION_RE.match(segments[0]):
+        segments = segments[1:]
+    return segments
+
+
+def _is_long_poll(url):
+    # /v1.45/containers/<id>/wait
+    segments = _segments(url)
+    return len(segments) == 3 and (
+        (segments[0], segments[2]) in LONG_POLL_ENDPOINTS
+    )
+
+
+def _endpoint(method, url):
+    # /v1.45/containers/<id>/json -> GET containers 3 json
+    segments = _segments(url)
+    if not segments:
+        return method
+    return f'{method} {segments[0]} {len(segments)} {segments[-1]}'
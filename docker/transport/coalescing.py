@@ -0,0 +1,115 @@
+import json
+import threading
+import time
+from collections import namedtuple
+
+
+class CoalescerStats(namedtuple(
+        'CoalescerStats', 'requests,hits,in_flight,wait_time')):
+    """
+    The state of a :py:class:`RequestCoalescer`, with the properties
+    ``requests`` (the number of requests sent to the daemon), ``hits`` (the
+    number of calls which shared a request already in flight),
+    ``in_flight`` (the number of requests being sent) and ``wait_time``
+    (the total time calls have waited for a shared request, in seconds).
+    """
+    __slots__ = ()
+
+
+class RequestCoalescer:
+    """
+    Shares the ``GET`` requests an
+    :py:class:`~docker.api.client.APIClient` sends at the same time with the
+    same URL, parameters and headers: the first one is sent, and the others
+    wait for its response instead of sending their own.
+
+    Only requests which are in flight are shared, nothing is cached. The
+    response is shared as well, but each caller decodes its own copy of
+    the result. Streamed requests are never shared.
+
+    Example:
+
+        >>> coalescer = RequestCoalescer()
+        >>> client = docker.APIClient(coalescer=coalescer)
+        >>> coalescer.stats()
+        CoalescerStats(requests=120, hits=880, in_flight=0, wait_time=3.2)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._requests = 0
+        self._hits = 0
+        self._wait_time = 0.0
+
+    @staticmethod
+    def key(url, params=None, headers=None):
+        """
+        Return the key requests are shared by.
+        """
+        return (
+            url,
+            json.dumps(params, sort_keys=True, default=str),
+            json.dumps(headers, sort_keys=True, default=str),
+        )
+
+    def request(self, key, send):
+        """
+        Call ``send`` to send a request, unless a request with the same key
+        is already in flight, in which case wait for its response.
+
+        Args:
+            key: The key of the request, from :py:meth:`key`.
+            send (callable): Sends the request and returns its response.
+
+        Returns:
+            The response. If ``send`` raised an exception, it is raised
+            for every caller sharing the request.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._requests += 1
+                leader = True
+            else:
+                self._hits += 1
+                leader = False
+
+        if leader:
+            try:
+                call.response = send()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.response
+
+        start = time.monotonic()
+        call.done.wait()
+        with self._lock:
+            self._wait_time += time.monotonic() - start
+        if call.error is not None:
+            raise call.error
+        return call.response
+
+    def stats(self):
+        """
+        Return the :py:class:`CoalescerStats` of the requests so far.
+        """
+        with self._lock:
+            return CoalescerStats(
+                self._requests, self._hits, len(self._calls),
+                self._wait_time,
+            )
+
+
+class _Call:
+    __slots__ = ('done', 'response', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
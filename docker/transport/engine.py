@@ -0,0 +1,161 @@
+import json
+import urllib.parse
+
+import requests
+import urllib3
+
+from .basehttpadapter import BaseHTTPAdapter
+
+
+class RequestsEngine:
+    """
+    Sends requests through the :py:class:`~docker.api.client.APIClient`'s
+    ``requests`` session. This is the default engine.
+    """
+    def __init__(self, client):
+        self.client = client
+
+    def request(self, method, url, **kwargs):
+        return getattr(self.client, method.lower())(url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class Urllib3Engine(RequestsEngine):
+    """
+    Sends requests straight to the connection pools of ``urllib3``,
+    skipping the hooks, cookies, proxy resolution and request preparation
+    of ``requests``. The responses are read completely and returned as
+    :py:class:`Response` objects.
+
+    Only plain HTTP connections to the daemon are handled, whether over a
+    UNIX socket, TCP, SSH or a named pipe. Streamed requests, uploads from
+    iterators and TLS connections go through ``requests``, like with
+    :py:class:`RequestsEngine`.
+
+    Example:
+
+        >>> from docker.transport import Urllib3Engine
+        >>> client = docker.APIClient(engine=Urllib3Engine)
+    """
+    def __init__(self, client):
+        super().__init__(client)
+        self._adapter = getattr(client, '_custom_adapter', None)
+        self._pool = None
+        if not isinstance(self._adapter, BaseHTTPAdapter):
+            self._adapter = None
+            if client.base_url.startswith('http://'):
+                self._pool = urllib3.connection_from_url(client.base_url)
+
+    @property
+    def pool(self):
+        """
+        The connection pool requests are sent to, or ``None`` if they go
+        through ``requests``.
+        """
+        if self._adapter is not None:
+            # The adapter may replace its pools, so don't keep them around
+            return self._adapter.get_connection(self.client.base_url)
+        return self._pool
+
+    def request(self, method, url, params=None, data=None, headers=None,
+                timeout=None, stream=False, **kwargs):
+        pool = self.pool
+        if (pool is None or stream or kwargs or
+                not isinstance(data, (str, bytes, type(None)))):
+            return super().request(
+                method, url, params=params, data=data, headers=headers,
+                timeout=timeout, stream=stream, **kwargs
+            )
+
+        path = urllib.parse.urlsplit(url)
+        target = path.path
+        query = _encode_params(params)
+        if path.query or query:
+            target += '?' + '&'.join(q for q in (path.query, query) if q)
+
+        request_headers = dict(self.client.headers)
+        if headers:
+            request_headers.update(headers)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        try:
+            response = pool.urlopen(
+                method, target, body=data, headers=request_headers,
+                timeout=urllib3.Timeout(connect=timeout, read=timeout),
+                retries=False, redirect=False,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            raise _requests_error(e) from e
+        return Response(url, response)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+
+
+class Response:
+    """
+    The subset of :py:class:`requests.Response` used by the client, for a
+    response which has been read completely.
+    """
+    def __init__(self, url, response):
+        self.url = url
+        self.status_code = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self.content = response.data
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def json(self, **kwargs):
+        return json.loads(self.content, **kwargs)
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            kind = 'Client' if self.status_code < 500 else 'Server'
+            raise requests.exceptions.HTTPError(
+                f'{self.status_code} {kind} Error: {self.reason} '
+                f'for url: {self.url}', response=self
+            )
+
+    def close(self):
+        pass
+
+
+def _requests_error(error):
+    # Same as requests' HTTPAdapter, so that callers catch the same errors
+    # whatever the engine
+    if isinstance(error, urllib3.exceptions.MaxRetryError):
+        error = error.reason or error
+    if isinstance(error, urllib3.exceptions.ConnectTimeoutError) and (
+            not isinstance(error, urllib3.exceptions.NewConnectionError)):
+        return requests.exceptions.ConnectTimeout(error)
+    if isinstance(error, urllib3.exceptions.ReadTimeoutError):
+        return requests.exceptions.ReadTimeout(error)
+    if isinstance(error, urllib3.exceptions.SSLError):
+        return requests.exceptions.SSLError(error)
+    return requests.exceptions.ConnectionError(error)
+
+
+def _encode_params(params):
+    if not params:
+        return ''
+    # Same as requests: skip None values, repeat keys for lists
+    items = []
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            items.extend((key, v) for v in value)
+        else:
+            items.append((key, value))
+    return urllib.parse.urlencode(items)
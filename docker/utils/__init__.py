@@ -1,5 +1,6 @@
 
 from .build import create_archive, exclude_paths, match_tag, mkbuildcontext, tar
+from .build_context import analyze_build_context, read_dockerignore
 from .decorators import check_resource, minimum_version, update_headers
 from .utils import (
     compare_version,
@@ -0,0 +1,416 @@
+import collections
+import io
+import os
+import tarfile
+import time
+import zlib
+
+from .. import errors
+from ..constants import DEFAULT_DATA_CHUNK_SIZE
+from .build import PatternMatcher
+
+# Files at least this big are preallocated before being extracted
+PREALLOCATE_THRESHOLD = 1024 * 1024
+WRITE_BLOCK_SIZE = 64 * 1024
+
+
+def stream_archive(paths, exclude=None, gzip=False,
+                   chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+    """
+    Generate a tar archive of local files and directories on the fly.
+
+    Unlike :py:func:`~docker.utils.build.create_archive`, the archive is
+    never materialized in memory or on disk: tar headers and file contents
+    are produced as the generator is consumed, so memory usage stays bounded
+    by ``chunk_size`` regardless of the size of the files being archived.
+
+    Args:
+        paths (str or list): Local files or directories to archive. Each one
+            is stored in the archive under its base name.
+        exclude (list): ``.dockerignore``-style patterns of paths to leave
+            out, matched relative to each directory in ``paths``.
+        gzip (bool): Compress the archive with gzip.
+        chunk_size (int): Size of the chunks yielded by the generator.
+            Default: 2 MB
+
+    Returns:
+        (generator): Chunks of tar data of ``chunk_size`` bytes, except for
+        the last one which may be shorter.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    writer = _ChunkWriter(chunk_size, gzip)
+    # The TarFile is only used to build TarInfo objects (and to keep track
+    # of hard links); nothing is ever written to it.
+    factory = tarfile.open(mode='w', fileobj=io.BytesIO())
+
+    for path, arcname in _archive_members(paths, exclude or []):
+        info = factory.gettarinfo(path, arcname=arcname)
+        if info is None:
+            # Sockets can't be archived
+            continue
+        # Workaround https://bugs.python.org/issue32713
+        if info.mtime < 0 or info.mtime > 8**11 - 1:
+            info.mtime = int(info.mtime)
+
+        yield from writer.write(
+            info.tobuf(factory.format, factory.encoding, factory.errors)
+        )
+        if info.isreg():
+            yield from _write_file_contents(writer, path, info.size)
+
+    yield from writer.write(tarfile.NUL * (tarfile.BLOCKSIZE * 2))
+    remainder = writer.offset % tarfile.RECORDSIZE
+    if remainder:
+        yield from writer.write(
+            tarfile.NUL * (tarfile.RECORDSIZE - remainder)
+        )
+    yield from writer.close()
+
+
+def _archive_members(paths, exclude):
+    for path in paths:
+        root = os.path.abspath(path)
+        base = os.path.basename(root.rstrip(os.path.sep))
+        pm = PatternMatcher(list(exclude))
+        if pm.matches(base):
+            continue
+        yield root, base
+        if not os.path.isdir(root) or os.path.islink(root):
+            continue
+        for relpath in sorted(pm.walk(root)):
+            yield os.path.join(root, relpath), os.path.join(base, relpath)
+
+
+def _write_file_contents(writer, path, size):
+    remaining = size
+    try:
+        with open(path, 'rb') as f:
+            while remaining > 0:
+                data = f.read(min(writer.chunk_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield from writer.write(data)
+    except OSError as oe:
+        raise OSError(f'Can not read file: {path}') from oe
+    if remaining:
+        raise OSError(f'File changed size while being archived: {path}')
+
+    remainder = size % tarfile.BLOCKSIZE
+    if remainder:
+        yield from writer.write(
+            tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
+        )
+
+
+class _ChunkWriter:
+    """
+    Accumulate (optionally gzip-compressed) data and hand it out in chunks of
+    a fixed size.
+    """
+    def __init__(self, chunk_size, gzip=False):
+        self.chunk_size = chunk_size or DEFAULT_DATA_CHUNK_SIZE
+        # Number of uncompressed bytes written so far
+        self.offset = 0
+        self._buf = bytearray()
+        self._compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        ) if gzip else None
+
+    def write(self, data):
+        self.offset += len(data)
+        if self._compressor:
+            data = self._compressor.compress(data)
+        self._buf += data
+        while len(self._buf) >= self.chunk_size:
+            chunk = bytes(self._buf[:self.chunk_size])
+            del self._buf[:self.chunk_size]
+            yield chunk
+
+    def close(self):
+        if self._compressor:
+            self._buf += self._compressor.flush()
+        while self._buf:
+            chunk = bytes(self._buf[:self.chunk_size])
+            del self._buf[:self.chunk_size]
+            yield chunk
+
+
+def extract_archive(chunks, dest_dir, progress=None,
+                    chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+    """
+    Extract a tar archive to the local filesystem while it is being received.
+
+    Members are written to disk as soon as their data arrives, so neither the
+    archive nor any of its files are ever held in memory or in a temporary
+    file. Members that would end up outside of ``dest_dir`` (through absolute
+    paths, ``..`` components or links) are rejected.
+
+    Args:
+        chunks (iterable): The raw (uncompressed) tar data, as an iterable of
+            bytes.
+        dest_dir (str): The local folder to extract the archive into.
+        progress (callable): Called as ``progress(name, written, size)``
+            while the content of each regular file is being written.
+        chunk_size (int): Maximum amount of file data buffered before it is
+            written to disk. Default: 2 MB
+
+    Returns:
+        (list): The names of the extracted members.
+
+    Raises:
+        :py:class:`docker.errors.UnsafeArchivePath`
+            If a member would be extracted outside of ``dest_dir``.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    dest_dir = os.path.realpath(dest_dir)
+    names = []
+    directories = []
+    reader = io.BufferedReader(_ChunkReader(chunks))
+    with tarfile.open(mode='r|', fileobj=reader) as t:
+        for member in t:
+            target = _safe_target(dest_dir, member.name)
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+                directories.append((target, member))
+            elif member.isreg():
+                _remove_link(target)
+                _extract_file(
+                    t.extractfile(member), member, target, progress,
+                    chunk_size or DEFAULT_DATA_CHUNK_SIZE
+                )
+                _set_attributes(target, member)
+            elif member.issym():
+                if os.path.isabs(member.linkname):
+                    raise errors.UnsafeArchivePath(
+                        f'Refusing to extract {member.name!r}: absolute '
+                        f'link to {member.linkname!r}'
+                    )
+                _safe_target(
+                    dest_dir,
+                    os.path.join(os.path.dirname(member.name), member.linkname)
+                )
+                _remove_link(target)
+                os.symlink(member.linkname, target)
+            elif member.islnk():
+                source = _safe_target(dest_dir, member.linkname)
+                _remove_link(target)
+                os.link(source, target)
+            else:
+                # Devices and FIFOs can't be created without privileges and
+                # are of no use outside of the container.
+                continue
+            names.append(member.name)
+
+    # Directory attributes are set last so that extracting their content
+    # doesn't change their modification time.
+    for target, member in reversed(directories):
+        _set_attributes(target, member)
+    return names
+
+
+def _safe_target(dest_dir, name):
+    # Resolve links in the parent folders, but not in the final component:
+    # members replace existing links instead of writing through them.
+    parent, base = os.path.split(name.lstrip('/'))
+    target = os.path.normpath(os.path.join(
+        os.path.realpath(os.path.join(dest_dir, parent)), base
+    ))
+    if os.path.commonpath([dest_dir, target]) != dest_dir:
+        raise errors.UnsafeArchivePath(
+            f'Refusing to extract {name!r} outside of {dest_dir}'
+        )
+    return target
+
+
+def _remove_link(target):
+    # Never write through a symlink left by a previous member
+    if os.path.islink(target):
+        os.unlink(target)
+
+
+def _extract_file(src, member, target, progress, chunk_size):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(target, flags, 0o600)
+    try:
+        if member.size >= PREALLOCATE_THRESHOLD and \
+                hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, member.size)
+            except OSError:
+                # Not supported by every filesystem; writing will still work
+                pass
+
+        written = 0
+        pending = []
+        pending_size = 0
+        while True:
+            data = src.read(min(WRITE_BLOCK_SIZE, chunk_size))
+            if data:
+                pending.append(data)
+                pending_size += len(data)
+            if pending and (not data or pending_size >= chunk_size):
+                _write_buffers(fd, pending)
+                written += pending_size
+                pending = []
+                pending_size = 0
+                if progress:
+                    progress(member.name, written, member.size)
+            if not data:
+                break
+    finally:
+        os.close(fd)
+
+
+def _write_buffers(fd, buffers):
+    if not hasattr(os, 'writev'):
+        for data in buffers:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        return
+
+    while buffers:
+        n = os.writev(fd, buffers)
+        # Drop the buffers (or parts of buffers) that were written
+        while n:
+            if n >= len(buffers[0]):
+                n -= len(buffers.pop(0))
+            else:
+                buffers[0] = memoryview(buffers[0])[n:]
+                n = 0
+
+
+def _set_attributes(target, member):
+    os.chmod(target, member.mode & 0o777)
+    os.utime(target, (member.mtime, member.mtime))
+
+
+class _ChunkReader(io.RawIOBase):
+    """
+    A readable file-like object over an iterable of bytes.
+    """
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._current = memoryview(b'')
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._current:
+            try:
+                self._current = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._current))
+        b[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+
+
+class TransferResult(collections.namedtuple(
+        'TransferResult', 'bytes_written,seconds')):
+    """
+    The outcome of a download saved to a file, with the properties
+    ``bytes_written`` and ``seconds``.
+    """
+    __slots__ = ()
+
+    @property
+    def throughput(self):
+        """
+        The average transfer rate, in bytes per second.
+        """
+        if not self.seconds:
+            return float(self.bytes_written)
+        return self.bytes_written / self.seconds
+
+
+def save_stream(raw, dest, chunk_size=DEFAULT_DATA_CHUNK_SIZE, fsync=False):
+    """
+    Save the body of a streamed HTTP response to a file.
+
+    The data is read with ``readinto`` into a single reusable buffer, so no
+    new bytes object is handed over per chunk. The body is not decoded, so
+    the file holds exactly what the server sent.
+
+    Args:
+        raw: The raw response (a ``urllib3`` or ``http.client`` response).
+        dest (str, int or file): A path to write to, an open file descriptor
+            or a writable file-like object.
+        chunk_size (int): Size of the buffer used for reading. Default: 2 MB
+        fsync (bool or int): ``True`` to flush the data to disk once the
+            transfer is done, or a number of bytes after which the data is
+            flushed to disk periodically. Default: ``False``
+
+    Returns:
+        (:py:class:`TransferResult`): The number of bytes written and the
+        time it took.
+    """
+    # Both urllib3 and http.client responses handle the chunked transfer
+    # encoding in readinto()
+    buf = bytearray(chunk_size or DEFAULT_DATA_CHUNK_SIZE)
+    view = memoryview(buf)
+
+    sink = _FileSink(dest)
+    start = time.monotonic()
+    written = 0
+    since_sync = 0
+    try:
+        while True:
+            n = raw.readinto(view)
+            if not n:
+                break
+            sink.write(view[:n])
+            written += n
+            since_sync += n
+            if fsync and fsync is not True and since_sync >= fsync:
+                sink.fsync()
+                since_sync = 0
+        if fsync:
+            sink.fsync()
+    finally:
+        sink.close()
+    return TransferResult(written, time.monotonic() - start)
+
+
+class _FileSink:
+    def __init__(self, dest):
+        self._file = None
+        self._fd = None
+        self._close = False
+        if isinstance(dest, int):
+            self._fd = dest
+        elif isinstance(dest, (str, bytes, os.PathLike)):
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | \
+                getattr(os, 'O_BINARY', 0)
+            self._fd = os.open(dest, flags, 0o666)
+            self._close = True
+        else:
+            self._file = dest
+
+    def write(self, view):
+        if self._file is not None:
+            self._file.write(view)
+            return
+        while view:
+            view = view[os.write(self._fd, view):]
+
+    def fsync(self):
+        if self._file is not None:
+            self._file.flush()
+            try:
+                fd = self._file.fileno()
+            except (AttributeError, OSError):
+                # In-memory file objects have nothing to sync
+                return
+        else:
+            fd = self._fd
+        os.fsync(fd)
+
+    def close(self):
+        if self._close:
+            os.close(self._fd)
@@ -1,8 +1,11 @@
 import io
 import os
 import re
+import stat
 import tarfile
 import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from ..constants import IS_WINDOWS_PLATFORM
 from .fnmatch import fnmatch
@@ -13,13 +16,17 @@ _TAG = re.compile(
     r"(?::[0-9]+)?(/[a-z0-9]+((\.|_|__|-+)[a-z0-9]+)*)*"
     r"(:[a-zA-Z0-9_][a-zA-Z0-9._-]{0,127})?$"
 )
+# Files up to this size are read ahead of the archive when it is made by
+# several workers, larger ones are only hinted to the kernel
+PREFETCH_SIZE = 256 * 1024
 
 
 def match_tag(tag: str) -> bool:
     return bool(_TAG.match(tag))
 
 
-def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False):
+def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False,
+        workers=None):
     root = os.path.abspath(path)
     exclude = exclude or []
     dockerfile = dockerfile or (None, None)
@@ -34,7 +41,8 @@ def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False):
         ]
     return create_archive(
         files=sorted(exclude_paths(root, exclude, dockerfile=dockerfile[0])),
-        root=root, fileobj=fileobj, gzip=gzip, extra_files=extra_files
+        root=root, fileobj=fileobj, gzip=gzip, extra_files=extra_files,
+        workers=workers,
     )
 
 
@@ -68,7 +76,7 @@ def build_file_list(root):
 
 
 def create_archive(root, files=None, fileobj=None, gzip=False,
-                   extra_files=None):
+                   extra_files=None, workers=None):
     extra_files = extra_files or []
     if not fileobj:
         fileobj = tempfile.NamedTemporaryFile()
@@ -76,38 +84,14 @@ def create_archive(root, files=None, fileobj=None, gzip=False,
     if files is None:
         files = build_file_list(root)
     extra_names = {e[0] for e in extra_files}
-    for path in files:
-        if path in extra_names:
-            # Extra files override context files with the same name
-            continue
-        full_path = os.path.join(root, path)
-
-        i = t.gettarinfo(full_path, arcname=path)
-        if i is None:
-            # This happens when we encounter a socket file. We can safely
-            # ignore it and proceed.
-            continue
-
-        # Workaround https://bugs.python.org/issue32713
-        if i.mtime < 0 or i.mtime > 8**11 - 1:
-            i.mtime = int(i.mtime)
-
-        if IS_WINDOWS_PLATFORM:
-            # Windows doesn't keep track of the execute bit, so we make files
-            # and directories executable by default.
-            i.mode = i.mode & 0o755 | 0o111
-
-        if i.isfile():
-            try:
-                with open(full_path, 'rb') as f:
-                    t.addfile(i, f)
-            except OSError as oe:
-                raise OSError(
-                    f'Can not read file in context: {full_path}'
-                ) from oe
-        else:
-            # Directories, FIFOs, symlinks... don't need to be read.
-            t.addfile(i, None)
+    files = [path for path in files if path not in extra_names]
+    if workers and workers > 1:
+        with ThreadPoolExecutor(workers) as executor:
+            for path, data in _prefetch(root, files, executor, workers * 4):
+                _add_to_archive(t, root, path, data)
+    else:
+        for path in files:
+            _add_to_archive(t, root, path)
 
     for name, contents in extra_files:
         info = tarfile.TarInfo(name)
@@ -120,6 +104,85 @@ def create_archive(root, files=None, fileobj=None, gzip=False,
     return fileobj
 
 
+def _add_to_archive(t, root, path, data=None):
+    full_path = os.path.join(root, path)
+
+    i = t.gettarinfo(full_path, arcname=path)
+    if i is None:
+        # This happens when we encounter a socket file. We can safely
+        # ignore it and proceed.
+        return
+
+    # Workaround https://bugs.python.org/issue32713
+    if i.mtime < 0 or i.mtime > 8**11 - 1:
+        i.mtime = int(i.mtime)
+
+    if IS_WINDOWS_PLATFORM:
+        # Windows doesn't keep track of the execute bit, so we make files
+        # and directories executable by default.
+        i.mode = i.mode & 0o755 | 0o111
+
+    if i.isfile():
+        if data is not None and len(data) == i.size:
+            t.addfile(i, io.BytesIO(data))
+            return
+        try:
+            with open(full_path, 'rb') as f:
+                t.addfile(i, f)
+        except OSError as oe:
+            raise OSError(
+                f'Can not read file in context: {full_path}'
+            ) from oe
+    else:
+        # Directories, FIFOs, symlinks... don't need to be read.
+        t.addfile(i, None)
+
+
+def _prefetch(root, files, executor, window):
+    """
+    Stat and read the files ahead of the archive on a thread pool, at most
+    ``window`` files ahead, and generate ``(path, data)`` in order. ``data``
+    is the content of a small regular file, or ``None``.
+
+    The TarInfo of each file is still made in order, as hard links depend
+    on the files archived before them, so that the archive is the same as
+    without prefetching.
+    """
+    pending = deque()
+    for path in files:
+        pending.append(
+            (path, executor.submit(_prefetch_file, root, path))
+        )
+        if len(pending) >= window:
+            path, future = pending.popleft()
+            yield path, future.result()
+    while pending:
+        path, future = pending.popleft()
+        yield path, future.result()
+
+
+def _prefetch_file(root, path):
+    full_path = os.path.join(root, path)
+    try:
+        st = os.lstat(full_path)
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        if st.st_size <= PREFETCH_SIZE:
+            with open(full_path, 'rb') as f:
+                return f.read(PREFETCH_SIZE + 1)
+        if hasattr(os, 'posix_fadvise'):
+            # Have the kernel start reading larger files
+            fd = os.open(full_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+    except OSError:
+        # Archiving the file will report the error
+        pass
+    return None
+
+
 def mkbuildcontext(dockerfile):
     f = tempfile.NamedTemporaryFile()
     t = tarfile.open(mode='w', fileobj=f)
@@ -164,12 +227,19 @@ class PatternMatcher:
         self.patterns.append(Pattern('!.dockerignore'))
 
     def matches(self, filepath):
-        matched = False
+        matching = self.matching(filepath)
+        return bool(matching) and not matching[-1].exclusion
+
+    def matching(self, filepath):
+        """
+        Return the patterns matching a path, in order. The last one decides
+        whether the path is excluded.
+        """
+        matching = []
         parent_path = os.path.dirname(filepath)
         parent_path_dirs = split_path(parent_path)
 
         for pattern in self.patterns:
-            negative = pattern.exclusion
             match = pattern.match(filepath)
             if not match and parent_path != '':
                 if len(pattern.dirs) <= len(parent_path_dirs):
@@ -178,9 +248,21 @@ class PatternMatcher:
                     )
 
             if match:
-                matched = not negative
-
-        return matched
+                matching.append(pattern)
+
+        return matching
+
+    def skips(self, dirpath):
+        """
+        Return whether an excluded directory can be skipped, because no
+        exclusion pattern (e.g. ``!dir/file``) may match paths inside it.
+        """
+        for pat in self.patterns:
+            if not pat.exclusion:
+                continue
+            if pat.cleaned_pattern.startswith(normalize_slashes(dirpath)):
+                return False
+        return True
 
     def walk(self, root):
         def rec_walk(current_dir):
@@ -198,22 +280,8 @@ class PatternMatcher:
                 if not os.path.isdir(cur) or os.path.islink(cur):
                     continue
 
-                if match:
-                    # If we want to skip this file and it's a directory
-                    # then we should first check to see if there's an
-                    # excludes pattern (e.g. !dir/file) that starts with this
-                    # dir. If so then we can't skip this dir.
-                    skip = True
-
-                    for pat in self.patterns:
-                        if not pat.exclusion:
-                            continue
-                        if pat.cleaned_pattern.startswith(
-                                normalize_slashes(fpath)):
-                            skip = False
-                            break
-                    if skip:
-                        continue
+                if match and self.skips(fpath):
+                    continue
                 yield from rec_walk(cur)
 
         return rec_walk(root)
@@ -221,6 +289,7 @@ class PatternMatcher:
 
 class Pattern:
     def __init__(self, pattern_str):
+        self.pattern = pattern_str
         self.exclusion = False
         if pattern_str.startswith('!'):
             self.exclusion = True
@@ -0,0 +1,253 @@
+import heapq
+import os
+import stat
+import zlib
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .build import PatternMatcher
+
+# Bytes read from each file sampled to estimate the compressed size
+SAMPLE_CHUNK = 64 * 1024
+TAR_BLOCK = 512
+TAR_RECORD = 20 * TAR_BLOCK
+
+
+class ContextReport(namedtuple('ContextReport', [
+        'total_bytes', 'total_files', 'excluded_bytes', 'excluded_files',
+        'largest_files', 'largest_dirs', 'rules', 'unused_rules',
+        'archive_size', 'compressed_size'])):
+    """
+    What a build context is made of, as returned by
+    :py:func:`analyze_build_context`, with the properties:
+
+    - ``total_bytes`` and ``total_files``: the size and number of the
+      regular files sent to the daemon.
+    - ``excluded_bytes`` and ``excluded_files``: those of the files left
+      out by ``.dockerignore``.
+    - ``largest_files`` and ``largest_dirs``: lists of ``(path, size)`` of
+      the largest files and directories sent, largest first.
+    - ``rules``: a list of :py:class:`RuleStats`, one for each rule of
+      ``.dockerignore``, in order.
+    - ``unused_rules``: the rules which did not match any path.
+    - ``archive_size``: the approximate size of the tar archive of the
+      context.
+    - ``compressed_size``: the estimated size of the archive once
+      compressed with gzip, or ``None`` if not estimated.
+    """
+    __slots__ = ()
+
+
+class RuleStats(namedtuple('RuleStats', 'rule,files,bytes,largest')):
+    """
+    What a ``.dockerignore`` rule decided, with the properties ``rule``,
+    ``files`` and ``bytes`` (the number and size of the files the rule
+    excluded, or included back for a ``!`` rule) and ``largest`` (a list of
+    ``(path, size)`` of the largest of those files).
+    """
+    __slots__ = ()
+
+
+def read_dockerignore(path):
+    """
+    Return the rules of the ``.dockerignore`` file of a build context, or
+    ``None`` if it has none.
+    """
+    dockerignore = os.path.join(path, '.dockerignore')
+    if not os.path.exists(dockerignore):
+        return None
+    with open(dockerignore) as f:
+        return list(filter(
+            lambda x: x != '' and x[0] != '#',
+            [line.strip() for line in f.read().splitlines()]
+        ))
+
+
+def analyze_build_context(path, exclude=None, dockerfile=None, top=10,
+                          walk_excluded=True, compression=True,
+                          max_workers=8):
+    """
+    Walk a build context like :py:func:`~docker.utils.build.tar` would,
+    without archiving it, and report what it is made of.
+
+    Args:
+        path (str): The directory of the build context.
+        exclude (list): The ``.dockerignore`` rules. Default: read them from
+            the ``.dockerignore`` file of the context.
+        dockerfile (str): The path of the Dockerfile in the context, which
+            is never excluded. Default: ``Dockerfile``
+        top (int): The number of largest files and directories to report.
+        walk_excluded (bool): Walk excluded directories too, to tell how
+            much each rule excludes. Otherwise, excluded directories are
+            skipped as when building, and only counted as empty.
+            Default: ``True``
+        compression (bool): Estimate the compressed size of the context,
+            from a sample of its files. Default: ``True``
+        max_workers (int): The number of threads walking the context.
+
+    Returns:
+        (:py:class:`ContextReport`): The report.
+
+    Example:
+
+        >>> report = analyze_build_context('.')
+        >>> report.total_bytes, report.largest_dirs[:1]
+        (1337882624, [('node_modules', 1298334720)])
+        >>> report.unused_rules
+        ['*.pyc']
+    """
+    root = os.path.abspath(path)
+    if exclude is None:
+        exclude = read_dockerignore(root) or []
+    matcher = PatternMatcher(
+        list(exclude) + [f"!{dockerfile or 'Dockerfile'}"]
+    )
+    # The last two patterns always keep the Dockerfile and .dockerignore
+    rules = matcher.patterns[:-2]
+    walk = _Walk(top, rules)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = {executor.submit(
+            _scan, root, '', matcher, walk_excluded
+        )}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, subdirs = future.result()
+                walk.add(entries)
+                pending.update(
+                    executor.submit(_scan, root, subdir, matcher,
+                                    walk_excluded)
+                    for subdir in subdirs
+                )
+
+        # The archive is padded to a whole record
+        archive_size = -(-walk.archive_size // TAR_RECORD) * TAR_RECORD
+        compressed_size = None
+        if compression:
+            ratio = _compression_ratio(root, walk.included, executor)
+            compressed_size = int(archive_size * ratio)
+
+    return ContextReport(
+        total_bytes=walk.total_bytes,
+        total_files=len(walk.included),
+        excluded_bytes=walk.excluded_bytes,
+        excluded_files=walk.excluded_files,
+        largest_files=_largest(walk.largest_files),
+        largest_dirs=heapq.nlargest(
+            top, walk.dirs.items(), key=lambda item: item[1]
+        ),
+        rules=[
+            RuleStats(rule.pattern, files, size, _largest(largest))
+            for rule, (files, size, largest) in walk.rules.items()
+        ],
+        unused_rules=[
+            rule.pattern for rule in rules if rule not in walk.used
+        ],
+        archive_size=archive_size,
+        compressed_size=compressed_size,
+    )
+
+
+class _Walk:
+    """
+    The totals of a walk, updated from the main thread only.
+    """
+    def __init__(self, top, rules):
+        self.top = top
+        self.total_bytes = 0
+        self.excluded_bytes = 0
+        self.excluded_files = 0
+        self.included = []
+        self.largest_files = []
+        self.dirs = {}
+        self.rules = {rule: [0, 0, []] for rule in rules}
+        self.used = set()
+        # The end of archive blocks
+        self.archive_size = 2 * TAR_BLOCK
+
+    def add(self, entries):
+        for path, size, is_file, matching in entries:
+            self.used.update(matching)
+            excluded = bool(matching) and not matching[-1].exclusion
+            if matching and matching[-1] in self.rules:
+                stats = self.rules[matching[-1]]
+                if is_file:
+                    stats[0] += 1
+                    stats[1] += size
+                    _push(stats[2], 3, size, path)
+            if excluded:
+                if is_file:
+                    self.excluded_files += 1
+                    self.excluded_bytes += size
+                continue
+            self.archive_size += TAR_BLOCK + -(-size // TAR_BLOCK) * TAR_BLOCK
+            if not is_file:
+                continue
+            self.included.append((path, size))
+            self.total_bytes += size
+            _push(self.largest_files, self.top, size, path)
+            parent = os.path.dirname(path)
+            while parent:
+                self.dirs[parent] = self.dirs.get(parent, 0) + size
+                parent = os.path.dirname(parent)
+
+
+def _scan(root, directory, matcher, walk_excluded):
+    entries, subdirs = [], []
+    with os.scandir(os.path.join(root, directory)) as it:
+        for entry in it:
+            path = os.path.join(directory, entry.name)
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            matching = matcher.matching(path)
+            is_file = stat.S_ISREG(st.st_mode)
+            entries.append(
+                (path, st.st_size if is_file else 0, is_file, matching)
+            )
+            if not stat.S_ISDIR(st.st_mode):
+                continue
+            excluded = bool(matching) and not matching[-1].exclusion
+            if walk_excluded or not excluded or not matcher.skips(path):
+                subdirs.append(path)
+    return entries, subdirs
+
+
+def _compression_ratio(root, files, executor, sample_size=16 * 1024 ** 2):
+    if not files:
+        return 1.0
+    # Evenly spread over the context, so that it does not depend on which
+    # thread walked what
+    files = sorted(files)
+    count = min(len(files), max(sample_size // SAMPLE_CHUNK, 1))
+    sample = [files[i * len(files) // count][0] for i in range(count)]
+    raw = compressed = 0
+    for size, compressed_size in executor.map(
+            lambda path: _compress(os.path.join(root, path)), sample):
+        raw += size
+        compressed += compressed_size
+    if not raw:
+        return 1.0
+    return compressed / raw
+
+
+def _compress(path):
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(SAMPLE_CHUNK)
+    except OSError:
+        return 0, 0
+    return len(data), len(zlib.compress(data))
+
+
+def _push(heap, size, value, path):
+    if len(heap) < size:
+        heapq.heappush(heap, (value, path))
+    elif heap and value > heap[0][0]:
+        heapq.heapreplace(heap, (value, path))
+
+
+def _largest(heap):
+    return [(path, size) for size, path in sorted(heap, reverse=True)]
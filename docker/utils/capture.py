@@ -0,0 +1,185 @@
+import collections
+import io
+import os
+import tempfile
+
+from ..errors import DockerException
+
+CAPTURE_MODES = ('all', 'head', 'tail')
+
+
+class CaptureSink:
+    """
+    Collects the output of a container or an exec instance with bounded
+    memory.
+
+    Output is kept in memory up to ``max_memory`` bytes. Past that, what
+    happens depends on ``mode``:
+
+    - ``all``: everything is moved to ``spill``, and the rest of the
+      output is written there as it arrives.
+    - ``head``: only the first ``max_memory`` bytes are kept.
+    - ``tail``: only the last ``max_memory`` bytes are kept.
+
+    Pass a sink as the ``sink`` argument of
+    :py:meth:`~docker.api.container.ContainerApiMixin.logs`,
+    :py:meth:`~docker.api.exec_api.ExecApiMixin.exec_start` or
+    :py:meth:`~docker.models.containers.ContainerCollection.run` to have
+    the output written to it instead of returned as a bytestring.
+
+    Args:
+        max_memory (int): Number of bytes kept in memory. Default: 8 MB
+        spill (file): A binary file object to write the output to when
+            ``max_memory`` is exceeded in ``all`` mode. Default: a
+            temporary file, deleted when the sink is closed.
+        mode (str): One of ``all``, ``head`` or ``tail``. Default: ``all``
+
+    Attributes:
+        size (int): Number of bytes written to the sink.
+        dropped (int): Number of bytes discarded in ``head`` or ``tail``
+            mode.
+
+    Example:
+
+        >>> sink = docker.CaptureSink(mode='tail', max_memory=64 * 1024)
+        >>> client.api.logs(container, sink=sink)
+        >>> sink.getvalue()  # the last 64 kB of the logs
+    """
+    def __init__(self, max_memory=8 * 1024 * 1024, spill=None, mode='all'):
+        if mode not in CAPTURE_MODES:
+            raise DockerException(
+                f'Invalid capture mode {mode!r}, expected one of '
+                f'{", ".join(CAPTURE_MODES)}'
+            )
+        self.max_memory = max_memory
+        self.mode = mode
+        self.size = 0
+        self.dropped = 0
+        self._spill = spill
+        self._owns_spill = spill is None
+        self._spilled = False
+        self._rewound = False
+        self._chunks = collections.deque()
+        self._buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __bytes__(self):
+        return self.getvalue()
+
+    @property
+    def spilled(self):
+        """
+        ``True`` if the output no longer fits in memory and has been
+        written to the spill file.
+        """
+        return self._spilled
+
+    def write(self, data):
+        """
+        Add data to the sink.
+        """
+        if not data:
+            return
+        self.size += len(data)
+        if self._spilled:
+            if self._rewound:
+                self._spill.seek(0, os.SEEK_END)
+                self._rewound = False
+            self._spill.write(data)
+            return
+        if self.mode == 'head':
+            room = self.max_memory - self._buffered
+            if room < len(data):
+                self.dropped += len(data) - max(room, 0)
+                data = data[:max(room, 0)]
+                if not data:
+                    return
+        self._chunks.append(bytes(data))
+        self._buffered += len(data)
+        if self._buffered <= self.max_memory:
+            return
+        if self.mode == 'tail':
+            self._trim()
+        else:
+            self._spill_chunks()
+
+    def consume(self, chunks):
+        """
+        Write every chunk of an iterable to the sink.
+
+        Returns:
+            (:py:class:`CaptureSink`): The sink itself.
+        """
+        for chunk in chunks:
+            self.write(chunk)
+        return self
+
+    def getvalue(self):
+        """
+        Return the captured output. In ``all`` mode, output which has been
+        spilled to a temporary file is read back.
+
+        Raises:
+            :py:class:`docker.errors.DockerException`
+                If the output was spilled to a file given by the caller.
+        """
+        if not self._spilled:
+            return b''.join(self._chunks)
+        with self.open() as f:
+            return f.read()
+
+    def open(self):
+        """
+        Return a binary file object to read the captured output from,
+        without loading all of it in memory.
+
+        Raises:
+            :py:class:`docker.errors.DockerException`
+                If the output was spilled to a file given by the caller.
+        """
+        if not self._spilled:
+            return io.BytesIO(b''.join(self._chunks))
+        if not self._owns_spill:
+            raise DockerException(
+                'The output was written to the spill file given to the sink'
+            )
+        self._spill.flush()
+        self._spill.seek(0)
+        self._rewound = True
+        return open(self._spill.fileno(), 'rb', closefd=False)
+
+    def close(self):
+        """
+        Release the captured output, deleting the temporary spill file.
+        """
+        self._chunks.clear()
+        self._buffered = 0
+        if self._spilled and self._owns_spill:
+            self._spill.close()
+
+    def _spill_chunks(self):
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile()
+        for chunk in self._chunks:
+            self._spill.write(chunk)
+        self._chunks.clear()
+        self._buffered = 0
+        self._spilled = True
+
+    def _trim(self):
+        excess = self._buffered - self.max_memory
+        self.dropped += excess
+        self._buffered -= excess
+        while excess:
+            chunk = self._chunks[0]
+            if len(chunk) <= excess:
+                self._chunks.popleft()
+                excess -= len(chunk)
+            else:
+                self._chunks[0] = chunk[excess:]
+                excess = 0
@@ -0,0 +1,36 @@
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+
+def watch_events(events, handle, stopped, name):
+    """
+    Pass each event of a stream to ``handle`` on a daemon thread.
+
+    An error raised while reading or handling an event is logged and ends
+    the watch. Whatever the reason the stream ends, ``stopped`` is then
+    called with it, so that the watcher stops relying on events and marks
+    what it learned from them as stale.
+
+    Args:
+        events: A stream returned by ``events(decode=True)``.
+        handle (callable): Called with each event.
+        stopped (callable): Called with ``events`` once the stream ended.
+        name (str): What watches the events, for the log.
+
+    Returns:
+        (:py:class:`threading.Thread`): The thread, already started.
+    """
+    def run():
+        try:
+            for event in events:
+                handle(event)
+        except Exception:
+            log.exception(f'{name} stopped watching events')
+        finally:
+            stopped(events)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
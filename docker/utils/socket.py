@@ -1,8 +1,14 @@
+import asyncio
 import errno
 import os
 import select
+import selectors
 import socket as pysocket
+import ssl
 import struct
+import time
+
+from ..errors import DockerException
 
 try:
     from ..transport import NpipeSocket
@@ -59,6 +65,15 @@ def read(socket, n=4096):
         raise
 
 
+def write(socket, data):
+    """
+    Writes all of data to socket
+    """
+    if isinstance(socket, pysocket.SocketIO):
+        socket = socket._sock
+    socket.sendall(data)
+
+
 def read_exactly(socket, n):
     """
     Reads exactly n bytes from socket
@@ -137,7 +152,7 @@ def frames_iter_tty(socket):
         yield result
 
 
-def consume_socket_output(frames, demux=False):
+def consume_socket_output(frames, demux=False, sink=None):
     """
     Iterate through frames read from the socket and return the result.
 
@@ -148,30 +163,36 @@ def consume_socket_output(frames, demux=False):
             concatenation of all the frames. If True, the streams are
             demultiplexed, and the result is a 2-tuple where each item is the
             concatenation of frames belonging to the same stream.
+        sink (:py:class:`~docker.utils.capture.CaptureSink` or tuple):
+            Write the frames to this sink, or to a tuple of two sinks (for
+            stdout and stderr) if ``demux`` is True, and return it instead.
     """
     if demux is False:
+        if sink is not None:
+            return sink.consume(frames)
         # If the streams are multiplexed, the generator returns strings, that
         # we just need to concatenate.
         return b"".join(frames)
 
     # If the streams are demultiplexed, the generator yields tuples
-    # (stdout, stderr)
-    out = [None, None]
+    # (stdout, stderr). Collect the chunks and join them once at the end,
+    # as growing bytes objects in place is quadratic.
+    if sink is None:
+        out = ([], [])
+        add = (out[0].append, out[1].append)
+    else:
+        add = (sink[0].write, sink[1].write)
     for frame in frames:
         # It is guaranteed that for each frame, one and only one stream
         # is not None.
         assert frame != (None, None)
         if frame[0] is not None:
-            if out[0] is None:
-                out[0] = frame[0]
-            else:
-                out[0] += frame[0]
+            add[0](frame[0])
         else:
-            if out[1] is None:
-                out[1] = frame[1]
-            else:
-                out[1] += frame[1]
-    return tuple(out)
+            add[1](frame[1])
+    if sink is not None:
+        return sink
+    return tuple(b"".join(chunks) if chunks else None for chunks in out)
 
 
 def demux_adaptor(stream_id, data):
@@ -185,3 +206,390 @@ def demux_adaptor(stream_id, data):
         return (None, data)
     else:
         raise ValueError(f'{stream_id} is not a valid stream')
+
+
+class DuplexStream:
+    """
+    Reads and writes the connection of an attached container or exec
+    instance, whatever the transport.
+
+    Writes are buffered and sent without blocking. When more than
+    ``high_water`` bytes are waiting to be sent, :py:meth:`write` blocks
+    until the buffer drains, and keeps reading meanwhile, so a process
+    whose output fills up the connection cannot stall its own input. The
+    same selector is used to wait for both directions, except on SSH
+    channels, which never report being writable: their send window is
+    polled instead.
+
+    Reads return frames, tuples of the stream number (``STDOUT`` or
+    ``STDERR``) and a chunk of data. With ``tty=True`` all data is
+    reported on ``STDOUT``.
+
+    Named pipes and connections through the ``ssh`` command cannot be
+    polled, so they are read and written with blocking calls.
+
+    Args:
+        socket: A socket returned by ``attach_socket`` or
+            ``exec_start(socket=True)``.
+        tty (bool): Whether the process was started with a TTY, in which
+            case the output is not multiplexed.
+        high_water (int): Number of buffered bytes above which writes
+            block. Default: 1 MB
+    """
+    def __init__(self, socket, tty=False, high_water=1024 * 1024):
+        self.socket = socket
+        self.tty = tty
+        self.high_water = high_water
+        self._sock = _unwrap(socket)
+        self._parser = _FrameParser(tty)
+        self._out = bytearray()
+        self._eof = False
+        self._selector = None
+        if _selectable(self._sock):
+            self._sock.setblocking(False)
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._sock, selectors.EVENT_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            frame = self.read_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def write(self, data, timeout=None):
+        """
+        Send data to the process' stdin, blocking only while more than
+        ``high_water`` bytes are waiting to be sent.
+
+        Raises:
+            :py:class:`socket.timeout`
+                If the buffer did not drain in time.
+        """
+        self._out += data
+        if self._selector is None:
+            self._pump(None, False)
+            return
+        self._send()
+        deadline = _deadline(timeout)
+        while len(self._out) > self.high_water:
+            self._pump(deadline, True)
+
+    def flush(self, timeout=None):
+        """
+        Block until all the buffered data has been sent.
+        """
+        deadline = _deadline(timeout)
+        while self._out:
+            self._pump(deadline, True)
+
+    def close_write(self, timeout=None):
+        """
+        Send the buffered data, then close the process' stdin. Its output
+        can still be read.
+        """
+        self.flush(timeout)
+        if hasattr(self._sock, 'shutdown_write'):
+            # paramiko channel
+            self._sock.shutdown_write()
+        elif self._selector is not None:
+            self._sock.shutdown(pysocket.SHUT_WR)
+
+    def read_frame(self, timeout=None):
+        """
+        Read the next frame of output, sending buffered data while waiting.
+
+        Returns:
+            (tuple): The stream number and a chunk of data, or ``None`` at
+                the end of the output.
+
+        Raises:
+            :py:class:`socket.timeout`
+                If no data arrived in time.
+        """
+        deadline = _deadline(timeout)
+        while True:
+            frame = self._parser.next_frame()
+            if frame is not None or self._eof:
+                return frame
+            self._pump(deadline, True)
+
+    def communicate(self, input=None, timeout=None):
+        """
+        Send ``input`` to the process' stdin, close it, and read the output
+        until its end.
+
+        Args:
+            input (bytes, iterable or file): The data to send, as bytes, an
+                iterable of bytes or a binary file object.
+            timeout (float): Maximum time to wait for each step, in seconds.
+
+        Returns:
+            (tuple): The data written to stdout and stderr.
+        """
+        for chunk in _chunks(input):
+            self.write(chunk, timeout)
+        self.close_write(timeout)
+        return _join_frames(iter(lambda: self.read_frame(timeout), None))
+
+    def close(self):
+        """
+        Close the connection.
+        """
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        self.socket.close()
+
+    def _pump(self, deadline, want_read):
+        if self._selector is None:
+            if self._out:
+                write(self.socket, bytes(self._out))
+                del self._out[:]
+            elif want_read:
+                self._received(read(self.socket, RECV_SIZE))
+            return
+
+        if getattr(self._sock, 'pending', lambda: 0)():
+            # TLS data already decrypted is invisible to the selector
+            self._recv()
+            return
+        if hasattr(self._sock, 'send_ready'):
+            self._pump_channel(deadline)
+            return
+        events = selectors.EVENT_READ if want_read else 0
+        if self._out:
+            events |= selectors.EVENT_WRITE
+        self._selector.modify(self._sock, events)
+        ready = self._selector.select(_remaining(deadline))
+        if not ready:
+            raise pysocket.timeout('timed out')
+        for _, mask in ready:
+            if mask & selectors.EVENT_WRITE:
+                self._send()
+            if mask & selectors.EVENT_READ:
+                self._recv()
+
+    def _pump_channel(self, deadline):
+        # The file descriptor of a paramiko channel only ever signals
+        # readability, so its send window is polled instead
+        if self._out and self._sock.send_ready():
+            self._send()
+            return
+        timeout = _remaining(deadline)
+        if self._out:
+            timeout = _SEND_POLL if timeout is None else min(
+                timeout, _SEND_POLL
+            )
+        if self._selector.select(timeout):
+            self._recv()
+        elif _remaining(deadline) == 0:
+            raise pysocket.timeout('timed out')
+
+    def _send(self):
+        try:
+            sent = self._sock.send(self._out[:RECV_SIZE])
+        except _WOULD_BLOCK:
+            return
+        del self._out[:sent]
+
+    def _recv(self):
+        try:
+            data = self._sock.recv(RECV_SIZE)
+        except _WOULD_BLOCK:
+            return
+        self._received(data)
+
+    def _received(self, data):
+        if data:
+            self._parser.feed(data)
+        else:
+            self._eof = True
+
+
+class AsyncDuplexStream:
+    """
+    An :py:mod:`asyncio` version of :py:class:`DuplexStream`, for UNIX and
+    TCP connections.
+
+    Writes wait until the data has been handed to the kernel, which applies
+    the backpressure of the connection.
+
+    Args:
+        socket: A socket returned by ``attach_socket`` or
+            ``exec_start(socket=True)``.
+        tty (bool): Whether the process was started with a TTY, in which
+            case the output is not multiplexed.
+    """
+    def __init__(self, socket, tty=False):
+        self.socket = socket
+        self.tty = tty
+        self._sock = _unwrap(socket)
+        if type(self._sock) is not pysocket.socket:
+            raise DockerException(
+                'Asynchronous streams need a UNIX or TCP connection'
+            )
+        self._sock.setblocking(False)
+        self._parser = _FrameParser(tty)
+        self._eof = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        frame = await self.read_frame()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    async def write(self, data):
+        """
+        Send data to the process' stdin.
+        """
+        await asyncio.get_running_loop().sock_sendall(self._sock, data)
+
+    async def close_write(self):
+        """
+        Close the process' stdin. Its output can still be read.
+        """
+        self._sock.shutdown(pysocket.SHUT_WR)
+
+    async def read_frame(self):
+        """
+        Read the next frame of output.
+
+        Returns:
+            (tuple): The stream number and a chunk of data, or ``None`` at
+                the end of the output.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            frame = self._parser.next_frame()
+            if frame is not None or self._eof:
+                return frame
+            data = await loop.sock_recv(self._sock, RECV_SIZE)
+            if data:
+                self._parser.feed(data)
+            else:
+                self._eof = True
+
+    async def communicate(self, input=None):
+        """
+        Send ``input`` to the process' stdin while reading its output, then
+        close stdin and read the output until its end.
+
+        Args:
+            input (bytes, iterable or file): The data to send, as bytes, an
+                iterable of bytes or a binary file object.
+
+        Returns:
+            (tuple): The data written to stdout and stderr.
+        """
+        async def send():
+            for chunk in _chunks(input):
+                await self.write(chunk)
+            await self.close_write()
+
+        async def receive():
+            return _join_frames([frame async for frame in self])
+
+        _, output = await asyncio.gather(send(), receive())
+        return output
+
+    def close(self):
+        """
+        Close the connection.
+        """
+        self.socket.close()
+
+
+RECV_SIZE = 64 * 1024
+
+# Interval at which the send window of a paramiko channel is polled
+_SEND_POLL = 0.05
+
+_WOULD_BLOCK = (BlockingIOError, pysocket.timeout, ssl.SSLWantReadError,
+                ssl.SSLWantWriteError)
+
+
+class _FrameParser:
+    """
+    Splits multiplexed output into frames as data arrives. Frames are
+    returned as soon as part of their payload is available.
+    """
+    def __init__(self, tty):
+        self.tty = tty
+        self._buffer = bytearray()
+        self._stream = None
+        self._remaining = 0
+
+    def feed(self, data):
+        self._buffer += data
+
+    def next_frame(self):
+        if self.tty:
+            if not self._buffer:
+                return None
+            data = bytes(self._buffer)
+            del self._buffer[:]
+            return STDOUT, data
+        while not self._remaining:
+            if len(self._buffer) < 8:
+                return None
+            self._stream, self._remaining = struct.unpack(
+                '>BxxxL', self._buffer[:8]
+            )
+            del self._buffer[:8]
+        if not self._buffer:
+            return None
+        data = bytes(self._buffer[:self._remaining])
+        del self._buffer[:len(data)]
+        self._remaining -= len(data)
+        return self._stream, data
+
+
+def _unwrap(socket):
+    if isinstance(socket, pysocket.SocketIO):
+        return socket._sock
+    return socket
+
+
+def _selectable(sock):
+    if hasattr(sock, 'recv_ready'):
+        # paramiko channel
+        return True
+    # Exclude the subprocess-backed sockets of the ssh transport
+    return (isinstance(sock, pysocket.socket) and
+            not hasattr(sock, 'proc') and sock.fileno() >= 0)
+
+
+def _deadline(timeout):
+    return None if timeout is None else time.monotonic() + timeout
+
+
+def _remaining(deadline):
+    return None if deadline is None else max(0, deadline - time.monotonic())
+
+
+def _chunks(input):
+    if input is None:
+        return
+    if isinstance(input, (bytes, bytearray, memoryview)):
+        yield input
+    elif hasattr(input, 'read'):
+        yield from iter(lambda: input.read(RECV_SIZE), b'')
+    else:
+        yield from input
+
+
+def _join_frames(frames):
+    output = {STDOUT: [], STDERR: []}
+    for stream, data in frames:
+        output.setdefault(stream, []).append(data)
+    return b''.join(output[STDOUT]), b''.join(output[STDERR])
@@ -0,0 +1,89 @@
+"""
+Measure inspect calls per second with each request engine, against a fake
+daemon listening on a UNIX socket.
+
+    python scripts/bench_engines.py [--seconds 3] [--threads 1]
+"""
+import argparse
+import http.server
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import docker
+from docker.transport import RequestsEngine, Urllib3Engine
+
+IMAGE = {
+    'Id': 'sha256:' + 'a' * 64,
+    'RepoTags': ['busybox:latest'],
+    'Config': {'Cmd': ['sh'], 'Env': ['PATH=/usr/bin:/bin'], 'Labels': {}},
+    'Size': 4261574,
+}
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps(IMAGE).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return 'unix'
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def bench(socket_path, engine, seconds, threads):
+    client = docker.APIClient(
+        base_url=f'unix://{socket_path}', version='1.44', engine=engine,
+        max_pool_size=threads,
+    )
+    deadline = time.monotonic() + seconds
+
+    def run():
+        calls = 0
+        while time.monotonic() < deadline:
+            client.inspect_image('busybox')
+            calls += 1
+        return calls
+
+    with ThreadPoolExecutor(threads) as pool:
+        calls = sum(pool.map(lambda _: run(), range(threads)))
+    client.close()
+    return calls / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--threads', type=int, default=1)
+    args = parser.parse_args()
+
+    socket_path = os.path.join(tempfile.mkdtemp(), 'docker.sock')
+    server = Server(socket_path, Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for engine in (RequestsEngine, Urllib3Engine):
+            rate = bench(socket_path, engine, args.seconds, args.threads)
+            print(f'{engine.__name__:16} {rate:10.0f} inspect calls/s')
+    finally:
+        server.shutdown()
+        os.unlink(socket_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pytest
+import requests
+
+import docker
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.errors import AdmissionTimeout
+from docker.transport.admission import AdmissionController, _endpoint
+
+URL = 'http+docker://localhost/v1.45/containers/abc/json'
+
+
+def response(status_code=200):
+    return mock.Mock(status_code=status_code)
+
+
+class AdmissionControllerTest(unittest.TestCase):
+    def test_classify(self):
+        assert AdmissionController.classify('GET') == 'read'
+        assert AdmissionController.classify('HEAD') == 'read'
+        assert AdmissionController.classify('POST') == 'write'
+        assert AdmissionController.classify('GET', stream=True) == 'stream'
+        wait_url = URL.replace('json', 'wait')
+        assert AdmissionController.classify('POST', url=URL) == 'write'
+        assert AdmissionController.classify('POST', url=wait_url) == 'wait'
+        assert AdmissionController.classify(
+            'POST', url='http://host/exec/abc/start'
+        ) == 'wait'
+        assert AdmissionController.classify(
+            'POST', stream=True, url=wait_url
+        ) == 'stream'
+
+    def test_endpoint(self):
+        assert _endpoint('GET', URL) == 'GET containers 3 json'
+        assert _endpoint('GET', URL.replace('abc/', '')) == (
+            'GET containers 2 json'
+        )
+        assert _endpoint('GET', 'http://host/volumes') == (
+            'GET volumes 1 volumes'
+        )
+
+    def test_limit(self):
+        admission = AdmissionController({'read': 2}, target_latency=60)
+        release = threading.Event()
+
+        def request():
+            with admission.admit('GET', URL) as ticket:
+                release.wait()
+                ticket.response = response()
+
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while admission.stats()['read'].queued < 3:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        stats = admission.stats()['read']
+        assert (stats.in_flight, stats.queued) == (2, 3)
+        # Other classes are not held up
+        with admission.admit('POST', URL):
+            pass
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        stats = admission.stats()['read']
+        assert (stats.in_flight, stats.queued, stats.admitted) == (0, 0, 5)
+        assert stats.max_wait_time > 0
+
+    def test_server_errors_decrease(self):
+        admission = AdmissionController(8)
+        with admission.admit('POST', URL) as ticket:
+            ticket.response = response(500)
+        assert admission.stats()['write'].limit == 5
+        with pytest.raises(requests.exceptions.ConnectionError):
+            with admission.admit('POST', URL):
+                raise requests.exceptions.ConnectionError()
+        stats = admission.stats()['write']
+        assert (stats.limit, stats.failures) == (3, 2)
+        # Client errors are not the daemon's fault
+        with pytest.raises(ValueError):
+            with admission.admit('POST', URL):
+                raise ValueError()
+        assert admission.stats()['write'].limit == 3
+
+    def test_latency(self):
+        admission = AdmissionController(8, initial_concurrency=1)
+        with mock.patch('docker.transport.admission.time') as fake_time:
+            monotonic = fake_time.monotonic
+            # Fast requests at the limit raise it
+            monotonic.side_effect = [0, 0, 100, 100.01] * 2
+            for _ in range(2):
+                with admission.admit('GET', URL) as ticket:
+                    ticket.response = response()
+            assert admission.stats()['read'].limit == 2
+            # A request much slower than usual lowers it
+            monotonic.side_effect = [200, 200, 200, 201, 201]
+            with admission.admit('GET', URL) as ticket:
+                ticket.response = response()
+        assert admission.stats()['read'].limit == 1
+
+    def test_long_poll_not_measured(self):
+        admission = AdmissionController(8, initial_concurrency=2)
+        url = URL.replace('json', 'stop')
+        with mock.patch('docker.transport.admission.time') as fake_time:
+            fake_time.monotonic.side_effect = [0, 0, 0, 300, 300]
+            with pytest.raises(requests.exceptions.ReadTimeout):
+                with admission.admit('POST', url):
+                    raise requests.exceptions.ReadTimeout()
+        stats = admission.stats()
+        assert (stats['wait'].limit, stats['wait'].failures) == (2, 1)
+        assert stats['write'].admitted == 0
+        assert stats['write'].limit == 2
+
+    def test_queue_timeout(self):
+        admission = AdmissionController(1, queue_timeout=0.01)
+        with admission.admit('GET', URL):
+            with pytest.raises(AdmissionTimeout):
+                with admission.admit('GET', URL):
+                    pass
+        assert admission.stats()['read'].rejected == 1
+
+
+class APIClientAdmissionTest(unittest.TestCase):
+    def test_requests_are_admitted(self):
+        engine = mock.Mock()
+        engine.request.return_value.status_code = 200
+        engine.request.return_value.json.return_value = {'Id': 'abc'}
+        admission = AdmissionController()
+        client = docker.APIClient(
+            version=DEFAULT_DOCKER_API_VERSION, admission=admission,
+            engine=lambda client: engine,
+        )
+        assert client.inspect_container('abc') == {'Id': 'abc'}
+        client.events()
+        engine.request.return_value.json.return_value = {'StatusCode': 0}
+        client.wait('abc')
+        stats = admission.stats()
+        assert stats['read'].admitted == 1
+        assert stats['stream'].admitted == 1
+        assert stats['write'].admitted == 0
+        assert stats['wait'].admitted == 1
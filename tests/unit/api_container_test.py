@@ -1095,6 +1095,16 @@ class CreateContainerTest(BaseAPIClientTest):
 
 
 class ContainerTest(BaseAPIClientTest):
+    def test_copy_to(self):
+        with mock.patch.object(self.client, 'put_archive') as put_archive:
+            self.client.copy_to(
+                fake_api.FAKE_CONTAINER_ID, [], '/tmp', chunk_size=1024
+            )
+        args = put_archive.call_args[0]
+        assert args[:2] == (fake_api.FAKE_CONTAINER_ID, '/tmp')
+        # The request body is generated lazily
+        assert b''.join(args[2]) == b'\0' * 10240
+
     def test_list_containers(self):
         self.client.containers(all=True)
 
@@ -1177,6 +1187,13 @@ class ContainerTest(BaseAPIClientTest):
 
         assert logs == b'Flowering Nights\n(Sakuya Iyazoi)\n'
 
+    def test_logs_demux(self):
+        with mock.patch('docker.api.client.APIClient.inspect_container',
+                        fake_inspect_container):
+            logs = self.client.logs(fake_api.FAKE_CONTAINER_ID, demux=True)
+
+        assert logs == (b'Flowering Nights\n(Sakuya Iyazoi)\n', b'')
+
     def test_logs_with_dict_instead_of_id(self):
         with mock.patch('docker.api.client.APIClient.inspect_container',
                         fake_inspect_container):
@@ -1,4 +1,8 @@
 import json
+import socket
+from unittest import mock
+
+from docker.utils.socket import DuplexStream
 
 from . import fake_api
 from .api_test import (
@@ -63,6 +67,21 @@ class ExecTest(BaseAPIClientTest):
             'Content-Type': 'application/json'
         }
 
+    def test_exec_stream(self):
+        ours, theirs = socket.socketpair()
+        with mock.patch.object(
+            self.client, '_get_raw_response_socket', return_value=ours
+        ):
+            stream = self.client.exec_stream(fake_api.FAKE_EXEC_ID, tty=True)
+
+        args = fake_request.call_args
+        assert args[0][1] == f"{url_prefix}exec/{fake_api.FAKE_EXEC_ID}/start"
+        assert json.loads(args[1]['data']) == {'Tty': True, 'Detach': False}
+        assert isinstance(stream, DuplexStream)
+        assert stream.tty
+        stream.close()
+        theirs.close()
+
     def test_exec_inspect(self):
         self.client.exec_inspect(fake_api.FAKE_EXEC_ID)
 
@@ -4,6 +4,7 @@ import pytest
 
 import docker
 from docker import auth
+from docker.image_cache import ImageCache
 
 from . import fake_api
 from .api_test import (
@@ -11,6 +12,8 @@ from .api_test import (
     BaseAPIClientTest,
     fake_request,
     fake_resolve_authconfig,
+    fake_resp,
+    response,
     url_prefix,
 )
 
@@ -203,6 +206,45 @@ class ImageTest(BaseAPIClientTest):
             timeout=DEFAULT_TIMEOUT_SECONDS
         )
 
+    def test_inspect_image_cached(self):
+        cache = self.client._image_cache = ImageCache()
+        fake_request.reset_mock()
+        self.client.inspect_image(fake_api.FAKE_IMAGE_NAME)
+        self.client.inspect_image(fake_api.FAKE_IMAGE_NAME)
+        # Tags are not trusted unless the cache is watching events
+        assert fake_request.call_count == 2
+
+        result = self.client.inspect_image(fake_api.FAKE_IMAGE_ID)
+        assert result['Id'] == fake_api.FAKE_IMAGE_ID
+        assert fake_request.call_count == 2
+
+        self.client.tag(fake_api.FAKE_IMAGE_ID, 'repo')
+        assert cache.get('inspect', fake_api.FAKE_IMAGE_ID) is None
+
+    def test_remove_image_by_tag_invalidates_cache(self):
+        cache = self.client._image_cache = ImageCache()
+        parent_id = 'sha256:' + 'b' * 64
+        cache.put('inspect', fake_api.FAKE_IMAGE_ID, {'RepoTags': ['a']})
+        cache.put('history', parent_id, [])
+
+        def request(method, url, *args, **kwargs):
+            if method == 'DELETE':
+                return response(200, [
+                    {'Untagged': 'test_image:latest'},
+                    {'Deleted': parent_id},
+                ])
+            return fake_resp(method, url, *args, **kwargs)
+
+        with mock.patch.object(fake_request, 'side_effect', request):
+            result = self.client.remove_image(fake_api.FAKE_IMAGE_NAME)
+        assert result[1] == {'Deleted': parent_id}
+        # The image which was only untagged is looked up first
+        assert fake_request.call_args_list[-2][0] == (
+            'GET', f'{url_prefix}images/test_image/json'
+        )
+        assert cache.get('inspect', fake_api.FAKE_IMAGE_ID) is None
+        assert cache.get('history', parent_id) is None
+
     def test_inspect_image_undefined_id(self):
         for arg in None, '', {True: True}:
             with pytest.raises(docker.errors.NullResource) as excinfo:
@@ -345,6 +387,17 @@ class ImageTest(BaseAPIClientTest):
             timeout=DEFAULT_TIMEOUT_SECONDS
         )
 
+    def test_get_images(self):
+        self.client.get_images([fake_api.FAKE_IMAGE_ID, 'busybox:latest'])
+
+        fake_request.assert_called_with(
+            'GET',
+            f"{url_prefix}images/get",
+            params={'names': [fake_api.FAKE_IMAGE_ID, 'busybox:latest']},
+            stream=True,
+            timeout=DEFAULT_TIMEOUT_SECONDS
+        )
+
     def test_load_image(self):
         self.client.load_image('Byte Stream....')
 
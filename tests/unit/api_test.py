@@ -21,6 +21,7 @@ import urllib3
 import docker
 from docker.api import APIClient
 from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.utils.capture import CaptureSink
 
 from . import fake_api
 
@@ -81,7 +82,8 @@ def fake_delete(self, url, *args, **kwargs):
     return fake_request('DELETE', url, *args, **kwargs)
 
 
-def fake_read_from_socket(self, response, stream, tty=False, demux=False):
+def fake_read_from_socket(self, response, stream, tty=False, demux=False,
+                          sink=None):
     return b''
 
 
@@ -531,7 +533,7 @@ class TCPSocketStreamTest(unittest.TestCase):
 
         return Handler
 
-    def request(self, stream=None, tty=None, demux=None):
+    def request(self, stream=None, tty=None, demux=None, sink=None):
         assert stream is not None and tty is not None and demux is not None
         with APIClient(
                 base_url=self.address,
@@ -543,7 +545,7 @@ class TCPSocketStreamTest(unittest.TestCase):
                 url = client._url('/no-tty')
             resp = client._post(url, stream=True)
             return client._read_from_socket(
-                resp, stream=stream, tty=tty, demux=demux)
+                resp, stream=stream, tty=tty, demux=demux, sink=sink)
 
     def test_read_from_socket_tty(self):
         res = self.request(stream=True, tty=True, demux=False)
@@ -587,6 +589,88 @@ class TCPSocketStreamTest(unittest.TestCase):
         res = self.request(stream=False, tty=False, demux=True)
         assert res == (self.stdout_data, self.stderr_data)
 
+    def test_read_from_socket_no_stream_no_tty_demux_sink(self):
+        sinks = (CaptureSink(max_memory=64), CaptureSink())
+        res = self.request(stream=False, tty=False, demux=True, sink=sinks)
+        assert res is sinks
+        assert sinks[0].spilled
+        assert sinks[0].getvalue() == self.stdout_data
+        assert sinks[1].getvalue() == self.stderr_data
+
+
+class SaveRawResultTest(unittest.TestCase):
+    data = os.urandom(300000)
+
+    @classmethod
+    def setup_class(cls):
+        cls.server = socketserver.ThreadingTCPServer(
+            ('', 0), cls.get_handler_class())
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+        cls.address = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    @classmethod
+    def get_handler_class(cls):
+        data = cls.data
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-tar')
+                if self.path.endswith('/export'):
+                    self.send_header('Transfer-Encoding', 'chunked')
+                    self.end_headers()
+                    for i in range(0, len(data), 7000):
+                        chunk = data[i:i + 7000]
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                    self.wfile.write(b'0\r\n\r\n')
+                else:
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def setUp(self):
+        self.client = APIClient(
+            base_url=self.address, version=DEFAULT_DOCKER_API_VERSION
+        )
+        self.addCleanup(self.client.close)
+
+    def test_export_to_path_chunked(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'export.tar')
+            result = self.client.export_to('abc', path, chunk_size=4096)
+            with open(path, 'rb') as f:
+                assert f.read() == self.data
+        assert result.bytes_written == len(self.data)
+        assert result.throughput > 0
+
+    def test_get_image_to_file_object(self):
+        out = io.BytesIO()
+        result = self.client.get_image_to('busybox', out, fsync=100000)
+        assert out.getvalue() == self.data
+        assert result.bytes_written == len(self.data)
+
+    def test_get_image_to_fd(self):
+        with tempfile.TemporaryFile() as f:
+            self.client.get_image_to('busybox', f.fileno(), fsync=True)
+            f.seek(0)
+            assert f.read() == self.data
+
 
 class UserAgentTest(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pytest
+import requests
+
+import docker
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.transport.coalescing import RequestCoalescer
+
+
+def json_response(data):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = data
+    return response
+
+
+def run_threads(target, count):
+    results = [None] * count
+
+    def run(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class RequestCoalescerTest(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.engine = mock.Mock()
+
+        def request(method, url, **kwargs):
+            self.release.wait()
+            return json_response(b'{"Id": "abc"}')
+
+        self.engine.request.side_effect = request
+        self.coalescer = RequestCoalescer()
+        self.client = docker.APIClient(
+            version=DEFAULT_DOCKER_API_VERSION, coalescer=self.coalescer,
+            engine=lambda client: self.engine,
+        )
+
+    def wait_for_hits(self, hits):
+        deadline = time.monotonic() + 5
+        while self.coalescer.stats().hits < hits:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+    def test_concurrent_requests_are_shared(self):
+        threads, results = run_threads(
+            lambda: self.client.inspect_container('abc'), 5
+        )
+        self.wait_for_hits(4)
+        assert self.coalescer.stats().in_flight == 1
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert self.engine.request.call_count == 1
+        assert results == [{'Id': 'abc'}] * 5
+        # Every caller gets its own copy
+        assert len({id(result) for result in results}) == 5
+        stats = self.coalescer.stats()
+        assert (stats.requests, stats.hits, stats.in_flight) == (1, 4, 0)
+
+        # Nothing is cached once the request is done
+        self.client.inspect_container('abc')
+        assert self.engine.request.call_count == 2
+
+    def test_key(self):
+        assert RequestCoalescer.key('/a', {'all': 1}) != (
+            RequestCoalescer.key('/a', {'all': 0})
+        )
+        assert RequestCoalescer.key('/a', {'a': 1, 'b': 2}) == (
+            RequestCoalescer.key('/a', {'b': 2, 'a': 1})
+        )
+
+    def test_errors_are_shared(self):
+        def fail():
+            self.release.wait()
+            raise requests.exceptions.ConnectionError('refused')
+
+        send = mock.Mock(side_effect=fail)
+
+        def request():
+            with pytest.raises(requests.exceptions.ConnectionError) as exc:
+                self.coalescer.request('key', send)
+            return exc.value
+
+        threads, results = run_threads(request, 3)
+        self.wait_for_hits(2)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        assert send.call_count == 1
+        assert results[0] is results[1] is results[2]
+
+    def test_streams_are_not_shared(self):
+        self.release.set()
+        self.client._get(self.client._url('/events'), stream=True)
+        assert self.coalescer.stats().requests == 0
+        assert self.engine.request.call_count == 1
@@ -0,0 +1,133 @@
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pytest
+import requests
+import urllib3
+
+import docker
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.transport import RequestsEngine, Urllib3Engine
+from docker.transport.engine import _encode_params
+
+
+class Urllib3EngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.socket_path = os.path.join(cls.tmpdir, 'docker.sock')
+        cls.requests = []
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                cls.requests.append(
+                    (self.command, self.path, self.rfile.read(length))
+                )
+                if self.path.endswith('/wait'):
+                    time.sleep(1)
+                if self.path.endswith('/missing/json'):
+                    status, body = 404, {'message': 'No such image: missing'}
+                else:
+                    status, body = 200, {'Id': 'abc'}
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = respond
+
+            def address_string(self):
+                return 'unix'
+
+            def log_message(self, *args):
+                pass
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        cls.server = Server(cls.socket_path, Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        shutil.rmtree(cls.tmpdir)
+
+    def setUp(self):
+        del self.requests[:]
+        self.client = docker.APIClient(
+            base_url=f'unix://{self.socket_path}',
+            version=DEFAULT_DOCKER_API_VERSION, engine=Urllib3Engine
+        )
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_get(self):
+        assert self.client.inspect_image('busybox') == {'Id': 'abc'}
+        assert self.requests == [(
+            'GET',
+            f'/v{DEFAULT_DOCKER_API_VERSION}/images/busybox/json', b''
+        )]
+
+    def test_params_and_body(self):
+        self.client.create_volume('foo', labels={'a': 'b'})
+        self.client.remove_image('busybox', force=True)
+        method, path, body = self.requests[0]
+        assert method == 'POST'
+        assert json.loads(body) == {'Name': 'foo', 'Labels': {'a': 'b'}}
+        assert self.requests[1][:2] == (
+            'DELETE',
+            f'/v{DEFAULT_DOCKER_API_VERSION}/images/busybox'
+            '?force=True&noprune=False'
+        )
+
+    def test_error(self):
+        with pytest.raises(docker.errors.ImageNotFound) as excinfo:
+            self.client.inspect_image('missing')
+        assert excinfo.value.explanation == 'No such image: missing'
+        assert excinfo.value.status_code == 404
+
+    def test_timeouts(self):
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            self.client.wait('abc', timeout=0.3)
+        pool = mock.Mock()
+        pool.urlopen.side_effect = urllib3.exceptions.ConnectTimeoutError()
+        with mock.patch.object(Urllib3Engine, 'pool', pool):
+            with pytest.raises(requests.exceptions.ConnectTimeout):
+                self.client.inspect_image('busybox')
+            pool.urlopen.side_effect = urllib3.exceptions.ProtocolError()
+            with pytest.raises(requests.exceptions.ConnectionError):
+                self.client.inspect_image('busybox')
+
+    def test_stream_uses_requests(self):
+        with mock.patch.object(RequestsEngine, 'request') as request:
+            self.client._get('http+docker://localhost/foo', stream=True)
+        request.assert_called_once_with(
+            'GET', 'http+docker://localhost/foo', params=None, data=None,
+            headers=None, timeout=self.client.timeout, stream=True
+        )
+
+
+def test_encode_params():
+    assert _encode_params(None) == ''
+    assert _encode_params(
+        {'a': 1, 'b': None, 'c': ['x', 'y'], 'd': 'e f'}
+    ) == 'a=1&c=x&c=y&d=e+f'
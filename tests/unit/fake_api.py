@@ -595,6 +595,8 @@ fake_responses = {
     delete_fake_remove_image,
     f'{prefix}/{CURRENT_VERSION}/images/{FAKE_IMAGE_ID}/get':
     get_fake_get_image,
+    f'{prefix}/{CURRENT_VERSION}/images/get':
+    get_fake_get_image,
     f'{prefix}/{CURRENT_VERSION}/images/load':
     post_fake_load_image,
     f'{prefix}/{CURRENT_VERSION}/images/test_image/json':
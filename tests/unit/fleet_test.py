@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+
+from docker.errors import APIError, HostTimeout
+from docker.fleet import FleetClient, HostResult
+
+from .fake_api_client import make_fake_client
+
+
+class FleetClientTest(unittest.TestCase):
+    def setUp(self):
+        self.clients = {'a': make_fake_client(), 'b': make_fake_client()}
+        self.fleet = FleetClient(self.clients, max_workers=2)
+
+    def tearDown(self):
+        self.fleet.close()
+
+    def test_collection_call(self):
+        result = self.fleet.containers.list(filters={'label': 'app=web'})
+        assert result.ok
+        assert set(result.results) == {'a', 'b'}
+        for client in self.clients.values():
+            client.api.containers.assert_called_with(
+                all=False, before=None, filters={'label': 'app=web'},
+                limit=-1, since=None
+            )
+
+    def test_api_call(self):
+        result = self.fleet.api.version()
+        assert result.results['a'] == self.clients['a'].api.version()
+
+    def test_partial_failure(self):
+        self.clients['b'].api.version.side_effect = APIError('boom')
+        result = self.fleet.gather('api.version')
+        assert list(result.results) == ['a']
+        assert isinstance(result.errors['b'], APIError)
+        assert not result.ok
+
+    def test_run_streams_results(self):
+        release = threading.Event()
+
+        def call(client):
+            if client is self.clients['b']:
+                release.wait(5)
+            return client
+
+        results = self.fleet.run(call)
+        assert next(results) == HostResult('a', self.clients['a'], None)
+        release.set()
+        assert next(results) == HostResult('b', self.clients['b'], None)
+
+    def test_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def call(client):
+            if client is self.clients['b']:
+                release.wait(5)
+
+        start = time.monotonic()
+        result = self.fleet.gather(call, timeout=0.2)
+        assert time.monotonic() - start < 2
+        assert list(result.results) == ['a']
+        assert isinstance(result.errors['b'], HostTimeout)
+
+    def test_hosts(self):
+        result = self.fleet.gather('api.version', hosts=['b'])
+        assert list(result.results) == ['b']
+        assert not self.clients['a'].api.version.called
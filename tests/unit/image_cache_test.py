@@ -0,0 +1,134 @@
+import os
+import queue
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from docker.image_cache import ImageCache
+
+IMAGE_ID = 'sha256:' + 'a' * 64
+DIGEST_REF = 'busybox@sha256:' + 'b' * 64
+
+
+class FakeEvents:
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            yield event
+
+    def close(self):
+        self.queue.put(None)
+
+
+def image_event(action, image_id=IMAGE_ID):
+    return {'Type': 'image', 'Action': action, 'Actor': {'ID': image_id}}
+
+
+class ImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ImageCache()
+
+    def tearDown(self):
+        self.cache.close()
+
+    def watch(self):
+        events = FakeEvents()
+        client = mock.Mock()
+        client.events.return_value = events
+        self.cache.watch(client)
+        client.events.assert_called_with(
+            decode=True, filters={'type': 'image'}
+        )
+        return events
+
+    def test_resolve_id(self):
+        assert self.cache.resolve(IMAGE_ID) == IMAGE_ID
+        assert self.cache.resolve('a' * 64) == IMAGE_ID
+        assert self.cache.resolve('sha256:aaaa') is None
+
+    def test_digest_resolved_without_watching(self):
+        self.cache.add_image(DIGEST_REF, {'Id': IMAGE_ID}, 0)
+        assert self.cache.resolve(DIGEST_REF) == IMAGE_ID
+        assert self.cache.get('inspect', IMAGE_ID) == {'Id': IMAGE_ID}
+
+    def test_tag_only_resolved_while_watching(self):
+        self.cache.add_image('busybox:latest', {'Id': IMAGE_ID}, 0)
+        assert self.cache.resolve('busybox:latest') is None
+
+        events = self.watch()
+        generation = self.cache.generation
+        self.cache.add_image('busybox:latest', {'Id': IMAGE_ID}, generation)
+        assert self.cache.resolve('busybox:latest') == IMAGE_ID
+
+        self.cache.stop()
+        assert not self.cache.watching
+        assert self.cache.resolve('busybox:latest') is None
+        events.close()
+
+    def test_stop_watching_on_error(self):
+        events = self.watch()
+        generation = self.cache.generation
+        self.cache.add_image('busybox:latest', {'Id': IMAGE_ID}, generation)
+        with self.assertLogs('docker.utils.events', 'ERROR'):
+            events.queue.put('not an event')
+            deadline = time.monotonic() + 5
+            while self.cache.watching and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert not self.cache.watching
+        # Tags are resolved by the daemon again
+        assert self.cache.resolve('busybox:latest') is None
+
+    def test_stale_result_not_stored(self):
+        self.watch()
+        generation = self.cache.generation
+        self.cache.handle_event(image_event('tag'))
+        self.cache.add_image('busybox:latest', {'Id': IMAGE_ID}, generation)
+        assert self.cache.resolve('busybox:latest') is None
+        assert self.cache.get('inspect', IMAGE_ID) is None
+
+    def test_tag_event_invalidates(self):
+        self.watch()
+        self.cache.add_image(
+            'busybox:latest', {'Id': IMAGE_ID}, self.cache.generation
+        )
+        self.cache.put('history', IMAGE_ID, [])
+        self.cache.put('distribution', DIGEST_REF, {})
+        self.cache.handle_event(image_event('untag'))
+        assert self.cache.resolve('busybox:latest') is None
+        assert self.cache.get('inspect', IMAGE_ID) is None
+        assert self.cache.get('history', IMAGE_ID) is None
+        assert self.cache.get('distribution', DIGEST_REF) == {}
+
+    def test_pull_event_forgets_tags(self):
+        self.watch()
+        self.cache.add_image(
+            'busybox:latest', {'Id': IMAGE_ID}, self.cache.generation
+        )
+        self.cache.handle_event(image_event('pull', 'busybox:latest'))
+        assert self.cache.resolve('busybox:latest') is None
+        assert self.cache.get('inspect', IMAGE_ID) == {'Id': IMAGE_ID}
+
+    def test_delete_event_forgets_digests(self):
+        self.cache.add_image(DIGEST_REF, {'Id': IMAGE_ID}, 0)
+        self.cache.handle_event(image_event('delete'))
+        assert self.cache.resolve(DIGEST_REF) is None
+
+    def test_persistent(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'images.db')
+        cache = ImageCache(path)
+        cache.add_image(DIGEST_REF, {'Id': IMAGE_ID}, 0)
+        cache.close()
+
+        cache = ImageCache(path)
+        assert cache.resolve(DIGEST_REF) == IMAGE_ID
+        assert cache.get('inspect', IMAGE_ID) == {'Id': IMAGE_ID}
+        cache.close()
@@ -0,0 +1,206 @@
+import queue
+import time
+import unittest
+
+from docker.errors import APIError
+from docker.informer import Informer, Store
+
+from .fake_api_client import make_fake_api_client
+
+_CLOSED = object()
+
+
+class FakeEvents:
+    """
+    An event stream fed by the test, which ends when it is closed.
+    """
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            event = self.queue.get()
+            if event is _CLOSED:
+                return
+            yield event
+
+    def send(self, kind, action, actor_id, time_nano, **attributes):
+        self.queue.put({
+            'Type': kind, 'Action': action, 'timeNano': time_nano,
+            'Actor': {'ID': actor_id, 'Attributes': attributes},
+        })
+
+    def close(self):
+        self.queue.put(_CLOSED)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def container(container_id, status='running', project='web'):
+    return {
+        'Id': container_id, 'State': status,
+        'Labels': {'com.docker.compose.project': project},
+    }
+
+
+class StoreTest(unittest.TestCase):
+    def test_versions(self):
+        store = Store(lambda item: item['Id'])
+        assert store.upsert(container('a'), 10) == (None, container('a'))
+        # An older event does not override a newer state
+        assert store.upsert(container('a', 'exited'), 5) is None
+        assert store.delete('a', 5) is None
+        assert store.get('a') == container('a')
+        assert store.upsert(container('a'), 11) is None
+        assert store.delete('a', 12) == (container('a'), None)
+        assert len(store) == 0
+
+    def test_index(self):
+        store = Store(lambda item: item['Id'])
+        store.upsert(container('a'), 1)
+        store.add_index('project', lambda c: [
+            c['Labels']['com.docker.compose.project']
+        ])
+        store.upsert(container('b', project='db'), 2)
+        assert store.by_index('project', 'web') == [container('a')]
+        store.upsert(container('a', project='db'), 3)
+        assert store.by_index('project', 'web') == []
+        assert sorted(c['Id'] for c in store.by_index('project', 'db')) == [
+            'a', 'b'
+        ]
+        changes = store.replace([container('b', project='db')], 4)
+        assert changes == [(container('a', project='db'), None)]
+        assert store.by_index('project', 'db') == [
+            container('b', project='db')
+        ]
+
+
+class InformerTest(unittest.TestCase):
+    def setUp(self):
+        self.streams = []
+
+        def events(**kwargs):
+            stream = FakeEvents()
+            self.streams.append(stream)
+            return stream
+
+        self.containers = {'a': container('a')}
+        self.failing = False
+        self.client = make_fake_api_client({
+            'events.side_effect': events,
+            'containers.side_effect': self.list_containers,
+            'images.return_value': [{'Id': 'sha256:1'}],
+            'networks.return_value': [
+                {'Id': 'net', 'Name': 'bridge', 'Containers': {}}
+            ],
+            'volumes.return_value': {'Volumes': [{'Name': 'data'}]},
+        })
+        self.changes = []
+
+    def list_containers(self, all, filters=None):
+        if self.failing:
+            raise APIError('daemon is busy')
+        if filters:
+            return [
+                c for cid, c in self.containers.items()
+                if cid.startswith(filters['id'])
+            ]
+        return list(self.containers.values())
+
+    def start(self, **kwargs):
+        informer = Informer(self.client, **kwargs)
+        for kind in informer.kinds:
+            informer.add_handler(
+                kind,
+                on_add=lambda new, k=kind: self.changes.append(
+                    (k, 'add', new)
+                ),
+                on_update=lambda old, new, k=kind: self.changes.append(
+                    (k, 'update', new)
+                ),
+                on_delete=lambda old, k=kind: self.changes.append(
+                    (k, 'delete', old)
+                ),
+            )
+        informer.start()
+        self.addCleanup(informer.stop)
+        assert informer.wait_synced(5)
+        return informer
+
+    def test_initial_list(self):
+        informer = self.start()
+        assert informer.list('container') == [container('a')]
+        assert informer.get('image', 'sha256:1') == {'Id': 'sha256:1'}
+        assert informer.get('volume', 'data') == {'Name': 'data'}
+        assert sorted(kind for kind, _, _ in self.changes) == [
+            'container', 'image', 'network', 'volume'
+        ]
+        self.client.events.assert_called_once_with(
+            since=None, decode=True,
+            filters={'type': ['container', 'image', 'network', 'volume']}
+        )
+
+    def test_events(self):
+        informer = self.start(kinds=['container', 'image'])
+        informer.add_index('container', 'state', lambda c: [c['State']])
+        del self.changes[:]
+        events = self.streams[0]
+
+        self.containers['ab'] = container('ab', 'created')
+        events.send('container', 'create', 'ab', 30)
+        events.send('container', 'exec_start: sh', 'a', 31)
+        wait_for(lambda: informer.resource_version == 31)
+        assert self.changes == [
+            ('container', 'add', container('ab', 'created'))
+        ]
+        assert informer.resource_version == 31
+
+        self.containers['ab'] = container('ab')
+        del self.containers['a']
+        events.send('container', 'start', 'ab', 40)
+        events.send('container', 'destroy', 'a', 41)
+        events.send('image', 'pull', 'busybox', 42)
+        wait_for(lambda: len(self.changes) == 3)
+        assert ('container', 'update', container('ab')) in self.changes
+        assert ('container', 'delete', container('a')) in self.changes
+        assert informer.by_index('container', 'state', 'running') == [
+            container('ab')
+        ]
+        wait_for(lambda: self.client.images.call_count == 2)
+
+        # Exec events and deletions do not cost a request
+        filtered = [
+            call for call in self.client.containers.call_args_list
+            if call[1].get('filters')
+        ]
+        assert [call[1]['filters'] for call in filtered] == [
+            {'id': 'ab'}, {'id': 'ab'}
+        ]
+
+    def test_reconnect(self):
+        self.start(kinds=['container'], retry_interval=0)
+        self.streams[0].send('container', 'die', 'a', 1500000000123456789)
+        self.streams[0].close()
+        wait_for(lambda: len(self.streams) == 2)
+        assert self.client.events.call_args[1]['since'] == (
+            '1500000000.123456789'
+        )
+        # The containers are listed again, and "a" fetched for the event
+        wait_for(lambda: self.client.containers.call_count == 3)
+
+    def test_retry_after_errors(self):
+        informer = self.start(kinds=['container'], retry_interval=0.01)
+        self.failing = True
+        self.containers['b'] = container('b')
+        self.streams[0].send('container', 'create', 'b', 10)
+        wait_for(lambda: not informer.synced)
+        calls = self.client.containers.call_count
+        wait_for(lambda: self.client.containers.call_count > calls + 1)
+        self.failing = False
+        assert informer.wait_synced(5)
+        assert informer.get('container', 'b') == container('b')
@@ -0,0 +1,156 @@
+import json
+import unittest
+from unittest import mock
+
+import pytest
+
+from docker.errors import BuildError
+from docker.models.build_events import BuildEventParser, BuildStep
+
+from .fake_api import FAKE_IMAGE_ID
+from .fake_api_client import make_fake_client
+
+IMAGE_DIGEST = FAKE_IMAGE_ID
+IMAGE_ID = IMAGE_DIGEST.split(':')[1][:12]
+OUTPUT = [
+    {'stream': 'Step 1/3 : FROM alpine'},
+    {'stream': '\n'},
+    {'status': 'Pulling from library/alpine', 'id': 'latest'},
+    {'status': 'Downloading', 'id': 'abc',
+     'progressDetail': {'current': 1, 'total': 2}},
+    {'stream': ' ---> 3fd9065eaf02\n'},
+    {'stream': 'Step 2/3 : COPY . /src\n ---> Using cache\n'},
+    {'stream': ' ---> 8f3a1d2c\n'},
+    {'stream': 'Step 3/3 : RUN make\n'},
+    {'stream': ' ---> Running in 5f1a\n'},
+    {'stream': 'building\n'},
+    {'aux': {'ID': IMAGE_DIGEST}},
+    {'stream': 'Successfully built ' + IMAGE_ID + '\n'},
+    {'stream': 'Successfully tagged app:latest\n'},
+]
+
+
+def monotonic(*values):
+    return mock.patch(
+        'docker.models.build_events.time.monotonic', side_effect=values
+    )
+
+
+class BuildEventParserTest(unittest.TestCase):
+    def test_events(self):
+        events = []
+        parser = BuildEventParser(callback=events.append)
+        with monotonic(0, 1, 1.5, 10):
+            assert list(parser.parse(OUTPUT)) == events
+        assert [(event.type, event.text) for event in events] == [
+            ('step_start', 'Step 1/3 : FROM alpine'),
+            ('pull', 'Pulling from library/alpine'),
+            ('pull', 'Downloading'),
+            ('output', ' ---> 3fd9065eaf02'),
+            ('step_end', None),
+            ('step_start', 'Step 2/3 : COPY . /src'),
+            ('cache_hit', ' ---> Using cache'),
+            ('output', ' ---> 8f3a1d2c'),
+            ('step_end', None),
+            ('step_start', 'Step 3/3 : RUN make'),
+            ('output', ' ---> Running in 5f1a'),
+            ('output', 'building'),
+            ('image', IMAGE_DIGEST),
+            ('step_end', None),
+            ('image', IMAGE_ID),
+            ('output', 'Successfully tagged app:latest'),
+        ]
+        assert events[2].step.number == 1
+        assert events[2].data['progressDetail'] == {'current': 1, 'total': 2}
+
+        assert parser.steps == [
+            BuildStep(1, 3, 'FROM alpine', 1, False),
+            BuildStep(2, 3, 'COPY . /src', 0.5, True),
+            BuildStep(3, 3, 'RUN make', 8.5, False),
+        ]
+        assert parser.cache_hit_ratio == 1 / 3
+        assert [step.number for step in parser.slowest_steps(2)] == [3, 1]
+        assert parser.image_id == IMAGE_ID
+        assert parser.error is None
+
+    def test_error(self):
+        parser = BuildEventParser()
+        with monotonic(0, 2):
+            events = list(parser.parse([
+                {'stream': 'Step 1/1 : RUN false\n'},
+                {'stream': 'no newline'},
+                {'error': 'returned a non-zero code: 1',
+                 'errorDetail': {'code': 1}},
+            ]))
+        assert [event.type for event in events] == [
+            'step_start', 'output', 'step_end', 'error',
+        ]
+        assert parser.error == 'returned a non-zero code: 1'
+        assert parser.steps[0].duration == 2
+        assert parser.image_id is None
+
+    def test_no_steps(self):
+        parser = BuildEventParser()
+        assert list(parser.parse([{'stream': 'sha256:abcdef\n'}]))
+        assert parser.image_id == 'abcdef'
+        assert parser.cache_hit_ratio is None
+        assert parser.slowest_steps() == []
+
+
+def raw_output(chunks):
+    return iter(json.dumps(chunk) + '\r\n' for chunk in chunks)
+
+
+class ImageCollectionBuildTest(unittest.TestCase):
+    def test_build_stream(self):
+        client = make_fake_client({
+            'build.return_value': raw_output(OUTPUT),
+        })
+        parser = BuildEventParser()
+        image, logs = client.images.build(path='.', parser=parser)
+        client.api.build.assert_called_with(path='.')
+        assert image.id == FAKE_IMAGE_ID
+        assert list(logs) == OUTPUT
+        assert len(parser.steps) == 3
+
+    def test_build_log_limit(self):
+        client = make_fake_client({
+            'build.return_value': raw_output(OUTPUT),
+        })
+        image, logs = client.images.build(path='.', log_limit=2)
+        assert list(logs) == OUTPUT[-2:]
+
+    def test_build_log_limit_default(self):
+        client = make_fake_client({
+            'build.return_value': raw_output(OUTPUT),
+        })
+        with mock.patch('docker.models.images.DEFAULT_BUILD_LOG_LIMIT', 3):
+            _, logs = client.images.build(path='.')
+        assert list(logs) == OUTPUT[-3:]
+
+    def test_build_log_unlimited(self):
+        client = make_fake_client({
+            'build.return_value': raw_output(OUTPUT),
+        })
+        with mock.patch('docker.models.images.DEFAULT_BUILD_LOG_LIMIT', 3):
+            _, logs = client.images.build(path='.', log_limit=None)
+        assert list(logs) == OUTPUT
+
+    def test_build_error(self):
+        output = OUTPUT[:2] + [{'error': 'failed'}, {'stream': 'after\n'}]
+        client = make_fake_client({
+            'build.return_value': raw_output(output),
+        })
+        with pytest.raises(BuildError) as excinfo:
+            client.images.build(path='.')
+        assert excinfo.value.msg == 'failed'
+        # The rest of the output is still in the log
+        assert list(excinfo.value.build_log) == output
+
+    def test_build_without_image(self):
+        client = make_fake_client({
+            'build.return_value': raw_output([{'stream': 'hello\n'}]),
+        })
+        with pytest.raises(BuildError) as excinfo:
+            client.images.build(path='.')
+        assert excinfo.value.msg == {'stream': 'hello\n'}
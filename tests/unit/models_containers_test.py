@@ -1,3 +1,8 @@
+import os
+import socket
+import struct
+import subprocess
+import threading
 import unittest
 
 import pytest
@@ -270,6 +275,28 @@ class ContainerCollectionTest(unittest.TestCase):
         assert cm.value.exit_status == 1
         assert "some error" in cm.exconly()
 
+    def test_run_with_sink(self):
+        client = make_fake_client()
+        sink = docker.CaptureSink()
+        assert client.containers.run('alpine', sink=sink) is sink
+        assert sink.getvalue() == b'hello world\n'
+        client.api.create_container.assert_called_with(
+            image='alpine', command=None, detach=False,
+            host_config={'NetworkMode': 'default'}
+        )
+
+    def test_run_with_sink_error(self):
+        client = make_fake_client()
+        client.api.wait.return_value = {'StatusCode': 1}
+        client.api.logs.side_effect = lambda *args, sink=None, **kwargs: (
+            sink.consume([b'x' * 10, b'some error']) if sink else iter([])
+        )
+        with pytest.raises(docker.errors.ContainerError) as cm:
+            client.containers.run(
+                'alpine', sink=docker.CaptureSink(max_memory=10)
+            )
+        assert cm.value.stderr == b'some error'
+
     def test_run_with_image_object(self):
         client = make_fake_client()
         image = client.images.get(FAKE_IMAGE_ID)
@@ -688,7 +715,7 @@ class ContainerTest(unittest.TestCase):
         )
         client.api.exec_start.assert_called_with(
             FAKE_EXEC_ID, detach=False, tty=False, stream=True, socket=False,
-            demux=False,
+            demux=False, sink=None,
         )
 
     def test_exec_run_failure(self):
@@ -702,7 +729,23 @@ class ContainerTest(unittest.TestCase):
         )
         client.api.exec_start.assert_called_with(
             FAKE_EXEC_ID, detach=False, tty=False, stream=False, socket=False,
-            demux=False,
+            demux=False, sink=None,
+        )
+
+    def test_copy_from(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.copy_from('/etc', '/tmp/etc')
+        client.api.copy_from.assert_called_with(
+            FAKE_CONTAINER_ID, '/etc', '/tmp/etc'
+        )
+
+    def test_copy_to(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.copy_to(['foo', 'bar'], '/tmp', gzip=True)
+        client.api.copy_to.assert_called_with(
+            FAKE_CONTAINER_ID, ['foo', 'bar'], '/tmp', gzip=True
         )
 
     def test_export(self):
@@ -713,6 +756,22 @@ class ContainerTest(unittest.TestCase):
             FAKE_CONTAINER_ID, DEFAULT_DATA_CHUNK_SIZE
         )
 
+    def test_export_to(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.export_to('/tmp/export.tar', fsync=True)
+        client.api.export_to.assert_called_with(
+            FAKE_CONTAINER_ID, '/tmp/export.tar', fsync=True
+        )
+
+    def test_get_archive_to(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.get_archive_to('foo', '/tmp/foo.tar')
+        client.api.get_archive_to.assert_called_with(
+            FAKE_CONTAINER_ID, 'foo', '/tmp/foo.tar'
+        )
+
     def test_get_archive(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
@@ -822,3 +881,112 @@ class ContainerTest(unittest.TestCase):
         container = client.containers.get(FAKE_CONTAINER_ID)
         container.wait()
         client.api.wait.assert_called_with(FAKE_CONTAINER_ID)
+
+
+def fake_exec_shell():
+    """
+    Run a local shell behind a socket speaking the multiplexed exec
+    protocol, and return the client end.
+    """
+    ours, theirs = socket.socketpair()
+    proc = subprocess.Popen(
+        ['/bin/sh'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    lock = threading.Lock()
+
+    def pump_stdin():
+        while True:
+            data = theirs.recv(4096)
+            if not data:
+                break
+            try:
+                proc.stdin.write(data)
+                proc.stdin.flush()
+            except BrokenPipeError:
+                break
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    def pump_output(pipe, stream):
+        while True:
+            data = os.read(pipe.fileno(), 4096)
+            if not data:
+                break
+            with lock:
+                theirs.sendall(struct.pack('>BxxxL', stream, len(data)) + data)
+
+    outputs = [
+        threading.Thread(target=pump_output, args=(proc.stdout, 1)),
+        threading.Thread(target=pump_output, args=(proc.stderr, 2)),
+    ]
+    for thread in [threading.Thread(target=pump_stdin)] + outputs:
+        thread.daemon = True
+        thread.start()
+
+    def finish():
+        for thread in outputs:
+            thread.join()
+        theirs.shutdown(socket.SHUT_WR)
+        proc.wait()
+    threading.Thread(target=finish, daemon=True).start()
+    return ours
+
+
+@pytest.mark.skipif(not os.path.exists('/bin/sh'), reason='needs /bin/sh')
+class ExecSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.client = make_fake_client({
+            'exec_start.side_effect': lambda *args, **kwargs: fake_exec_shell()
+        })
+        self.container = self.client.containers.get(FAKE_CONTAINER_ID)
+
+    def test_run(self):
+        with self.container.exec_session(workdir='/tmp') as session:
+            self.client.api.exec_create.assert_called_with(
+                FAKE_CONTAINER_ID, ['/bin/sh'], stdin=True, stdout=True,
+                stderr=True, tty=False, user='', privileged=False,
+                environment=None, workdir='/tmp'
+            )
+            self.client.api.exec_start.assert_called_with(
+                FAKE_EXEC_ID, socket=True
+            )
+            assert session.run('echo hello') == (0, b'hello\n')
+            assert session.run(['printf', '%s', 'a b']) == (0, b'a b')
+            assert session.run(
+                'echo out; echo err >&2; exit 3', demux=True
+            ) == (3, (b'out\n', b'err\n'))
+            assert session.run('cat') == (0, b'')
+            assert session.run('if')[0] == 2
+            assert session.run('true') == (0, b'')
+            assert self.client.api.exec_create.call_count == 1
+
+    def test_markers_split_across_frames(self):
+        stdout = b'out\nmarker:17\nlater'
+        stderr = b'err\nmarker\n'
+        frames = [(1, stdout[i:i + 1]) for i in range(len(stdout))]
+        frames += [(2, stderr[i:i + 1]) for i in range(len(stderr))]
+        with self.container.exec_session() as session:
+            session._frames = iter(frames)
+            _, ends, exit_code = session._read_until(b'marker')
+        assert ends == {1: 3, 2: 3}
+        assert exit_code == 17
+
+    def test_isolate(self):
+        with self.container.exec_session(user='nobody') as session:
+            session.run(['ls'], isolate=True)
+        self.client.api.exec_create.assert_called_with(
+            FAKE_CONTAINER_ID, ['ls'], stdout=True, stderr=True, stdin=False,
+            tty=False, privileged=False, user='nobody', environment=None,
+            workdir=None
+        )
+
+    def test_shell_exit(self):
+        session = self.container.exec_session()
+        with pytest.raises(docker.errors.DockerException):
+            session.run('kill -9 $$')
+        assert session.closed
+        with pytest.raises(docker.errors.DockerException):
+            session.run('true')
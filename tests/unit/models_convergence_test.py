@@ -0,0 +1,263 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import pytest
+
+from docker.errors import APIError, ServiceNotConverged
+from docker.models.convergence import RolloutEvent, ServiceTracker
+from docker.models.services import Service
+
+from .fake_api_client import make_fake_client
+
+OLD_SPEC = {'ContainerSpec': {'Image': 'nginx:1.24'}}
+NEW_SPEC = {'ContainerSpec': {'Image': 'nginx:1.25'}}
+
+
+def fake_service(update_state='updating', version=12, replicas=2):
+    return {
+        'ID': 'service-id',
+        'Version': {'Index': version},
+        'Spec': {
+            'Name': 'web', 'TaskTemplate': NEW_SPEC,
+            'Mode': {'Replicated': {'Replicas': replicas}},
+        },
+        'PreviousSpec': {'Name': 'web', 'TaskTemplate': OLD_SPEC},
+        'UpdateStatus': {'State': update_state},
+    }
+
+
+def fake_task(task_id, slot, spec, state='running', desired='running'):
+    return {
+        'ID': task_id, 'Slot': slot, 'NodeID': 'node', 'Spec': spec,
+        'DesiredState': desired, 'Status': {'State': state},
+    }
+
+
+ROLLOUT = [
+    [fake_task('a', 1, OLD_SPEC), fake_task('b', 2, OLD_SPEC)],
+    [fake_task('a', 1, OLD_SPEC, desired='shutdown'),
+     fake_task('b', 2, OLD_SPEC), fake_task('c', 1, NEW_SPEC, 'starting')],
+    [fake_task('a', 1, OLD_SPEC, 'shutdown', 'shutdown'),
+     fake_task('b', 2, OLD_SPEC, 'shutdown', 'shutdown'),
+     fake_task('c', 1, NEW_SPEC), fake_task('d', 2, NEW_SPEC)],
+]
+
+
+class FakeEvents:
+    """
+    An event stream which blocks until it is closed.
+    """
+    def __init__(self, *events):
+        self.events = list(events)
+        self.ready = threading.Event()
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self.ready.wait()
+        if self.events:
+            return self.events.pop(0)
+        self.closed.wait()
+        raise StopIteration
+
+    def close(self):
+        self.closed.set()
+
+
+class ServiceTrackerTest(unittest.TestCase):
+    def make_client(self, tasks, service=None):
+        return make_fake_client({
+            'inspect_service.return_value': service or fake_service(),
+            'tasks.side_effect': tasks,
+            'events.side_effect': APIError('This node is not a manager'),
+        })
+
+    def test_polling(self):
+        client = self.make_client(ROLLOUT)
+        tracker = ServiceTracker(client, min_interval=0, max_interval=0)
+        events = []
+        state = tracker.wait('web', progress=events.append)
+        assert state.converged() and state.version == 12
+        assert sorted(state.tasks) == ['a', 'b', 'c', 'd']
+        assert client.api.tasks.call_count == 3
+        client.api.tasks.assert_called_with(filters={'service': 'service-id'})
+
+        assert events[0] == RolloutEvent(
+            'service-id', None, None, 'updating', 0, 2
+        )
+        changes = [(e.task.id, e.old, e.new) for e in events[1:]]
+        assert changes == [
+            ('a', None, 'running'), ('b', None, 'running'),
+            ('c', None, 'starting'),
+            ('a', 'running', 'shutdown'), ('b', 'running', 'shutdown'),
+            ('c', 'starting', 'running'), ('d', None, 'running'),
+        ]
+        assert events[-1].running == 2
+
+    def test_leftover_tasks(self):
+        client = self.make_client(ROLLOUT[1:])
+        tracker = ServiceTracker(client)
+        assert tracker.state('service-id') is None
+        tracker.refresh('service-id')
+        state = tracker.state('service-id')
+        assert (state.running, state.leftover) == (0, 2)
+        assert not state.converged()
+        tracker.refresh('service-id')
+        assert state.converged(version=12)
+        assert not state.converged(version=13)
+        assert not state.converged(replicas=3)
+
+    def test_events(self):
+        stream = FakeEvents(
+            {'Type': 'container', 'Actor': {'ID': 'x', 'Attributes': {}}},
+            {'Type': 'service', 'Actor': {'ID': 'service-id'}},
+        )
+
+        def tasks(filters):
+            stream.ready.set()
+            return ROLLOUT[0 if client.api.tasks.call_count == 1 else -1]
+
+        client = make_fake_client({
+            'inspect_service.return_value': fake_service(),
+            'tasks.side_effect': tasks,
+            'events.return_value': stream,
+        })
+        with ServiceTracker(client, min_interval=0, max_interval=30) as t:
+            assert t.watching
+            assert t.wait('service-id', timeout=10).converged()
+        assert not t.watching
+        assert client.api.tasks.call_count == 2
+        assert client.api.events.call_args[1]['filters'] == {
+            'type': ['service', 'node', 'container']
+        }
+
+    def test_events_applied_to_tasks(self):
+        def container_event(action, task_id, **attributes):
+            attributes.update({
+                'com.docker.swarm.service.id': 'service-id',
+                'com.docker.swarm.task.id': task_id,
+            })
+            return {
+                'Type': 'container', 'Action': action,
+                'Actor': {'ID': 'container-' + task_id,
+                          'Attributes': attributes},
+            }
+
+        stream = FakeEvents(
+            container_event('exec_start: sh', 'c'),
+            container_event('start', 'd'),
+            {'Type': 'service', 'Action': 'update', 'Actor': {
+                'ID': 'service-id', 'Attributes': {
+                    'name': 'web', 'updatestate.old': 'updating',
+                    'updatestate.new': 'completed',
+                },
+            }},
+        )
+        tasks = ROLLOUT[-1][:3] + [fake_task('d', 2, NEW_SPEC, 'starting')]
+        client = make_fake_client({
+            'inspect_service.return_value': fake_service(),
+            'tasks.return_value': tasks,
+            'events.return_value': stream,
+            'info.return_value': {'Swarm': {'NodeID': 'node'}},
+        })
+        events = []
+
+        def progress(event):
+            events.append(event)
+            stream.ready.set()
+
+        with ServiceTracker(client, min_interval=0) as tracker:
+            state = tracker.wait('service-id', timeout=10, progress=progress)
+        assert state.converged()
+        assert state.update_state == 'completed'
+        # The tasks are all on this node, so events are enough
+        assert client.api.tasks.call_count == 1
+        assert [(e.task and e.task.id, e.old, e.new) for e in events[5:]] == [
+            ('d', 'starting', 'running'), (None, 'updating', 'completed'),
+        ]
+
+    def test_unknown_events_list_again(self):
+        client = self.make_client(lambda filters: ROLLOUT[0])
+        tracker = ServiceTracker(client)
+        tracker.refresh('service-id')
+        tracker._events = FakeEvents()
+        tracker._node_id = 'node'
+        assert not tracker._must_list('service-id', time.monotonic())
+        tracker.handle_event({
+            'Type': 'container', 'Action': 'create', 'Actor': {
+                'ID': 'new', 'Attributes': {
+                    'com.docker.swarm.service.id': 'service-id',
+                    'com.docker.swarm.task.id': 'new',
+                },
+            },
+        })
+        assert tracker._must_list('service-id', time.monotonic())
+        tracker.refresh('service-id')
+        assert not tracker._must_list('service-id', time.monotonic())
+        tracker.handle_event({'Type': 'node', 'Action': 'update'})
+        assert tracker._must_list('service-id', time.monotonic())
+
+    def test_rollback(self):
+        client = self.make_client(ROLLOUT)
+        client.api.inspect_service.side_effect = [
+            fake_service(), fake_service('rollback_started')
+        ]
+        tracker = ServiceTracker(client, min_interval=0, max_interval=0)
+        with pytest.raises(ServiceNotConverged) as exc:
+            tracker.wait('service-id')
+        assert exc.value.state.update_state == 'rollback_started'
+
+    def test_timeout(self):
+        client = self.make_client(lambda filters: ROLLOUT[0])
+        tracker = ServiceTracker(client, min_interval=0, max_interval=0.01)
+        with pytest.raises(ServiceNotConverged) as exc:
+            tracker.wait('service-id', timeout=0.05)
+        assert 'did not converge' in str(exc.value)
+        assert exc.value.state.leftover == 2
+
+    def test_wait_async(self):
+        client = self.make_client(ROLLOUT)
+        tracker = ServiceTracker(client, min_interval=0, max_interval=0)
+        state = asyncio.run(tracker.wait_async('service-id'))
+        assert state.running == 2
+
+    def test_wait_async_cancelled(self):
+        stream = FakeEvents()
+        client = make_fake_client({
+            'inspect_service.return_value': fake_service(),
+            'tasks.return_value': ROLLOUT[0],
+            'events.return_value': stream,
+            'info.return_value': {'Swarm': {'NodeID': 'node'}},
+        })
+        tracker = ServiceTracker(client)
+        tracker.watch()
+        self.addCleanup(tracker.close)
+
+        async def cancel():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    tracker.wait_async('service-id'), timeout=0.2
+                )
+
+        # The event loop waits for the executor thread when it closes
+        thread = threading.Thread(target=asyncio.run, args=(cancel(),))
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert tracker.watching
+
+
+class ServiceWaitConvergedTest(unittest.TestCase):
+    def test_wait_converged(self):
+        client = make_fake_client({
+            'inspect_service.return_value': fake_service(),
+            'tasks.return_value': ROLLOUT[-1],
+            'events.side_effect': APIError('This node is not a manager'),
+        })
+        service = Service(attrs=fake_service(), client=client)
+        assert service.wait_converged(timeout=1).running == 2
+        client.api.inspect_service.assert_called_once_with('service-id')
@@ -1,8 +1,16 @@
+import tempfile
+import threading
 import unittest
 import warnings
 
 from docker.constants import DEFAULT_DATA_CHUNK_SIZE
-from docker.models.images import Image
+from docker.errors import ImageNotFound
+from docker.models.images import (
+    Image,
+    LoadProgress,
+    PullProgress,
+    PullScheduler,
+)
 
 from .fake_api import FAKE_IMAGE_ID
 from .fake_api_client import make_fake_client
@@ -42,6 +50,52 @@ class ImageCollectionTest(unittest.TestCase):
         client.images.load('byte stream')
         client.api.load_image.assert_called_with('byte stream')
 
+    def test_load_from_file(self):
+        client = make_fake_client({
+            'load_image.return_value': [
+                {'status': 'Loading layer', 'id': 'abc',
+                 'progressDetail': {'current': 512, 'total': 1024}},
+                {'status': 'Loading layer', 'id': 'abc',
+                 'progressDetail': {'current': 1024, 'total': 1024}},
+                {'stream': f'Loaded image ID: {FAKE_IMAGE_ID}'},
+            ]
+        })
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b'x' * 10)
+            f.flush()
+            progress = []
+            images = client.images.load_from_file(
+                f.name, chunk_size=4, progress=progress.append
+            )
+            args, kwargs = client.api.load_image.call_args
+            assert kwargs == {'quiet': False}
+            assert list(args[0]) == [b'xxxx', b'xxxx', b'xx']
+        assert progress == [
+            LoadProgress('abc', 'Loading layer', 512, 1024),
+            LoadProgress('abc', 'Loading layer', 1024, 1024),
+        ]
+        assert [i.id for i in images] == [FAKE_IMAGE_ID]
+
+    def test_save_many(self):
+        client = make_fake_client()
+        image = client.images.get(FAKE_IMAGE_ID)
+        client.images.save_many([image, 'busybox:latest'])
+        client.api.get_images.assert_called_with(
+            [FAKE_IMAGE_ID, 'busybox:latest'], DEFAULT_DATA_CHUNK_SIZE
+        )
+
+    def test_save_many_all_tags(self):
+        client = make_fake_client()
+        image = client.images.prepare_model({
+            'Id': FAKE_IMAGE_ID,
+            'RepoTags': ['busybox:latest', 'busybox:1.0'],
+        })
+        client.images.save_many([image, 'busybox:latest', 'alpine'])
+        client.api.get_images.assert_called_with(
+            ['busybox:latest', 'busybox:1.0', 'alpine'],
+            DEFAULT_DATA_CHUNK_SIZE
+        )
+
     def test_pull(self):
         client = make_fake_client()
         image = client.images.pull('test_image:test')
@@ -83,6 +137,69 @@ class ImageCollectionTest(unittest.TestCase):
         assert isinstance(image, Image)
         assert image.id == FAKE_IMAGE_ID
 
+    def test_pull_many(self):
+        client = make_fake_client({
+            'pull.return_value': [
+                {'status': 'Pulling from library/test_image',
+                 'id': 'test'},
+                {'status': 'Pulling fs layer', 'id': 'abc',
+                 'progressDetail': {}},
+                {'status': 'Downloading', 'id': 'abc',
+                 'progressDetail': {'current': 10, 'total': 40}},
+                {'status': 'Pull complete', 'id': 'abc',
+                 'progressDetail': {}},
+            ]
+        })
+        progress = []
+        images = client.images.pull_many(
+            ['test_image:test', 'other'],
+            progress=lambda p: progress.append((p.current, p.total))
+        )
+        client.api.pull.assert_any_call(
+            'test_image', tag='test', stream=True, decode=True
+        )
+        client.api.pull.assert_any_call(
+            'other', tag='latest', stream=True, decode=True
+        )
+        assert [i.id for i in images] == [FAKE_IMAGE_ID, FAKE_IMAGE_ID]
+        assert progress[-1] == (40, 40)
+
+    def test_pull_many_skips_present_digest(self):
+        client = make_fake_client()
+        digest = 'sha256:' + 'a' * 64
+        images = client.images.pull_many([f'test_image@{digest}'])
+        client.api.inspect_image.assert_called_with(f'test_image@{digest}')
+        assert not client.api.pull.called
+        assert images[0].id == FAKE_IMAGE_ID
+
+    def test_pull_many_missing_digest(self):
+        client = make_fake_client()
+        digest = 'sha256:' + 'a' * 64
+        client.api.inspect_image.side_effect = [
+            ImageNotFound('missing'), {'Id': FAKE_IMAGE_ID},
+        ]
+        client.images.pull_many([f'test_image@{digest}'])
+        client.api.pull.assert_called_with(
+            'test_image', tag=digest, stream=True, decode=True
+        )
+
+    def test_pull_scheduler_coalesces_duplicates(self):
+        release = threading.Event()
+
+        def pull(*args, **kwargs):
+            release.wait(5)
+            return []
+
+        client = make_fake_client({'pull.side_effect': pull})
+        with PullScheduler(client.images, max_workers=2) as scheduler:
+            first = scheduler.submit('test_image')
+            second = scheduler.submit('test_image:latest')
+            third = scheduler.submit('test_image', platform='linux/arm64')
+            release.set()
+        assert first is second
+        assert third is not first
+        assert client.api.pull.call_count == 2
+
     def test_pull_with_stream_param(self):
         client = make_fake_client()
         with warnings.catch_warnings(record=True) as w:
@@ -118,6 +235,31 @@ class ImageCollectionTest(unittest.TestCase):
         client.api.search.assert_called_with('test', limit=5)
 
 
+class PullProgressTest(unittest.TestCase):
+    def test_shared_layers_counted_once(self):
+        progress = PullProgress()
+        assert not progress.update(
+            {'status': 'Pulling from library/busybox', 'id': 'latest'}
+        )
+        assert progress.update({'status': 'Pulling fs layer', 'id': 'abc'})
+        assert progress.update({'status': 'Waiting', 'id': 'def'})
+        chunk = {'status': 'Downloading', 'id': 'abc',
+                 'progressDetail': {'current': 5, 'total': 20}}
+        assert progress.update(chunk)
+        assert progress.update(chunk)
+        assert progress.update({
+            'status': 'Downloading', 'id': 'def',
+            'progressDetail': {'current': 1, 'total': 2}
+        })
+        assert not progress.update({'status': 'Digest: sha256:abc'})
+        assert not progress.update(
+            {'status': 'Downloading', 'id': 'latest'}
+        )
+        assert (progress.current, progress.total) == (6, 22)
+        assert progress.layers['abc'] == (5, 20, 'Downloading')
+        assert set(progress.layers) == {'abc', 'def'}
+
+
 class ImageTest(unittest.TestCase):
     def test_short_id(self):
         image = Image(attrs={'Id': 'sha256:b6846070672ce4e8f1f91564ea6782bd675'
@@ -168,6 +310,14 @@ class ImageTest(unittest.TestCase):
             FAKE_IMAGE_ID, DEFAULT_DATA_CHUNK_SIZE
         )
 
+    def test_save_to(self):
+        client = make_fake_client()
+        image = client.images.get(FAKE_IMAGE_ID)
+        image.save_to('/tmp/image.tar', fsync=True)
+        client.api.get_image_to.assert_called_with(
+            FAKE_IMAGE_ID, '/tmp/image.tar', fsync=True
+        )
+
     def test_tag(self):
         client = make_fake_client()
         image = client.images.get(FAKE_IMAGE_ID)
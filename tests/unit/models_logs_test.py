@@ -0,0 +1,236 @@
+import io
+import os
+import tempfile
+import unittest
+
+import pytest
+
+from docker.models.logs import (
+    FileCheckpointStore,
+    LogRecord,
+    ServiceLogRecord,
+    parse_log_details,
+    parse_timestamp,
+)
+from docker.models.services import Service
+
+from .fake_api import FAKE_CONTAINER_ID, get_fake_inspect_container
+from .fake_api_client import make_fake_client
+
+# 2024-01-02T03:04:05Z
+EPOCH = 1704164645 * 1000000000
+
+
+def line(nanoseconds, message):
+    return f'2024-01-02T03:04:05.{nanoseconds:09d}Z {message}\n'.encode()
+
+
+def stream(*frames):
+    return (frame for frame in frames)
+
+
+def inspect_states(*running):
+    """
+    Return inspect results, the first one for getting the container.
+    """
+    results = []
+    for state in (True,) + running:
+        attrs = get_fake_inspect_container()[1]
+        attrs['State']['Running'] = state
+        results.append(attrs)
+    return results
+
+
+class ParseTimestampTest(unittest.TestCase):
+    def test_fixed_width(self):
+        assert parse_timestamp(line(120, 'hello')) == (
+            EPOCH + 120, b'hello\n'
+        )
+
+    def test_other_formats(self):
+        assert parse_timestamp(b'2024-01-02T04:04:05.5+01:00 hi') == (
+            EPOCH + 500000000, b'hi'
+        )
+        assert parse_timestamp(b'2024-01-02T03:04:05Z hi') == (EPOCH, b'hi')
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_timestamp(b'hello world')
+
+
+class LogFollowerTest(unittest.TestCase):
+    def test_resume_after_disconnect(self):
+        client = make_fake_client({
+            'inspect_container.side_effect': inspect_states(True, True, False),
+            'logs.side_effect': [
+                stream((line(1, 'a'), None), (line(2, 'b'), None),
+                       (None, line(2, 'c'))),
+                stream((line(2, 'b'), None), (None, line(2, 'c')),
+                       (line(2, 'b'), None), (line(3, 'd'), None)),
+            ],
+        })
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        follower = container.follow_logs(retry_interval=0)
+        records = list(follower.records())
+        assert records == [
+            LogRecord(FAKE_CONTAINER_ID, EPOCH + 1, 'stdout', b'a'),
+            LogRecord(FAKE_CONTAINER_ID, EPOCH + 2, 'stdout', b'b'),
+            LogRecord(FAKE_CONTAINER_ID, EPOCH + 2, 'stderr', b'c'),
+            LogRecord(FAKE_CONTAINER_ID, EPOCH + 2, 'stdout', b'b'),
+            LogRecord(FAKE_CONTAINER_ID, EPOCH + 3, 'stdout', b'd'),
+        ]
+        first, second = client.api.logs.call_args_list
+        assert first[1]['since'] is None
+        assert first[1]['timestamps'] and first[1]['demux']
+        assert second[1]['since'] == (EPOCH + 2 - 1000) / 1e9
+        assert follower.checkpoint.timestamp == EPOCH + 3
+
+    def test_resume_after_stop(self):
+        states = inspect_states(False)
+        client = make_fake_client({
+            'inspect_container.side_effect': states[:1],
+            'logs.return_value': stream(
+                (line(1, 'a'), None), (line(2, 'b'), None),
+                (line(3, 'c'), None),
+            ),
+        })
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        client.api.inspect_container.side_effect = None
+        client.api.inspect_container.return_value = states[1]
+        follower = container.follow_logs(batch_size=1)
+        batches = follower.batches()
+        assert [r.message for r in next(batches)] == [b'a']
+        assert [r.message for r in next(batches)] == [b'b']
+        # The reader may have read further, but only "a" was processed
+        batches.close()
+        assert follower.checkpoint.timestamp == EPOCH + 1
+
+        client.api.logs.return_value = stream(
+            (line(1, 'a'), None), (line(2, 'b'), None),
+            (line(3, 'c'), None),
+        )
+        messages = [r.message for r in follower.records()]
+        assert messages == [b'b', b'c']
+        assert client.api.logs.call_args[1]['since'] == (
+            (EPOCH + 1 - 1000) / 1e9
+        )
+
+    def test_checkpoint_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'checkpoints.json')
+            client = make_fake_client({
+                'inspect_container.side_effect': inspect_states(True, False),
+                'logs.return_value': stream(
+                    (line(1, 'a'), None), (line(2, 'b'), None),
+                    (line(2, 'c'), None),
+                ),
+            })
+            container = client.containers.get(FAKE_CONTAINER_ID)
+            follower = container.follow_logs(
+                store=FileCheckpointStore(path), batch_size=2
+            )
+            batches = list(follower.batches())
+            assert [len(b) for b in batches] == [2, 1]
+
+            client.api.inspect_container.side_effect = inspect_states(
+                True, False
+            )
+            client.api.logs.return_value = stream(
+                (line(2, 'b'), None), (line(2, 'c'), None),
+                (line(2, 'e'), None), (line(3, 'f'), None),
+            )
+            container = client.containers.get(FAKE_CONTAINER_ID)
+            follower = container.follow_logs(store=FileCheckpointStore(path))
+            messages = [r.message for r in follower.records()]
+            assert messages == [b'e', b'f']
+            assert client.api.logs.call_args[1]['since'] == (
+                (EPOCH + 2 - 1000) / 1e9
+            )
+
+    def test_tty(self):
+        states = inspect_states(False, False)
+        states[1]['Config']['Tty'] = True
+        output = line(1, 'a') + line(2, 'b\r')[:-1]
+        client = make_fake_client({
+            'inspect_container.side_effect': states,
+            'logs.return_value': stream(
+                (output[:10], None), (output[10:], None)
+            ),
+        })
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        messages = [r.message for r in container.follow_logs().records()]
+        assert messages == [b'a', b'b\r']
+
+
+def fake_task(task_id, slot, started=True):
+    status = {'State': 'running'}
+    if started:
+        status['ContainerStatus'] = {'ContainerID': f'container-{task_id}'}
+    return {'ID': task_id, 'NodeID': f'node-{slot}', 'Slot': slot,
+            'Status': status}
+
+
+class ServiceLogReaderTest(unittest.TestCase):
+    def setUp(self):
+        task_lines = {
+            'a': [line(100000000, 'a1'), line(600000000, 'a2')],
+            'b': [line(300000000, 'b1'), line(600000000, 'b2'),
+                  line(900000000, 'b3')],
+        }
+        self.client = make_fake_client({
+            'tasks.return_value': [
+                fake_task('a', 1), fake_task('b', 2),
+                fake_task('c', 3, started=False),
+            ],
+            'task_logs.side_effect': lambda task, **kwargs: stream(
+                *((data, None) for data in task_lines[task])
+            ),
+        })
+        self.service = Service(attrs={
+            'ID': 'service-id',
+            'Spec': {'Name': 'web', 'TaskTemplate': {'ContainerSpec': {}}},
+        }, client=self.client)
+
+    def test_read_slices(self):
+        reader = self.service.log_reader(max_workers=2)
+        records = list(reader.read(
+            EPOCH / 1e9, EPOCH / 1e9 + 1, slice_seconds=0.25
+        ))
+        assert [r.message for r in records] == [
+            b'a1', b'b1', b'a2', b'b2', b'b3'
+        ]
+        assert records[0] == ServiceLogRecord(
+            'service-id', 'a', 'node-1', 1, EPOCH + 100000000, 'stdout',
+            b'a1'
+        )
+        # Four slices of two started tasks
+        assert self.client.api.task_logs.call_count == 8
+        self.client.api.tasks.assert_called_once_with(
+            filters={'service': 'service-id'}
+        )
+
+    def test_write(self):
+        out = io.BytesIO()
+        reader = self.service.log_reader()
+        assert reader.write(out, EPOCH / 1e9, EPOCH / 1e9 + 0.5) == 2
+        assert out.getvalue().splitlines() == [
+            b'2024-01-02T03:04:05.100000000Z web.1.a@node-1 | a1',
+            b'2024-01-02T03:04:05.300000000Z web.2.b@node-2 | b1',
+        ]
+
+    def test_follow(self):
+        details = (
+            b'com.docker.swarm.node.id=node-2,com.docker.swarm.service.id='
+            b'service-id,com.docker.swarm.task.id=b'
+        )
+        self.client.api.service_logs.return_value = stream(
+            (None, line(5, details.decode() + ' oops')),
+        )
+        reader = self.service.log_reader()
+        assert list(reader.follow()) == [ServiceLogRecord(
+            'service-id', 'b', 'node-2', 2, EPOCH + 5, 'stderr', b'oops'
+        )]
+        assert self.client.api.service_logs.call_args[1]['details']
+
+    def test_parse_log_details(self):
+        assert parse_log_details(b'a=1,b=x+y%2Cz') == {'a': '1', 'b': 'x y,z'}
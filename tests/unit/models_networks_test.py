@@ -1,9 +1,41 @@
 import unittest
 
+import pytest
+
+from docker.errors import NotFound
+
 from .fake_api import FAKE_CONTAINER_ID, FAKE_NETWORK_ID
 from .fake_api_client import make_fake_client
 
 
+def fake_network(network_id, name, *container_ids):
+    return {
+        'Id': network_id, 'Name': name,
+        'Containers': {
+            cid: {'IPv4Address': f'10.0.0.{i}/24'}
+            for i, cid in enumerate(container_ids, 1)
+        },
+    }
+
+
+def fake_container(container_id):
+    return {'Id': container_id, 'Name': f'/{container_id}-name'}
+
+
+def inspect_network(networks):
+    def inspect(network_id):
+        if network_id not in networks:
+            raise NotFound('No such network')
+        return networks[network_id]
+    return inspect
+
+
+def inspect_container(container_id):
+    if container_id.startswith('lb-'):
+        raise NotFound('No such container')
+    return fake_container(container_id)
+
+
 class NetworkCollectionTest(unittest.TestCase):
 
     def test_create(self):
@@ -36,6 +68,79 @@ class NetworkCollectionTest(unittest.TestCase):
         client.networks.list(names=["foobar"])
         client.api.networks.assert_called_once_with(names=["foobar"])
 
+    def test_list_greedy(self):
+        networks = {
+            'net1': fake_network('net1', 'front', 'web'),
+            'net2': fake_network('net2', 'back', 'web', 'db'),
+        }
+        client = make_fake_client({
+            'networks.return_value': [
+                {'Id': 'net1', 'Name': 'front'},
+                {'Id': 'net2', 'Name': 'back'},
+            ],
+            'inspect_network.side_effect': inspect_network(networks),
+        })
+        result = client.networks.list(greedy=True, max_workers=2)
+        assert [n.attrs for n in result] == list(networks.values())
+
+    def test_topology(self):
+        networks = {
+            'net1': fake_network('net1', 'front', 'web', 'lb-front'),
+            'net2': fake_network('net2', 'back', 'web', 'db'),
+        }
+        client = make_fake_client({
+            'networks.return_value': [
+                {'Id': 'net1', 'Name': 'front'},
+                {'Id': 'net2', 'Name': 'back'},
+                {'Id': 'net3', 'Name': 'removed'},
+            ],
+            'inspect_network.side_effect': inspect_network(networks),
+            'inspect_container.side_effect': inspect_container,
+        })
+        topology = client.networks.topology(filters={'driver': 'bridge'})
+        client.api.networks.assert_called_once_with(
+            None, None, {'driver': 'bridge'}
+        )
+        assert sorted(topology.networks) == ['net1', 'net2']
+        assert sorted(topology.containers) == ['db', 'web']
+        # Shared containers are inspected once
+        assert client.api.inspect_container.call_count == 3
+
+        assert [c.id for c in topology.containers_of('back')] == [
+            'web', 'db'
+        ]
+        assert [n.name for n in topology.networks_of('web-name')] == [
+            'front', 'back'
+        ]
+        web = topology.container('web')
+        assert topology.networks_of(web) == [
+            topology.network('net1'), topology.network('net2')
+        ]
+        assert topology.endpoint('front', web) == {
+            'IPv4Address': '10.0.0.1/24'
+        }
+        with pytest.raises(NotFound):
+            topology.endpoint('front', 'db')
+        with pytest.raises(NotFound):
+            topology.network('removed')
+
+    def test_topology_sparse(self):
+        client = make_fake_client({
+            'networks.return_value': [{'Id': 'net1', 'Name': 'front'}],
+            'inspect_network.return_value': fake_network(
+                'net1', 'front', 'web'
+            ),
+            'containers.return_value': [
+                {'Id': 'web', 'Names': ['/web-name']},
+                {'Id': 'other', 'Names': ['/other']},
+            ],
+        })
+        topology = client.networks.topology(sparse=True)
+        assert list(topology.containers) == ['web']
+        assert topology.container('web-name').id == 'web'
+        client.api.containers.assert_called_once_with(all=True)
+        client.api.inspect_container.assert_not_called()
+
 
 class NetworkTest(unittest.TestCase):
 
@@ -57,6 +162,16 @@ class NetworkTest(unittest.TestCase):
             FAKE_NETWORK_ID
         )
 
+    def test_containers(self):
+        client = make_fake_client({
+            'inspect_network.return_value': fake_network(
+                'net1', 'front', 'web', 'db'
+            ),
+            'inspect_container.side_effect': inspect_container,
+        })
+        network = client.networks.get('net1')
+        assert [c.id for c in network.containers] == ['web', 'db']
+
     def test_remove(self):
         client = make_fake_client()
         network = client.networks.get(FAKE_NETWORK_ID)
@@ -0,0 +1,219 @@
+import threading
+import time
+import unittest
+
+import pytest
+
+from docker.errors import InvalidArgument
+from docker.models.prune import _match_labels, _parse_until
+
+from .fake_api_client import make_fake_client
+
+NOW = 1700000000
+
+
+def fake_df():
+    return {
+        'Containers': [
+            {
+                'Id': 'stopped', 'State': 'exited', 'SizeRw': 100,
+                'Created': NOW - 7200, 'ImageID': 'sha256:old',
+                'Labels': {'env': 'ci'},
+                'Mounts': [{'Type': 'volume', 'Name': 'cache'}],
+                'NetworkSettings': {'Networks': {'ci': {'NetworkID': 'n1'}}},
+            },
+            {
+                'Id': 'running', 'State': 'running', 'SizeRw': 50,
+                'Created': NOW - 7200, 'ImageID': 'sha256:app',
+                'Labels': {},
+                'Mounts': [{'Type': 'volume', 'Name': 'data'}],
+                'NetworkSettings': {'Networks': {'web': {'NetworkID': 'n2'}}},
+            },
+        ],
+        'Images': [
+            {'Id': 'sha256:old', 'RepoTags': ['<none>:<none>'],
+             'Size': 1000, 'SharedSize': 400, 'Created': NOW - 7200},
+            {'Id': 'sha256:app', 'RepoTags': ['app:latest'],
+             'Size': 2000, 'SharedSize': 400, 'Created': NOW - 7200},
+            {'Id': 'sha256:base', 'RepoTags': ['base:latest'],
+             'Size': 500, 'SharedSize': -1, 'Created': NOW - 7200},
+        ],
+        'Volumes': [
+            {'Name': 'cache', 'UsageData': {'Size': 10, 'RefCount': 1},
+             'Labels': {'com.docker.volume.anonymous': ''}},
+            {'Name': 'data', 'UsageData': {'Size': 20, 'RefCount': 1},
+             'Labels': {'com.docker.volume.anonymous': ''}},
+            {'Name': 'named', 'UsageData': {'Size': 30, 'RefCount': 0},
+             'Labels': None},
+        ],
+        'BuildCache': [
+            {'ID': 'c1', 'Type': 'regular', 'InUse': False, 'Size': 3000,
+             'LastUsedAt': '2023-11-14T22:00:00.123456789Z'},
+            {'ID': 'c2', 'Type': 'internal', 'InUse': False, 'Size': 7},
+            {'ID': 'c3', 'Type': 'regular', 'InUse': True, 'Size': 9},
+        ],
+    }
+
+
+def fake_networks():
+    return [
+        {'Id': 'n0', 'Name': 'bridge'},
+        {'Id': 'n1', 'Name': 'ci', 'Labels': {'env': 'ci'}},
+        {'Id': 'n2', 'Name': 'web', 'Labels': {}},
+        {'Id': 'n3', 'Name': 'ingress', 'Ingress': True},
+    ]
+
+
+class SystemPruneTest(unittest.TestCase):
+    def setUp(self):
+        self.client = make_fake_client({
+            'df.return_value': fake_df(),
+            'networks.return_value': fake_networks(),
+            'prune_containers.return_value': {
+                'ContainersDeleted': ['stopped'], 'SpaceReclaimed': 100,
+            },
+            'prune_networks.return_value': {'NetworksDeleted': ['ci']},
+            'prune_volumes.return_value': {
+                'VolumesDeleted': None, 'SpaceReclaimed': 0,
+            },
+            'prune_images.return_value': {
+                'ImagesDeleted': [{'Deleted': 'sha256:old'}],
+                'SpaceReclaimed': 600,
+            },
+            'prune_builds.return_value': {
+                'CachesDeleted': ['c1'], 'SpaceReclaimed': 3000,
+            },
+        })
+
+    def test_run(self):
+        report = self.client.system_prune(
+            filters={'until': '1h'}, volumes=False
+        )
+        assert report['ContainersDeleted'] == ['stopped']
+        assert report['NetworksDeleted'] == ['ci']
+        assert report['ImagesDeleted'] == [{'Deleted': 'sha256:old'}]
+        assert report['CachesDeleted'] == ['c1']
+        assert 'VolumesDeleted' not in report
+        assert report['SpaceReclaimed'] == 3700
+        assert report['DryRun'] is False
+        assert list(report['Phases']) == [
+            'containers', 'networks', 'images', 'build_cache'
+        ]
+        assert report['Phases']['images'] == {
+            'Deleted': 1, 'SpaceReclaimed': 600,
+            'Duration': report['Phases']['images']['Duration'],
+        }
+        api = self.client.api
+        api.prune_containers.assert_called_once_with(filters={'until': '1h'})
+        api.prune_images.assert_called_once_with(
+            filters={'until': '1h', 'dangling': True}
+        )
+        api.prune_builds.assert_called_once_with(
+            filters={'until': '1h'}, all=None
+        )
+        api.prune_volumes.assert_not_called()
+
+    def test_order(self):
+        calls = []
+        started = threading.Barrier(2, timeout=5)
+
+        def prune(name, concurrent=False):
+            def side_effect(filters=None, **kwargs):
+                if concurrent:
+                    # Networks and volumes are pruned at the same time
+                    started.wait()
+                calls.append(name)
+                return {}
+            return side_effect
+
+        api = self.client.api
+        api.prune_containers.side_effect = prune('containers')
+        api.prune_networks.side_effect = prune('networks', True)
+        api.prune_volumes.side_effect = prune('volumes', True)
+        api.prune_images.side_effect = prune('images')
+        api.prune_builds.side_effect = prune('build_cache')
+        report = self.client.system_prune(volumes=True, all=True)
+        assert calls[0] == 'containers'
+        assert set(calls[1:3]) == {'networks', 'volumes'}
+        assert calls[3:] == ['images', 'build_cache']
+        assert report['VolumesDeleted'] == []
+        api.prune_images.assert_called_once_with(filters={'dangling': False})
+
+    def test_label_filters_skip_build_cache(self):
+        report = self.client.system_prune(filters={'label': 'env=ci'})
+        assert 'CachesDeleted' not in report
+        self.client.api.prune_builds.assert_not_called()
+
+    def test_old_api_version(self):
+        self.client.api._version = '1.38'
+        self.client.system_prune(all=True)
+        self.client.api.prune_builds.assert_called_once_with()
+        # Filters can't be applied to the build cache
+        report = self.client.system_prune(filters={'until': '1h'})
+        assert 'CachesDeleted' not in report
+        assert self.client.api.prune_builds.call_count == 1
+
+    def test_unsupported_filters(self):
+        with pytest.raises(InvalidArgument):
+            self.client.system_prune(filters={'dangling': True})
+        with pytest.raises(InvalidArgument):
+            self.client.system_prune(filters={'until': '1h'}, volumes=True)
+
+    def test_dry_run(self):
+        report = self.client.system_prune(volumes=True, dry_run=True)
+        assert report['DryRun'] is True
+        assert report['ContainersDeleted'] == ['stopped']
+        # The network and volume of the pruned container are freed
+        assert report['NetworksDeleted'] == ['n1']
+        assert report['VolumesDeleted'] == ['cache']
+        # Only dangling images which are not used any longer
+        assert report['ImagesDeleted'] == [{'Deleted': 'sha256:old'}]
+        assert report['CachesDeleted'] == ['c1']
+        assert report['Phases']['volumes']['SpaceReclaimed'] == 10
+        assert report['SpaceReclaimed'] == 100 + 10 + 600 + 3000
+        for name in ('prune_containers', 'prune_networks', 'prune_images',
+                     'prune_volumes', 'prune_builds'):
+            getattr(self.client.api, name).assert_not_called()
+
+    def test_dry_run_all(self):
+        report = self.client.system_prune(all=True, dry_run=True)
+        assert report['ImagesDeleted'] == [
+            {'Deleted': 'sha256:old'}, {'Deleted': 'sha256:base'}
+        ]
+        assert report['CachesDeleted'] == ['c1', 'c2']
+
+    def test_dry_run_filters(self):
+        report = self.client.system_prune(
+            filters={'label!': 'env=ci'}, dry_run=True
+        )
+        assert report['ContainersDeleted'] == []
+        assert report['NetworksDeleted'] == []
+
+        report = self.client.system_prune(
+            filters={'until': NOW - 3600}, dry_run=True
+        )
+        assert report['ContainersDeleted'] == ['stopped']
+        # The cache was used after the until
+        assert report['CachesDeleted'] == []
+
+
+class PruneFiltersTest(unittest.TestCase):
+    def test_match_labels(self):
+        labels = {'env': 'ci', 'team': 'a'}
+        assert _match_labels({}, labels)
+        assert _match_labels({'label': 'env'}, labels)
+        assert _match_labels({'label': ['env=ci', 'team']}, labels)
+        assert not _match_labels({'label': 'env=prod'}, labels)
+        assert not _match_labels({'label!': 'team=a'}, labels)
+        assert _match_labels({'label!': 'team=b'}, None)
+
+    def test_parse_until(self):
+        now = time.time()
+        assert _parse_until(None, now) is None
+        assert _parse_until(NOW, now) == NOW
+        assert _parse_until(str(NOW), now) == NOW
+        assert _parse_until('1h30m', now) == now - 5400
+        assert _parse_until('2023-11-14T22:13:20Z', now) == NOW
+        assert _parse_until('2023-11-14T22:13:20.5+00:00', now) == (
+            NOW + 0.5
+        )
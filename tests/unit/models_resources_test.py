@@ -1,4 +1,12 @@
+import json
 import unittest
+from unittest import mock
+
+import pytest
+
+from docker.errors import DockerException
+from docker.models.containers import Container
+from docker.models.images import Image
 
 from .fake_api import FAKE_CONTAINER_ID
 from .fake_api_client import make_fake_client
@@ -26,3 +34,131 @@ class ModelTest(unittest.TestCase):
         image1 = client.images.get(FAKE_CONTAINER_ID)
         my_set.add(image1)
         assert len(my_set) == 2
+
+
+class CompactModelTest(unittest.TestCase):
+    def test_properties_decoded_lazily(self):
+        client = make_fake_client()
+        client.compact_models = True
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        assert isinstance(container._raw, bytes)
+        assert container._attrs is None
+        assert container.id == FAKE_CONTAINER_ID
+        assert container.name == 'foobar'
+        assert container.status == 'running'
+        assert set(container._fields) == {'id', 'name', 'status'}
+        assert container._attrs is None
+
+    def test_payload_decoded_once(self):
+        container = Container.compact({
+            'Id': FAKE_CONTAINER_ID, 'Name': '/foobar',
+            'State': {'Status': 'running'},
+        })
+        with mock.patch(
+                'docker.models.resource.json.loads',
+                side_effect=json.loads) as loads:
+            assert container.id == FAKE_CONTAINER_ID
+            assert container.name == 'foobar'
+            assert container.status == 'running'
+            assert container.attrs['Name'] == '/foobar'
+        assert loads.call_count == 1
+
+    def test_attrs_backward_compatible(self):
+        image = Image.compact({'Id': 'sha256:abc', 'RepoTags': ['a:b']})
+        assert image.tags == ['a:b']
+        attrs = image.attrs
+        assert attrs == {'Id': 'sha256:abc', 'RepoTags': ['a:b']}
+        attrs['RepoTags'].append('c:d')
+        assert image.attrs is attrs
+        assert image.tags == ['a:b', 'c:d']
+
+    def test_reload_stays_compact(self):
+        client = make_fake_client()
+        client.compact_models = True
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        assert container.name == 'foobar'
+        container.reload()
+        assert container._attrs is None
+        assert container._fields == {}
+
+    def test_no_instance_dict(self):
+        container = Container.compact({'Id': FAKE_CONTAINER_ID})
+        assert not hasattr(container, '__dict__') or not container.__dict__
+        assert container == Container(attrs={'Id': FAKE_CONTAINER_ID})
+
+
+def container_summary(id, name, image, state, labels=None, ports=()):
+    return {
+        'Id': id, 'Names': [f'/{name}'], 'Image': image, 'State': state,
+        'Labels': labels,
+        'Ports': [
+            {'PrivatePort': p, 'PublicPort': p + 8000, 'Type': 'tcp'}
+            for p in ports
+        ],
+    }
+
+
+class ResultSetTest(unittest.TestCase):
+    def setUp(self):
+        self.client = make_fake_client({
+            'containers.return_value': [
+                container_summary('a' * 64, 'web-1', 'nginx', 'running',
+                                  {'tier': 'frontend'}, ports=[80]),
+                container_summary('b' * 64, 'web-2', 'nginx', 'exited',
+                                  {'tier': 'frontend'}),
+                container_summary('c' * 64, 'db', 'postgres', 'running',
+                                  {'tier': 'backend', 'backup': 'daily'}),
+            ]
+        })
+        self.result = self.client.containers.list(all=True, columnar=True)
+
+    def test_rows_are_models(self):
+        assert len(self.result) == 3
+        assert not self.client.api.inspect_container.called
+        container = self.result[2]
+        assert isinstance(container, Container)
+        assert container.id == 'c' * 64
+        assert [c.id for c in self.result] == self.result.ids
+
+    def test_column(self):
+        assert self.result.column('name') == ['web-1', 'web-2', 'db']
+        assert self.result.column('ports') == [['80/tcp'], [], []]
+        assert self.result.column('published_ports') == [[8080], [], []]
+        assert self.result.column('labels')[2] == {
+            'tier': 'backend', 'backup': 'daily'
+        }
+
+    def test_filter(self):
+        assert self.result.filter(image='nginx').ids == ['a' * 64, 'b' * 64]
+        assert self.result.filter(
+            image='nginx', status='running'
+        ).ids == ['a' * 64]
+        assert self.result.filter(
+            status=['exited', 'paused']
+        ).ids == ['b' * 64]
+        assert self.result.filter(image='redis').ids == []
+        assert self.result.filter(ports='80/tcp').ids == ['a' * 64]
+
+    def test_filter_prefix(self):
+        assert self.result.filter(name__startswith='web-').ids == [
+            'a' * 64, 'b' * 64
+        ]
+        assert self.result.filter(name__startswith='x').ids == []
+
+    def test_filter_labels(self):
+        assert self.result.filter(label='backup').ids == ['c' * 64]
+        assert self.result.filter(
+            label=['tier=frontend']
+        ).filter(status='exited').ids == ['b' * 64]
+
+    def test_filter_unknown_column(self):
+        with pytest.raises(DockerException):
+            self.result.filter(foo='bar')
+        with pytest.raises(DockerException):
+            self.result.filter(name__contains='web')
+
+    def test_to_pandas(self):
+        pytest.importorskip('pandas')
+        frame = self.result.filter(status='running').to_pandas()
+        assert list(frame['name']) == ['web-1', 'db']
+        assert list(frame['image'].cat.categories) == ['nginx', 'postgres']
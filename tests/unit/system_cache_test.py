@@ -0,0 +1,169 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+import docker
+from docker.system_cache import SystemCache
+
+from . import fake_api
+from .fake_api_client import make_fake_client
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def fake_info(running=1, stopped=1):
+    return {
+        'Containers': running + stopped, 'ContainersRunning': running,
+        'ContainersPaused': 0, 'ContainersStopped': stopped,
+    }
+
+
+class SystemCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.api = mock.Mock()
+        self.api.info.side_effect = lambda: fake_info()
+        self.api.df.side_effect = lambda: {'LayersSize': 1}
+        self.cache = SystemCache(self.api, ttl=30, watch=False)
+
+    def age(self, name, seconds):
+        self.cache._entries[name].fetched_at -= seconds
+
+    def test_fresh_values_are_cached(self):
+        assert self.cache.info() == fake_info()
+        info = self.cache.info()
+        info['Containers'] = 10
+        assert self.cache.info() == fake_info()
+        assert self.api.info.call_count == 1
+
+    def test_stale_values_are_refreshed_in_background(self):
+        self.cache.df()
+        self.api.df.side_effect = lambda: {'LayersSize': 2}
+        self.age('df', 60)
+        # The stale value is returned right away
+        assert self.cache.df() == {'LayersSize': 1}
+        wait_for(lambda: self.cache.df() == {'LayersSize': 2})
+        assert self.api.df.call_count == 2
+
+    def test_max_staleness(self):
+        self.cache.df()
+        self.api.df.side_effect = lambda: {'LayersSize': 2}
+        self.age('df', 10)
+        assert self.cache.df(max_staleness=5) == {'LayersSize': 2}
+        assert self.cache.df(force_refresh=True) == {'LayersSize': 2}
+        assert self.api.df.call_count == 3
+
+    def test_errors(self):
+        self.api.info.side_effect = docker.errors.APIError('fail')
+        with pytest.raises(docker.errors.APIError):
+            self.cache.info()
+
+    def test_concurrent_fetches_are_shared(self):
+        release = threading.Event()
+
+        def df():
+            release.wait()
+            return {'LayersSize': 1}
+
+        self.api.df.side_effect = df
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.df()))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: self.api.df.call_count == 1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert results == [{'LayersSize': 1}] * 3
+        assert self.api.df.call_count == 1
+
+    def test_container_events_update_info(self):
+        self.cache.info()
+        self.cache.handle_event({'Type': 'container', 'Action': 'create'})
+        self.cache.handle_event({'Type': 'container', 'Action': 'start'})
+        self.cache.handle_event({
+            'Type': 'container', 'Action': 'exec_start: sh'
+        })
+        assert self.cache.info() == fake_info(running=2)
+        self.cache.handle_event({'Type': 'container', 'Action': 'die'})
+        self.cache.handle_event({'Type': 'container', 'Action': 'destroy'})
+        assert self.cache.info() == fake_info()
+        assert self.api.info.call_count == 1
+
+    def test_events_mark_df_stale(self):
+        self.cache.df()
+        self.cache.handle_event({'Type': 'volume', 'Action': 'create'})
+        self.api.df.side_effect = lambda: {'LayersSize': 2}
+        assert self.cache.df() == {'LayersSize': 1}
+        wait_for(lambda: self.cache.df() == {'LayersSize': 2})
+        # Other events do not
+        self.cache.handle_event({'Type': 'volume', 'Action': 'prune'})
+        self.cache.df()
+        assert self.api.df.call_count == 2
+
+    def test_container_events_while_fetching(self):
+        self.cache.info()
+        generation = self.cache._entries['info'].generation
+        self.cache.handle_event({'Type': 'container', 'Action': 'start'})
+        self.cache.handle_event({'Type': 'container', 'Action': 'kill'})
+        # Applied in place, the value is still up to date
+        assert self.cache._entries['info'].generation == generation
+        assert not self.cache._entries['info'].stale
+
+        def info():
+            self.cache.handle_event({'Type': 'container', 'Action': 'die'})
+            return fake_info()
+
+        self.api.info.side_effect = info
+        assert self.cache.info(force_refresh=True) == fake_info()
+        # The fetched value may not count the event
+        assert self.cache._entries['info'].stale
+
+    def test_invalidate(self):
+        self.cache.info()
+        self.cache.invalidate()
+        self.cache.info()
+        assert self.api.info.call_count == 2
+
+    def test_invalidate_while_fetching(self):
+        self.cache.watch = True
+
+        def events(**kwargs):
+            # Right after the value is stored, before it is returned
+            if self.api.events.call_count == 1:
+                self.cache.invalidate()
+            return iter([])
+
+        self.api.events.side_effect = events
+        assert self.cache.info() == fake_info()
+        assert self.api.info.call_count == 2
+
+
+class DockerClientSystemCacheTest(unittest.TestCase):
+    def test_cached(self):
+        info = fake_api.get_fake_info()[1]
+        release = threading.Event()
+        client = make_fake_client({
+            'info.return_value': info,
+            'events.return_value.__iter__.side_effect':
+                lambda: iter([release.wait()]),
+        })
+        assert client.info(cached=True) == info
+        assert client.info(cached=True) == info
+        assert client.api.info.call_count == 1
+        assert client.system_cache.watching
+        client.info()
+        assert client.api.info.call_count == 2
+        client.close()
+        release.set()
+        assert not client.system_cache.watching
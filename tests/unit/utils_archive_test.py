@@ -0,0 +1,177 @@
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import unittest
+
+from docker.errors import UnsafeArchivePath
+from docker.utils.archive import extract_archive, stream_archive
+
+from ..helpers import make_tree
+
+
+class StreamArchiveTest(unittest.TestCase):
+    dirs = ['foo', 'foo/bar', 'build']
+    files = ['a.txt', 'foo/b.txt', 'foo/bar/c.txt', 'build/out.o']
+
+    def setUp(self):
+        self.base = make_tree(self.dirs, self.files)
+        self.src = os.path.join(self.base)
+
+    def tearDown(self):
+        shutil.rmtree(self.base)
+
+    def open_archive(self, chunks, mode='r'):
+        return tarfile.open(fileobj=io.BytesIO(b''.join(chunks)), mode=mode)
+
+    def test_stream_directory(self):
+        with self.open_archive(stream_archive(self.base)) as t:
+            name = os.path.basename(self.base)
+            assert sorted(t.getnames()) == sorted(
+                [name] + [f'{name}/{p}' for p in self.dirs + self.files]
+            )
+            member = t.extractfile(f'{name}/foo/bar/c.txt')
+            assert member.read() == b'content'
+
+    def test_stream_single_file(self):
+        path = os.path.join(self.base, 'a.txt')
+        with self.open_archive(stream_archive(path)) as t:
+            assert t.getnames() == ['a.txt']
+
+    def test_stream_exclude(self):
+        chunks = stream_archive(
+            [os.path.join(self.base, 'foo'), os.path.join(self.base, 'build')],
+            exclude=['bar', '*.o']
+        )
+        with self.open_archive(chunks) as t:
+            assert sorted(t.getnames()) == [
+                'build', 'foo', 'foo/b.txt'
+            ]
+
+    def test_stream_fixed_chunk_size(self):
+        with open(os.path.join(self.base, 'big.bin'), 'wb') as f:
+            f.write(os.urandom(100000))
+        chunks = list(stream_archive(self.base, chunk_size=4096))
+        assert all(len(c) == 4096 for c in chunks[:-1])
+        assert 0 < len(chunks[-1]) <= 4096
+        with self.open_archive(chunks) as t:
+            name = os.path.basename(self.base)
+            assert len(t.extractfile(f'{name}/big.bin').read()) == 100000
+
+    def test_stream_matches_tarfile_layout(self):
+        # The streamed archive must be a multiple of the record size, like
+        # archives written by the tarfile module.
+        data = b''.join(stream_archive(os.path.join(self.base, 'a.txt')))
+        assert len(data) % tarfile.RECORDSIZE == 0
+
+    def test_stream_gzip(self):
+        data = b''.join(stream_archive(self.base, gzip=True))
+        assert data[:2] == b'\x1f\x8b'
+        with tarfile.open(fileobj=io.BytesIO(gzip.decompress(data))) as t:
+            assert len(t.getnames()) == len(self.dirs + self.files) + 1
+
+    def test_stream_file_shrinks(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'shrinking')
+        with open(path, 'wb') as f:
+            f.write(b'x' * 2048)
+        chunks = stream_archive(path, chunk_size=512)
+        next(chunks)
+        with open(path, 'wb') as f:
+            f.write(b'x')
+        with self.assertRaises(OSError):
+            list(chunks)
+
+
+def make_archive(members):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as t:
+        for info, data in members:
+            if data is not None:
+                info.size = len(data)
+                data = io.BytesIO(data)
+            t.addfile(info, data)
+    return buf.getvalue()
+
+
+def chunked(data, size=100):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class ExtractArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.dest = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dest)
+
+    def test_extract_roundtrip(self):
+        base = make_tree(['foo', 'foo/bar'], ['a.txt', 'foo/bar/b.txt'])
+        self.addCleanup(shutil.rmtree, base)
+        with open(os.path.join(base, 'big.bin'), 'wb') as f:
+            f.write(os.urandom(50000))
+        mtime = time.time() - 3600
+        os.utime(os.path.join(base, 'foo'), (mtime, mtime))
+
+        names = extract_archive(
+            stream_archive(base, chunk_size=1000), self.dest, chunk_size=4096
+        )
+
+        root = os.path.join(self.dest, os.path.basename(base))
+        assert len(names) == 6
+        with open(os.path.join(root, 'foo/bar/b.txt'), 'rb') as f:
+            assert f.read() == b'content'
+        with open(os.path.join(base, 'big.bin'), 'rb') as src, \
+                open(os.path.join(root, 'big.bin'), 'rb') as dst:
+            assert src.read() == dst.read()
+        assert int(os.stat(os.path.join(root, 'foo')).st_mtime) == \
+            int(mtime)
+
+    def test_extract_progress(self):
+        data = make_archive([(tarfile.TarInfo('file'), b'x' * 10000)])
+        progress = []
+        extract_archive(
+            chunked(data), self.dest, chunk_size=4096,
+            progress=lambda *args: progress.append(args)
+        )
+        assert progress == [
+            ('file', 4096, 10000), ('file', 8192, 10000),
+            ('file', 10000, 10000),
+        ]
+
+    def test_extract_symlink(self):
+        link = tarfile.TarInfo('link')
+        link.type = tarfile.SYMTYPE
+        link.linkname = 'target'
+        data = make_archive([
+            (tarfile.TarInfo('target'), b'data'), (link, None)
+        ])
+        extract_archive(chunked(data), self.dest)
+        assert os.readlink(os.path.join(self.dest, 'link')) == 'target'
+
+    def test_extract_rejects_parent_path(self):
+        data = make_archive([(tarfile.TarInfo('../evil'), b'data')])
+        with self.assertRaises(UnsafeArchivePath):
+            extract_archive(chunked(data), self.dest)
+        assert not os.path.exists(
+            os.path.join(os.path.dirname(self.dest), 'evil')
+        )
+
+    def test_extract_rejects_symlink_escape(self):
+        link = tarfile.TarInfo('link')
+        link.type = tarfile.SYMTYPE
+        link.linkname = '/etc'
+        data = make_archive([(link, None)])
+        with self.assertRaises(UnsafeArchivePath):
+            extract_archive(chunked(data), self.dest)
+
+    def test_extract_rejects_write_through_symlink(self):
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside)
+        os.symlink(outside, os.path.join(self.dest, 'link'))
+        data = make_archive([(tarfile.TarInfo('link/file'), b'data')])
+        with self.assertRaises(UnsafeArchivePath):
+            extract_archive(chunked(data), self.dest)
+        assert os.listdir(outside) == []
@@ -0,0 +1,82 @@
+import os
+import shutil
+import unittest
+
+import pytest
+
+from docker import errors
+from docker.api.build import check_context_size
+from docker.utils import analyze_build_context, exclude_paths
+
+from ..helpers import make_tree
+
+
+class AnalyzeBuildContextTest(unittest.TestCase):
+    dirs = ['src', 'node_modules', 'node_modules/lib', 'docs']
+    files = [
+        'Dockerfile', '.dockerignore', 'src/app.py', 'src/big.bin',
+        'node_modules/lib/index.js', 'node_modules/keep.js', 'docs/a.md',
+    ]
+
+    def setUp(self):
+        self.base = make_tree(self.dirs, self.files)
+        # Every file of make_tree holds 7 bytes
+        with open(os.path.join(self.base, 'src/big.bin'), 'wb') as f:
+            f.write(b'\0' * 100000)
+        with open(os.path.join(self.base, '.dockerignore'), 'w') as f:
+            f.write('# comment\nnode_modules\n!node_modules/keep.js\n'
+                    '*.pyc\ndocs\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.base)
+
+    def test_report(self):
+        report = analyze_build_context(self.base, top=2)
+        sent = set(exclude_paths(
+            self.base, ['node_modules', '!node_modules/keep.js', '*.pyc',
+                        'docs']
+        ))
+        files = {
+            path for path in sent
+            if os.path.isfile(os.path.join(self.base, path))
+        }
+        assert report.total_files == len(files) == 5
+        # The .dockerignore file itself is sent
+        assert report.total_bytes == 100000 + 3 * 7 + os.path.getsize(
+            os.path.join(self.base, '.dockerignore')
+        )
+        assert (report.excluded_files, report.excluded_bytes) == (2, 14)
+        assert report.largest_files[0] == ('src/big.bin', 100000)
+        assert len(report.largest_files) == 2
+        assert report.largest_dirs[0] == ('src', 100007)
+        assert [
+            (rule.rule, rule.files, rule.bytes) for rule in report.rules
+        ] == [
+            ('node_modules', 1, 7),
+            ('!node_modules/keep.js', 1, 7),
+            ('*.pyc', 0, 0),
+            ('docs', 1, 7),
+        ]
+        assert report.rules[0].largest == [('node_modules/lib/index.js', 7)]
+        assert report.unused_rules == ['*.pyc']
+        assert report.archive_size % 10240 == 0
+        assert report.archive_size > report.total_bytes
+        # Zeros compress well
+        assert report.compressed_size < report.archive_size / 10
+
+    def test_skip_excluded(self):
+        report = analyze_build_context(
+            self.base, exclude=['docs'], walk_excluded=False,
+            compression=False,
+        )
+        # Only the directory is seen, not the files inside it
+        assert report.rules[0].files == 0
+        assert report.unused_rules == []
+        assert report.compressed_size is None
+
+    def test_check_context_size(self):
+        check_context_size(self.base, None, 'Dockerfile', '1m')
+        with pytest.raises(errors.BuildContextTooLarge) as excinfo:
+            check_context_size(self.base, ['docs'], 'Dockerfile', 100000)
+        assert excinfo.value.max_context_size == 100000
+        assert excinfo.value.report.total_files == 6
@@ -1,3 +1,4 @@
+import gzip
 import os
 import os.path
 import shutil
@@ -9,7 +10,7 @@ import unittest
 import pytest
 
 from docker.constants import IS_WINDOWS_PLATFORM
-from docker.utils import exclude_paths, match_tag, tar
+from docker.utils import build, exclude_paths, match_tag, tar
 
 from ..helpers import make_tree
 
@@ -489,6 +490,52 @@ class TarTest(unittest.TestCase):
             assert 'a/c/b' in names
             assert 'a/c/b/utils.py' not in names
 
+    @pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='No links on Windows')
+    def test_tar_with_workers(self):
+        dirs = ['a', 'b', 'a/c']
+        files = [f'a/c/{i}.py' for i in range(50)] + ['b/utils.py']
+        base = make_tree(dirs, files)
+        self.addCleanup(shutil.rmtree, base)
+        with open(os.path.join(base, 'big.bin'), 'wb') as f:
+            f.write(os.urandom(build.PREFETCH_SIZE + 1))
+        os.symlink('../b', os.path.join(base, 'a/link'))
+        os.link(
+            os.path.join(base, 'b/utils.py'), os.path.join(base, 'a/hard.py')
+        )
+        with tar(base) as archive:
+            expected = archive.read()
+        for workers in (2, 8):
+            with tar(base, workers=workers) as archive:
+                assert archive.read() == expected
+        # The gzip header holds the time it was written
+        with tar(base, gzip=True, workers=2) as archive:
+            assert gzip.decompress(archive.read()) == expected
+
+        with tar(base, workers=4) as archive:
+            tar_data = tarfile.open(fileobj=archive)
+            assert tar_data.getmember('b/utils.py').islnk()
+            assert tar_data.extractfile('big.bin').read() == open(
+                os.path.join(base, 'big.bin'), 'rb'
+            ).read()
+
+    @pytest.mark.skipif(
+        IS_WINDOWS_PLATFORM or os.geteuid() == 0,
+        reason='root user always has access ; no chmod on Windows'
+    )
+    def test_tar_with_workers_inaccessible_file(self):
+        base = tempfile.mkdtemp()
+        full_path = os.path.join(base, 'foo')
+        self.addCleanup(shutil.rmtree, base)
+        with open(full_path, 'w') as f:
+            f.write('content')
+        os.chmod(full_path, 0o222)
+        with pytest.raises(IOError) as ei:
+            tar(base, workers=2)
+
+        assert f'Can not read file in context: {full_path}' in (
+            ei.exconly()
+        )
+
 
 # selected test cases from https://github.com/distribution/reference/blob/8507c7fcf0da9f570540c958ea7b972c30eeaeca/reference_test.go#L13-L328
 @pytest.mark.parametrize("tag,expected", [
@@ -0,0 +1,53 @@
+import io
+import unittest
+
+import pytest
+
+from docker.errors import DockerException
+from docker.utils.capture import CaptureSink
+
+
+class CaptureSinkTest(unittest.TestCase):
+    def test_in_memory(self):
+        sink = CaptureSink(max_memory=10)
+        sink.consume([b'hello', b'', b' '])
+        assert not sink.spilled
+        assert sink.getvalue() == b'hello '
+        assert sink.open().read() == b'hello '
+
+    def test_spill_to_temporary_file(self):
+        with CaptureSink(max_memory=8) as sink:
+            sink.consume([b'hello', b' world', b'!'])
+            assert sink.spilled
+            assert sink.size == 12
+            assert sink.getvalue() == b'hello world!'
+            sink.write(b'?')
+            with sink.open() as f:
+                assert f.read() == b'hello world!?'
+
+    def test_spill_to_writer(self):
+        writer = io.BytesIO()
+        sink = CaptureSink(max_memory=8, spill=writer)
+        sink.consume([b'hello', b' world', b'!'])
+        assert writer.getvalue() == b'hello world!'
+        with pytest.raises(DockerException):
+            sink.getvalue()
+
+    def test_head(self):
+        sink = CaptureSink(max_memory=8, mode='head')
+        sink.consume([b'hello', b' world', b'!'])
+        assert sink.getvalue() == b'hello wo'
+        assert (sink.size, sink.dropped) == (12, 4)
+        assert not sink.spilled
+
+    def test_tail(self):
+        sink = CaptureSink(max_memory=8, mode='tail')
+        sink.consume([b'hello', b' world', b'!'])
+        assert sink.getvalue() == b'o world!'
+        sink.consume([b'abcdefghij'])
+        assert sink.getvalue() == b'cdefghij'
+        assert (sink.size, sink.dropped) == (22, 14)
+
+    def test_invalid_mode(self):
+        with pytest.raises(DockerException):
+            CaptureSink(mode='middle')
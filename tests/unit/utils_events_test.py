@@ -0,0 +1,27 @@
+import unittest
+
+from docker.utils.events import watch_events
+
+
+class WatchEventsTest(unittest.TestCase):
+    def test_handle_events(self):
+        handled, stopped = [], []
+        events = iter([{'Action': 'create'}, {'Action': 'start'}])
+        watch_events(events, handled.append, stopped.append, 'Test').join()
+        assert handled == [{'Action': 'create'}, {'Action': 'start'}]
+        assert stopped == [events]
+
+    def test_error_is_logged(self):
+        stopped = []
+
+        def handle(event):
+            raise ValueError('bad event')
+
+        events = iter([{'Action': 'create'}, {'Action': 'start'}])
+        with self.assertLogs('docker.utils.events', 'ERROR') as logs:
+            watch_events(events, handle, stopped.append, 'Test').join()
+        assert 'Test stopped watching events' in logs.output[0]
+        assert 'bad event' in logs.output[0]
+        assert stopped == [events]
+        # The watch ended at the error
+        assert next(events) == {'Action': 'start'}
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import socket
+import struct
+import threading
+import unittest
+
+import pytest
+
+from docker.utils.socket import (
+    STDERR,
+    STDOUT,
+    AsyncDuplexStream,
+    DuplexStream,
+)
+
+
+def frame(stream, data):
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+def serve_upper(sock):
+    """
+    Echo everything received in uppercase on stdout, report the number of
+    bytes on stderr once the input ends, then close the connection.
+    """
+    def run():
+        received = 0
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            received += len(data)
+            sock.sendall(frame(STDOUT, data.upper()))
+        sock.sendall(frame(STDERR, str(received).encode('ascii')))
+        sock.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+class FakeChannel:
+    """
+    Stands in for a paramiko channel, whose file descriptor is a pipe that
+    only ever signals readability.
+    """
+    def __init__(self):
+        self._r, self._w = os.pipe()
+        self.window = 0
+        self.sent = bytearray()
+
+    def fileno(self):
+        return self._r
+
+    def recv_ready(self):
+        return False
+
+    def send_ready(self):
+        return self.window > 0
+
+    def setblocking(self, flag):
+        pass
+
+    def send(self, data):
+        if not self.window:
+            raise socket.timeout()
+        sent = min(len(data), self.window)
+        self.sent += data[:sent]
+        self.window -= sent
+        return sent
+
+    def open_window(self, size):
+        self.window += size
+
+    def close(self):
+        os.close(self._r)
+        os.close(self._w)
+
+
+class DuplexStreamTest(unittest.TestCase):
+    def test_communicate_large_payload(self):
+        ours, theirs = socket.socketpair()
+        serve_upper(theirs)
+        payload = b'abcdefgh' * (1024 * 1024)
+        with DuplexStream(ours, high_water=64 * 1024) as stream:
+            stdout, stderr = stream.communicate(payload, timeout=10)
+        assert stdout == payload.upper()
+        assert stderr == str(len(payload)).encode('ascii')
+
+    def test_communicate_iterable(self):
+        ours, theirs = socket.socketpair()
+        serve_upper(theirs)
+        with DuplexStream(ours) as stream:
+            stdout, stderr = stream.communicate(
+                iter([b'foo', b'bar']), timeout=10
+            )
+        assert stdout == b'FOOBAR'
+        assert stderr == b'6'
+
+    def test_partial_frames(self):
+        ours, theirs = socket.socketpair()
+        with DuplexStream(ours) as stream:
+            data = frame(STDERR, b'hello world')
+            theirs.sendall(data[:12])
+            assert stream.read_frame(timeout=5) == (STDERR, b'hell')
+            theirs.sendall(data[12:] + frame(STDOUT, b'!'))
+            assert stream.read_frame(timeout=5) == (STDERR, b'o world')
+            assert stream.read_frame(timeout=5) == (STDOUT, b'!')
+            theirs.close()
+            assert stream.read_frame(timeout=5) is None
+
+    def test_tty(self):
+        ours, theirs = socket.socketpair()
+        with DuplexStream(ours, tty=True) as stream:
+            theirs.sendall(b'raw output')
+            theirs.close()
+            assert list(stream) == [(STDOUT, b'raw output')]
+
+    def test_read_timeout(self):
+        ours, theirs = socket.socketpair()
+        with DuplexStream(ours) as stream:
+            with pytest.raises(socket.timeout):
+                stream.read_frame(timeout=0.01)
+        theirs.close()
+
+    def test_close_write(self):
+        ours, theirs = socket.socketpair()
+        with DuplexStream(ours) as stream:
+            stream.write(b'input')
+            stream.close_write()
+            assert theirs.recv(100) == b'input'
+            assert theirs.recv(100) == b''
+            theirs.sendall(frame(STDOUT, b'still readable'))
+            assert stream.read_frame(timeout=5) == (STDOUT, b'still readable')
+        theirs.close()
+
+
+    def test_channel_send_window(self):
+        channel = FakeChannel()
+        timer = threading.Timer(0.1, channel.open_window, (5,))
+        timer.start()
+        with DuplexStream(channel, high_water=0) as stream:
+            stream.write(b'input', timeout=5)
+        timer.join()
+        assert channel.sent == b'input'
+
+    def test_channel_write_timeout(self):
+        channel = FakeChannel()
+        stream = DuplexStream(channel, high_water=0)
+        with stream, pytest.raises(socket.timeout):
+            stream.write(b'input', timeout=0.1)
+
+
+class AsyncDuplexStreamTest(unittest.TestCase):
+    def test_communicate(self):
+        ours, theirs = socket.socketpair()
+        serve_upper(theirs)
+        payload = b'abcdefgh' * (256 * 1024)
+
+        async def run():
+            stream = AsyncDuplexStream(ours)
+            try:
+                return await stream.communicate(payload)
+            finally:
+                stream.close()
+
+        stdout, stderr = asyncio.run(run())
+        assert stdout == payload.upper()
+        assert stderr == str(len(payload)).encode('ascii')